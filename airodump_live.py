@@ -0,0 +1,181 @@
+import os
+import time
+import shutil
+import subprocess
+from termcolor import colored
+from scan_model import ScanResult, parse_ap, parse_station, STATION_HEADER
+
+# Seconds without a new access point after which a scan is considered complete
+CONVERGENCE_SECONDS = 8.0
+# Quick sweeps hop over few channels, so they settle sooner
+QUICK_CONVERGENCE_SECONDS = 4.0
+REFRESH_INTERVAL = 1.0
+
+class CsvTail:
+    """
+    Follow an airodump-ng CSV while it is written
+
+    airodump-ng rewrites the CSV in place about once a second. The file is only
+    read when its size or modification time changed, and only lines that differ
+    from the previous version are parsed again. scan holds the latest ScanResult.
+
+    Args:
+        path: CSV written by airodump-ng (<prefix>-01.csv)
+    """
+    def __init__(self, path):
+        self.path = path
+        self._stat = None
+        self._parsed = {}
+        self.scan = ScanResult()
+
+    def poll(self):
+        """
+        Re-read the CSV if it changed
+
+        Returns:
+            True when the access point or station table changed
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        key = (stat.st_size, stat.st_mtime_ns)
+        if key == self._stat:
+            return False
+        self._stat = key
+
+        try:
+            with open(self.path, "r", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return False
+
+        parsed = {}
+        scan = ScanResult()
+        parse = parse_ap
+        for line in text.split("\n"):
+            if not line.strip():
+                continue
+            if line.startswith(STATION_HEADER):
+                parse = parse_station
+                continue
+            key = (parse, line)
+            record = self._parsed[key] if key in self._parsed else parse(line)
+            parsed[key] = record
+            if record is None:
+                continue
+            if parse is parse_ap:
+                scan.aps[record.bssid] = record
+            else:
+                scan.stations[record.mac] = record
+
+        changed = parsed.keys() != self._parsed.keys()
+        self._parsed = parsed
+        self.scan = scan
+        return changed
+
+class LiveScan:
+    """
+    Run airodump-ng in the background and show its networks in snype's own table
+
+    The scan ends on Ctrl+C, once no new access point has appeared for
+    convergence seconds, or as soon as the target ESSID/BSSID shows up.
+
+    Args:
+        interface: Monitor mode interface
+        prefix: airodump-ng output prefix
+        target: Optional ESSID or BSSID to stop on
+        convergence: Seconds without a new access point before stopping (0 disables)
+        max_seconds: Optional hard limit on the scan duration
+        plan: Optional ScanPlan choosing the band and channels to hop over
+    """
+    def __init__(self, interface, prefix, target=None, convergence=CONVERGENCE_SECONDS, max_seconds=None,
+                 plan=None):
+        self.interface = interface
+        self.prefix = prefix
+        self.plan = plan
+        self.target = target.strip() if target else None
+        self.convergence = convergence
+        self.max_seconds = max_seconds
+        self.tail = CsvTail(f"{prefix}-01.csv")
+        self.reason = None
+
+    def matches_target(self, ap):
+        if not self.target:
+            return False
+        return ap.bssid == self.target.upper() or ap.essid == self.target
+
+    def render(self, elapsed, stable_for):
+        try:
+            terminal_width = shutil.get_terminal_size().columns
+        except Exception:
+            terminal_width = 70
+        os.system("clear" if os.name == "posix" else "cls")
+        print(colored(f"[+] Live scan on {self.interface}: {len(self.tail.scan.aps)} network(s), {len(self.tail.scan.stations)} station(s), {elapsed:.0f}s", 'cyan'))
+        status = f"[i] No new network for {stable_for:.0f}s"
+        if self.convergence:
+            status += f" (stops at {self.convergence:.0f}s)"
+        if self.target:
+            status += f", waiting for {self.target}"
+        print(colored(status + ". Press Ctrl+C to stop now.", 'yellow'))
+        if self.plan:
+            print(colored(f"[i] Scanning {self.plan.describe()}", 'yellow'))
+        print(colored("=" * terminal_width, 'cyan'))
+        print(colored("BSSID              CH  PWR  CL  ESSID", 'cyan'))
+        print(colored("-" * terminal_width, 'cyan'))
+        scan = self.tail.scan
+        for ap in scan.sorted_aps():
+            color = 'green' if self.matches_target(ap) else 'blue'
+            print(colored(f"{ap.bssid:<18} {ap.channel:<3} {ap.power:<4} {len(scan.clients(ap.bssid)):<3} {ap.essid}", color))
+
+    def run(self):
+        """
+        Scan until one of the stop conditions is met
+
+        Returns:
+            ScanResult of the last CSV written
+        """
+        # Own command line: airodump-ng's screen output is silenced so the table above is readable
+        cmd = ["sudo", "airodump-ng", "-w", self.prefix, "--output-format", "csv"]
+        if self.plan:
+            cmd.extend(self.plan.airodump_args())
+        cmd.append(self.interface)
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        started = time.monotonic()
+        last_change = started
+        known = set()
+        try:
+            while process.poll() is None:
+                now = time.monotonic()
+                if self.tail.poll():
+                    new = set(self.tail.scan.aps) - known
+                    if new:
+                        known |= new
+                        last_change = now
+                self.render(now - started, now - last_change)
+
+                if any(self.matches_target(ap) for ap in self.tail.scan.aps.values()):
+                    self.reason = f"{self.target} found"
+                    break
+                if self.convergence and known and now - last_change >= self.convergence:
+                    self.reason = f"no new network for {self.convergence:.0f}s"
+                    break
+                if self.max_seconds and now - started >= self.max_seconds:
+                    self.reason = f"{self.max_seconds:.0f}s limit reached"
+                    break
+                time.sleep(REFRESH_INTERVAL)
+            else:
+                self.reason = "airodump-ng exited"
+        except KeyboardInterrupt:
+            self.reason = "stopped by user"
+        finally:
+            if process.poll() is None:
+                process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+        self.tail.poll()
+        return self.tail.scan
@@ -3,7 +3,11 @@ import sys
 import time
 import os
 from termcolor import colored
-from functions import clear_screen
+from functions import clear_screen, get_saved_network_info
+from handshake_watch import HandshakeWatcher, print_handshake
+from capture_segments import SegmentedCapture, parse_rotation
+from handshake_index import HandshakeIndex
+from scan_history import ScanHistory
 import shutil
 
 def show_deauth_terminal_warning():
@@ -48,12 +52,95 @@ def show_deauth_terminal_warning():
     continue_prompt = input(colored("\nPress Enter to continue with monitoring or Ctrl+C to cancel...", 'green'))
     return
 
-def run_targeted_airodump(interface=None, mac=None, channel=None):
+def ask_rotation(rotation=None, quota=None):
+    """
+    Ask how the capture should be split into segments
+    
+    Args:
+        rotation: Rotation bound (see parse_rotation); prompted for when None
+        quota: Disk quota for the segments, in MB; prompted for when None and rotating
+    
+    Returns:
+        Tuple of (segment bytes, segment seconds, quota bytes), all None for a single capture
+    """
+    while True:
+        if rotation is None:
+            rotation = input(colored("Rotate the capture every N MB or N minutes (e.g. 100 or 10m, Enter for a single file): ", 'green'))
+        try:
+            segment_bytes, segment_seconds = parse_rotation(rotation)
+            break
+        except ValueError:
+            print(colored(f"[!] Invalid value: {rotation}", 'red'))
+            rotation = None
+    
+    if not (segment_bytes or segment_seconds):
+        return None, None, None
+    
+    while True:
+        if quota is None:
+            quota = input(colored("Disk quota in MB for segments without handshakes (Enter for none): ", 'green')).strip()
+        try:
+            quota_bytes = int(float(quota) * 1024 * 1024) if quota else None
+            break
+        except ValueError:
+            print(colored(f"[!] Invalid value: {quota}", 'red'))
+            quota = None
+    
+    return segment_bytes, segment_seconds, quota_bytes
+
+def pick_known_network():
+    """
+    Let the user pick a target from the scan history instead of running a new scan
+    
+    The choice is saved to selected_network.txt like a scan selection.
+    
+    Returns:
+        Tuple of (BSSID, channel), or (None, None)
+    """
+    with ScanHistory() as history:
+        networks = history.recent_networks()
+        if not networks:
+            return None, None
+        
+        print(colored("[+] Networks from previous scans:", 'green'))
+        print(colored("ID  BSSID              CH  PWR  LAST SEEN         ESSID", 'cyan'))
+        for i, network in enumerate(networks):
+            last_seen = time.strftime("%Y-%m-%d %H:%M", time.localtime(network["last_seen"]))
+            print(colored(f"{i:<3} {network['bssid']:<18} {network['channel']:<3} {network['power']:<4} "
+                          f"{last_seen:<17} {network['essid']}", 'blue'))
+        
+        choice = input(colored("\nEnter network ID, BSSID or ESSID (Enter to cancel): ", 'green')).strip()
+        if not choice:
+            return None, None
+        if choice.isdigit() and int(choice) < len(networks):
+            network = networks[int(choice)]
+        else:
+            network = history.find(choice)
+    
+    if not network:
+        print(colored(f"[!] {choice} was not seen in previous scans", 'red'))
+        return None, None
+    
+    with open("selected_network.txt", "w") as f:
+        f.write(f"{network['bssid']},{network['channel']},{network['essid']}")
+    return network["bssid"], str(network["channel"])
+
+def channel_from_history(mac):
+    """Last channel an access point was seen on, or None"""
+    with ScanHistory() as history:
+        network = history.lookup(mac)
+    if not network or not network["channel"] or network["channel"] <= 0:
+        return None
+    last_seen = time.strftime("%Y-%m-%d %H:%M", time.localtime(network["last_seen"]))
+    print(colored(f"[i] Channel {network['channel']} taken from the scan history (last seen {last_seen})", 'cyan'))
+    return str(network["channel"])
+
+def run_targeted_airodump(interface=None, mac=None, channel=None, auto_stop=None, rotation=None, quota=None):
     if not mac or not channel:
         try:
             with open("selected_network.txt", "r") as f:
                 content = f.read().strip()
-                parts = content.split(',')
+                parts = content.split(',', 2)
                 
                 if len(parts) >= 3:
                     saved_bssid, saved_channel, saved_essid = parts[0], parts[1], parts[2]
@@ -63,12 +150,17 @@ def run_targeted_airodump(interface=None, mac=None, channel=None):
                     if not channel:
                         channel = saved_channel
         except FileNotFoundError:
-            print(colored("[!] No network configuration file found.", 'red'))
-            return False
+            pass
         except Exception as e:
             print(colored(f"[!] Error reading network configuration: {e}", 'red'))
             return False
     
+    if not mac:
+        mac, channel = pick_known_network()
+    
+    if mac and not channel:
+        channel = channel_from_history(mac)
+    
     if not interface:
         print(colored("[!] ERROR: No interface specified", 'red'))
         time.sleep(2)
@@ -92,21 +184,64 @@ def run_targeted_airodump(interface=None, mac=None, channel=None):
     
     show_deauth_terminal_warning()
     
+    if auto_stop is None:
+        answer = input(colored("Stop monitoring automatically once a handshake is captured? [Y/n]: ", 'green')).strip().lower()
+        auto_stop = answer != 'n'
+    
+    segment_bytes, segment_seconds, quota_bytes = ask_rotation(rotation, quota)
+    
+    saved_bssid, saved_channel, saved_essid = get_saved_network_info()
+    essid = saved_essid if saved_bssid and saved_bssid.upper() == mac.upper() else None
+    
+    with HandshakeIndex() as index:
+        stored = index.captures_for_bssid(mac)
+    if stored:
+        print(colored(f"[i] {len(stored)} capture(s) of {mac} already stored:", 'cyan'))
+        for cap_file in stored:
+            print(colored(f"     - {cap_file}", 'cyan'))
+    
     subprocess.run(["sudo", "airmon-ng", "check", "kill"], capture_output=True)
     
     try:
+        if segment_bytes or segment_seconds:
+            cmd = ["sudo", "airodump-ng", "--ignore-negative-one", "--output-format", "pcap"]
+            if channel_option:
+                cmd.extend(["-c", channel_option])
+            cmd.extend(["--bssid", mac, interface])
+            
+            capture = SegmentedCapture(cmd, mac, essid=essid, auto_stop=auto_stop,
+                                       segment_bytes=segment_bytes, segment_seconds=segment_seconds,
+                                       quota_bytes=quota_bytes, on_handshake=print_handshake)
+            if capture.run():
+                print(colored(f"\n[✓] {len(capture.hashes)} crackable hash(es) for {mac} captured", 'green'))
+            else:
+                print(colored(f"\n[!] No crackable handshake for {mac} was seen during this capture", 'yellow'))
+            return True
+        
         cmd = ["sudo", "airodump-ng", "--ignore-negative-one", "-w", "eapol", "--output-format", "pcap"]
         if channel_option:
             cmd.extend(["-c", channel_option])
         cmd.extend(["--bssid", mac, interface])
 
         process = subprocess.Popen(cmd)
+        
+        watcher = HandshakeWatcher("eapol", mac, essid=essid, process=process,
+                                   auto_stop=auto_stop, on_handshake=print_handshake)
+        watcher.start()
 
         try:
             process.wait()
         except KeyboardInterrupt:
             process.terminate()
             process.wait()
+        finally:
+            watcher.stop()
+            watcher.join(timeout=2)
+        
+        if watcher.found.is_set():
+            print(colored(f"\n[✓] {len(watcher.hashes)} crackable hash(es) for {mac} in {watcher.capture_file}", 'green'))
+        else:
+            print(colored(f"\n[!] No crackable handshake for {mac} was seen during this capture", 'yellow'))
         
         return True
     
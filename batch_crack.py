@@ -0,0 +1,104 @@
+import time
+import struct
+from termcolor import colored
+from handshake_index import HandshakeIndex
+from hash_merge import unique_hashes
+from hc22000 import parse_hash_line
+from pcap_reader import decode_essid
+from wpa_engine import PmkEngine, HashTarget, crack_targets, wordlist_candidates
+from functions import save_password, format_duration, read_progress
+from wordlist_catalog import WordlistCatalog, ENGINE_NATIVE
+
+def gather_targets():
+    """
+    Collect every uncracked hash in the handshake index, grouped by ESSID
+
+    Groups are keyed by the raw ESSID bytes the PMK is derived from: ESSIDs
+    that only look the same once decoded (invalid UTF-8) stay apart.
+
+    Returns:
+        Dict of raw ESSID -> list of (HashTarget, capture path) tuples
+    """
+    with HandshakeIndex() as index:
+        networks = unique_hashes(index)
+        captures = {row["line"]: row["path"] for row in index.uncracked_hashes()}
+
+    groups = {}
+    for lines in networks.values():
+        for line in lines:
+            try:
+                target = HashTarget(line)
+            except (ValueError, IndexError, struct.error):
+                continue
+            groups.setdefault(target.essid, []).append((target, captures.get(line)))
+    return groups
+
+def batch_crack(wordlist, workers=None):
+    """
+    Run one wordlist pass per ESSID against all of its uncracked hashes
+
+    The PMK only depends on the passphrase and the ESSID, so every hash of an
+    ESSID (different access points, stations, PMKIDs and EAPOL pairs) is tested
+    with the same derived keys. Recovered passwords are recorded with
+    save_password, which also marks them cracked in the handshake index.
+
+    Args:
+        wordlist: Wordlist path
+        workers: PBKDF2 worker processes (default: CPU count)
+
+    Returns:
+        List of (ESSID, BSSID, password) tuples
+    """
+    groups = gather_targets()
+    if not groups:
+        print(colored("[*] No uncracked handshakes in the index.", "yellow"))
+        return []
+
+    hashes = sum(len(targets) for targets in groups.values())
+    print(colored(f"[+] {hashes} uncracked hash(es) in {len(groups)} ESSID group(s)", "green"))
+
+    catalog = WordlistCatalog()
+    try:
+        total = catalog.entry(wordlist, on_progress=read_progress("Counting candidates"))["candidates"]
+    except OSError:
+        total = None
+
+    results = []
+    with PmkEngine(workers) as engine:
+        for raw_essid, entries in groups.items():
+            essid = decode_essid(raw_essid)
+            targets = [target for target, _ in entries if target.supported]
+            skipped = len(entries) - len(targets)
+            if skipped:
+                print(colored(f"[!] {essid}: {skipped} hash(es) need AES-CMAC (pip install cryptography), skipped", "yellow"))
+            if not targets:
+                continue
+
+            print(colored(f"\n[*] {essid}: {len(targets)} hash(es)", "cyan"))
+            started = time.monotonic()
+
+            def on_progress(tested):
+                rate = tested / max(time.monotonic() - started, 1e-6)
+                catalog.record_rate(ENGINE_NATIVE, rate)
+                eta = f", ETA {format_duration((total - tested) / rate)}" if total and rate else ""
+                print(f"\r[*] {essid}: {tested}/{total or '?'} candidates tested ({rate:.0f}/s){eta}",
+                      end="", flush=True)
+
+            found = crack_targets(engine, raw_essid, targets, wordlist_candidates(wordlist), on_progress)
+            print()
+
+            captures = {target.line: cap_file for target, cap_file in entries}
+            saved = set()
+            for line, passphrase in found.items():
+                password = passphrase.decode("utf-8", errors="replace")
+                bssid = parse_hash_line(line)["bssid"]
+                print(colored(f"[SUCCESS] {essid} ({bssid}): {password}", "green"))
+                if password not in saved:
+                    save_password(essid, password, captures.get(line) or "handshakes")
+                    saved.add(password)
+                results.append((essid, bssid, password))
+            if not found:
+                print(colored(f"[RESULT] No password found for {essid}", "yellow"))
+
+    catalog.save()
+    return results
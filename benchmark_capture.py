@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import struct
+import argparse
+import resource
+import tempfile
+from termcolor import colored
+from pcap_reader import LINKTYPE_IEEE802_11, CHUNK_SIZE, MAX_RECORD_SIZE, decode_essid
+from pcap_writer import PcapWriter, PCAP_RECORD_HEADER
+from hc22000 import generate_hashes
+from functions import format_size, read_progress
+
+BSSID = bytes.fromhex("020000000001")
+STATION = bytes.fromhex("020000000002")
+ESSID = b"snype-benchmark"
+
+def beacon_frame():
+    header = bytes([0x80, 0x00, 0x00, 0x00]) + b"\xff" * 6 + BSSID + BSSID + b"\x00\x00"
+    body = b"\x00" * 8 + b"\x64\x00\x11\x04" + bytes([0, len(ESSID)]) + ESSID + bytes([3, 1, 6])
+    return header + body
+
+def pmkid_m1_frame():
+    key_data = b"\xdd\x14\x00\x0f\xac\x04" + bytes(range(1, 17))
+    key = (struct.pack(">BHHQ", 2, 0x008a, 16, 1) + bytes(range(32)) + b"\x00" * 32 +
+           b"\x00" * 16 + struct.pack(">H", len(key_data)) + key_data)
+    eapol = struct.pack(">BBH", 1, 3, len(key)) + key
+    header = bytes([0x08, 0x02, 0x00, 0x00]) + STATION + BSSID + BSSID + b"\x00\x00"
+    return header + b"\xaa\xaa\x03\x00\x00\x00\x88\x8e" + eapol
+
+def data_frame(size):
+    header = bytes([0x08, 0x41, 0x00, 0x00]) + BSSID + STATION + BSSID + b"\x00\x00"
+    return header + b"\x5a" * (size - len(header))
+
+def write_synthetic_capture(path, size, frame_size=1500):
+    """
+    Write a pcap of about size bytes: a beacon and a PMKID M1 in the middle of data frames
+
+    Returns:
+        Number of records written
+    """
+    filler = data_frame(frame_size)
+    record = PCAP_RECORD_HEADER.pack(1700000000, 0, len(filler), len(filler)) + filler
+    batch = record * max(1, (8 * 1024 * 1024) // len(record))
+
+    with PcapWriter(path, LINKTYPE_IEEE802_11) as writer:
+        writer.write(1700000000.0, beacon_frame())
+        handshake_at = size // 2
+        while writer.tell() < size:
+            if handshake_at is not None and writer.tell() >= handshake_at:
+                writer.write(1700000000.5, pmkid_m1_frame())
+                handshake_at = None
+            writer.write_raw(batch, len(batch) // len(record))
+        return writer.count
+
+def peak_rss():
+    """Peak resident set size of this process in bytes"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory use of hc22000 generation on a large synthetic capture")
+    parser.add_argument("--size", type=float, default=5.0, help="Capture size in GB (default: 5)")
+    parser.add_argument("--path", help="Capture path (default: a temporary file)")
+    parser.add_argument("--keep", action="store_true", help="Keep the capture afterwards")
+    parser.add_argument("--ceiling", type=float, default=64.0,
+                        help="Allowed RSS growth while parsing, in MB (default: 64)")
+    args = parser.parse_args()
+
+    size = int(args.size * 1024 ** 3)
+    path = args.path or os.path.join(tempfile.gettempdir(), "snype-benchmark.cap")
+
+    print(colored(f"[*] Writing {format_size(size)} synthetic capture to {path}", "cyan"))
+    start = time.monotonic()
+    records = write_synthetic_capture(path, size)
+    print(colored(f"[+] {records} records written in {time.monotonic() - start:.1f}s", "green"))
+
+    try:
+        baseline = peak_rss()
+        start = time.monotonic()
+        lines, essids = generate_hashes(path, on_progress=read_progress("Generating hashes"))
+        elapsed = time.monotonic() - start
+        growth = peak_rss() - baseline
+
+        capture_size = os.path.getsize(path)
+        print(colored(f"[+] {len(lines)} hash line(s), ESSIDs: {', '.join(map(decode_essid, essids.values()))}", "green"))
+        print(f"    Throughput: {format_size(capture_size / elapsed)}/s ({elapsed:.1f}s)")
+        print(f"    Peak RSS growth while parsing: {format_size(max(growth, 0))}")
+        print(f"    Reader ceiling: {format_size(CHUNK_SIZE + MAX_RECORD_SIZE)} "
+              f"(chunk {format_size(CHUNK_SIZE)} + record {format_size(MAX_RECORD_SIZE)})")
+
+        if not lines:
+            print(colored("[!] The PMKID in the synthetic capture was not found", "red"))
+            return 1
+        if growth > args.ceiling * 1024 * 1024:
+            print(colored(f"[!] Memory grew beyond the {args.ceiling:.0f} MB ceiling", "red"))
+            return 1
+        print(colored("[✓] Memory stayed within the ceiling", "green"))
+        return 0
+    finally:
+        if not args.keep and os.path.exists(path):
+            os.remove(path)
+
+if __name__ == "__main__":
+    sys.exit(main())
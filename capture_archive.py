@@ -0,0 +1,78 @@
+import os
+import time
+from termcolor import colored
+from compression import METHOD_GZIP, available_methods, compression_of, compress_file
+from conversion_cache import ConversionManifest
+from handshake_index import HandshakeIndex
+from functions import format_size
+
+def archive_captures(method=METHOD_GZIP, min_age_days=0, handshakes_dir="handshakes"):
+    """
+    Compress the stored captures under the handshakes folder
+
+    Each archived capture keeps its conversion manifest entry and index rows,
+    so it is not converted again and still shows up for cracking. The .hc22000
+    files stay uncompressed since hashcat reads them directly.
+
+    Args:
+        method: One of available_methods()
+        min_age_days: Only archive captures not modified for this many days
+        handshakes_dir: Folder holding the organized captures
+
+    Returns:
+        Tuple of (captures archived, bytes saved)
+    """
+    manifest = ConversionManifest()
+    with HandshakeIndex() as index:
+        cap_files = [f for f in index.capture_files(converted_only=False)
+                     if f.startswith(handshakes_dir + os.sep) and not compression_of(f)]
+
+    cutoff = time.time() - min_age_days * 86400
+    archived = 0
+    saved = 0
+    for cap_file in cap_files:
+        try:
+            if os.path.getmtime(cap_file) > cutoff:
+                continue
+            before = os.path.getsize(cap_file)
+            old_digest = manifest.digest_for(cap_file)
+            archive = compress_file(cap_file, method)
+        except (OSError, ValueError) as e:
+            print(colored(f"[!] Could not archive {cap_file}: {e}", 'red'))
+            continue
+
+        manifest.carry_over(archive, old_digest)
+        with HandshakeIndex() as index:
+            index.move_capture(cap_file, archive)
+        archived += 1
+        saved += before - os.path.getsize(archive)
+        print(colored(f"[+] {cap_file} -> {archive}", 'green'))
+
+    manifest.prune()
+    manifest.save()
+    return archived, saved
+
+def archive_stored_captures():
+    """Ask for a compression method and minimum age, then archive the stored captures"""
+    methods = available_methods()
+    print(colored("[+] Archive stored captures", 'yellow'))
+    print(colored("[i] Archived captures stay readable for conversion and cracking.", 'cyan'))
+    for idx, method in enumerate(methods, 1):
+        print(colored(f" [{idx}] {method}", 'white'))
+
+    try:
+        choice = input(colored(f"Compression method (1-{len(methods)}, Enter for {methods[0]}): ", 'cyan')).strip()
+        method = methods[int(choice) - 1] if choice else methods[0]
+        age = input(colored("Only archive captures older than N days (Enter for all): ", 'cyan')).strip()
+        min_age_days = float(age) if age else 0
+    except (ValueError, IndexError):
+        print(colored("[!] Invalid choice.", 'red'))
+        time.sleep(2)
+        return
+
+    archived, saved = archive_captures(method, min_age_days)
+    if archived:
+        print(colored(f"[✓] Archived {archived} capture(s), {format_size(saved)} saved.", 'green'))
+    else:
+        print(colored("No captures to archive.", 'yellow'))
+    time.sleep(2)
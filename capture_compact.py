@@ -0,0 +1,135 @@
+import os
+from pcap_reader import CaptureReader, Beacon, EapolKey, strip_link_header, parse_frame
+from pcap_writer import PcapWriter
+from hc22000 import generate_hashes
+from conversion_cache import ConversionManifest
+from handshake_index import HandshakeIndex
+from compression import compression_of
+
+# Association request/response and reassociation request/response
+ASSOCIATION_SUBTYPES = (0, 1, 2, 3)
+
+def essential_packets(reader):
+    """
+    Yield the packets hash generation depends on
+
+    Kept: the first beacon or probe response of each (BSSID, ESSID), every
+    EAPOL-Key frame and every (re)association frame. Data frames, repeated
+    beacons and everything else are dropped.
+
+    Yields:
+        Tuple of (timestamp, linktype, packet memoryview)
+    """
+    seen_networks = set()
+    for timestamp, linktype, packet in reader.records():
+        frame, radiotap_channel = strip_link_header(linktype, packet)
+        if frame is None or len(frame) < 24:
+            continue
+        frame_type = (frame[0] >> 2) & 0x03
+        subtype = frame[0] >> 4
+        if frame_type == 0 and subtype in ASSOCIATION_SUBTYPES:
+            yield timestamp, linktype, packet
+            continue
+
+        parsed = parse_frame(frame, timestamp, radiotap_channel)
+        if isinstance(parsed, Beacon):
+            key = (parsed.bssid, parsed.essid)
+            if key not in seen_networks:
+                seen_networks.add(key)
+                yield timestamp, linktype, packet
+        elif isinstance(parsed, EapolKey):
+            yield timestamp, linktype, packet
+
+def _write_essential(reader, out_file):
+    """Write the essential packets to out_file, returning the link type or None"""
+    writer = None
+    linktype = None
+    packets = essential_packets(reader)
+    try:
+        for timestamp, packet_linktype, packet in packets:
+            if writer is None:
+                linktype = packet_linktype
+                writer = PcapWriter(out_file, linktype)
+                writer.open()
+            elif packet_linktype != linktype:
+                # Classic pcap holds a single link type
+                return None
+            writer.write(timestamp, packet)
+    finally:
+        packets.close()
+        if writer is not None:
+            writer.close()
+    return linktype
+
+def compact_capture(cap_file):
+    """
+    Rewrite a capture in place, keeping only its essential frames
+
+    The compacted copy is written next to the original and only replaces it
+    when it yields exactly the same hc22000 lines and is smaller.
+
+    Args:
+        cap_file: Path to a .cap, .pcap or .pcapng file
+
+    Returns:
+        Tuple of (bytes before, bytes after) when the capture was rewritten, or None
+    """
+    tmp_file = f"{cap_file}.compact"
+    try:
+        with CaptureReader(cap_file) as reader:
+            linktype = _write_essential(reader, tmp_file)
+        if linktype is None:
+            return None
+
+        before = os.path.getsize(cap_file)
+        after = os.path.getsize(tmp_file)
+        if after >= before or generate_hashes(tmp_file)[0] != generate_hashes(cap_file)[0]:
+            return None
+
+        stat = os.stat(cap_file)
+        os.utime(tmp_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_file, cap_file)
+        return before, after
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+def compact_stored_captures(handshakes_dir="handshakes", should_stop=None):
+    """
+    Compact every indexed capture under the handshakes folder once
+
+    Captures are marked compacted in the conversion manifest (also when
+    compaction was not worth it), so each is only processed once. Archived
+    (compressed) captures are left alone. should_stop is checked between
+    captures; when it returns True the rest is left for the next call.
+
+    Returns:
+        Tuple of (captures rewritten, bytes saved)
+    """
+    manifest = ConversionManifest()
+    with HandshakeIndex() as index:
+        cap_files = [f for f in index.capture_files(converted_only=False)
+                     if f.startswith(handshakes_dir + os.sep) and not compression_of(f)]
+
+    rewritten = 0
+    saved = 0
+    for cap_file in cap_files:
+        if should_stop and should_stop():
+            break
+        try:
+            entry = manifest.lookup(cap_file)
+            if entry and entry.get("compacted"):
+                continue
+            old_digest = manifest.digest_for(cap_file)
+            sizes = compact_capture(cap_file)
+        except (OSError, ValueError):
+            continue
+
+        manifest.carry_over(cap_file, old_digest, compacted=True)
+        if sizes:
+            rewritten += 1
+            saved += sizes[0] - sizes[1]
+
+    manifest.prune()
+    manifest.save()
+    return rewritten, saved
@@ -0,0 +1,242 @@
+import os
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait
+from termcolor import colored
+from converter import convert_captures, RESULT_ERROR
+from conversion_cache import RESULT_CONVERTED, RESULT_NO_HASHES
+from handshake_watch import HandshakeWatcher
+from hc22000 import EAPOL_TIMEOUT
+from functions import format_size
+
+# Longest a rotation may be postponed while an EAPOL exchange is in progress
+MAX_ROTATION_DELAY = 30.0
+# Conversions tried per segment; a segment that keeps failing stays on disk
+MAX_CONVERSION_ATTEMPTS = 3
+
+def parse_rotation(text):
+    """
+    Parse a rotation bound typed by the user
+
+    Args:
+        text: "100" or "100M" (megabytes), "2G" (gigabytes), "10m" (minutes) or "90s" (seconds)
+
+    Returns:
+        Tuple of (segment bytes, segment seconds), either of which may be None
+
+    Raises:
+        ValueError: If the text is not a valid bound
+    """
+    text = text.strip()
+    if not text:
+        return None, None
+    units = {"M": (1024 ** 2, None), "G": (1024 ** 3, None), "m": (None, 60), "s": (None, 1)}
+    number, unit = (text[:-1], text[-1]) if text[-1] in units else (text, "M")
+    value = float(number)
+    if value <= 0:
+        raise ValueError(f"Invalid rotation bound: {text}")
+    byte_scale, second_scale = units[unit]
+    if byte_scale:
+        return int(value * byte_scale), None
+    return None, value * second_scale
+
+class SegmentedCapture:
+    """
+    Run airodump-ng as a series of size- or time-bounded capture segments
+
+    airodump-ng cannot rotate its own output, so each segment is a separate
+    airodump-ng run writing to <prefix>-<session>-sNNN-01.cap. A rotation is
+    postponed (up to MAX_ROTATION_DELAY) while EAPOL frames are arriving, so a
+    handshake is not split across two segments. Every closed segment is
+    converted on a background thread right away; a conversion that fails is
+    retried when the next segment closes. With a quota, the oldest segments
+    whose conversion found no hashes are deleted once the session's segments
+    take more space than allowed.
+
+    Args:
+        base_cmd: airodump-ng command line without the -w option
+        bssid: Target access point
+        essid: Target ESSID if known
+        prefix: Output prefix
+        auto_stop: End the session once a handshake is captured
+        segment_bytes: Rotate when the segment reaches this size
+        segment_seconds: Rotate when the segment is this old
+        quota_bytes: Disk quota for the session's segments
+        on_handshake: Callback receiving (hash line, description)
+    """
+    def __init__(self, base_cmd, bssid, essid=None, prefix="eapol", auto_stop=False,
+                 segment_bytes=None, segment_seconds=None, quota_bytes=None, on_handshake=None):
+        self.base_cmd = base_cmd
+        self.bssid = bssid
+        self.essid = essid
+        self.session = f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}"
+        self.auto_stop = auto_stop
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.quota_bytes = quota_bytes
+        self.on_handshake = on_handshake
+        self.segments = []
+        self.hashes = []
+        self.evicted = []
+        self.converter = ThreadPoolExecutor(max_workers=1)
+        self.lock = threading.Lock()
+        self._due_since = None
+
+    def _rotation_due(self, watcher, started):
+        now = time.monotonic()
+        due = bool(self.segment_seconds and now - started >= self.segment_seconds)
+        if not due and self.segment_bytes and watcher.capture_file:
+            try:
+                due = os.path.getsize(watcher.capture_file) >= self.segment_bytes
+            except OSError:
+                due = False
+        if not due:
+            return False
+        if self._due_since is None:
+            self._due_since = now
+        quiet = now - watcher.last_eapol > EAPOL_TIMEOUT
+        return quiet or now - self._due_since > MAX_ROTATION_DELAY
+
+    def _run_segment(self, number):
+        """Run one airodump-ng segment; returns (watcher, True if the session should end)"""
+        prefix = f"{self.session}-s{number:03d}"
+        cmd = self.base_cmd[:]
+        cmd[2:2] = ["-w", prefix]
+        process = subprocess.Popen(cmd)
+        watcher = HandshakeWatcher(prefix, self.bssid, essid=self.essid, process=process,
+                                   auto_stop=self.auto_stop, on_handshake=self.on_handshake)
+        watcher.start()
+        started = time.monotonic()
+        self._due_since = None
+        rotated = False
+        try:
+            while process.poll() is None:
+                if self._rotation_due(watcher, started):
+                    rotated = True
+                    process.terminate()
+                    break
+                time.sleep(0.5)
+            process.wait()
+        except KeyboardInterrupt:
+            rotated = False
+            process.terminate()
+            process.wait()
+        finally:
+            watcher.stop()
+            watcher.join(timeout=2)
+        return watcher, not rotated
+
+    def _close_segment(self, watcher):
+        capture_file = watcher.capture_file or watcher.locate_capture()
+        self.hashes.extend(watcher.hashes)
+        if not capture_file:
+            return
+        self._retry_failed()
+        segment = {"path": capture_file, "handshake": bool(watcher.hashes), "result": None,
+                   "attempts": 0, "queued": True}
+        with self.lock:
+            self.segments.append(segment)
+        print(colored(f"\n[*] Segment closed: {capture_file}", 'cyan'))
+        self.converter.submit(self._convert_segment, segment)
+
+    def _retry_failed(self):
+        """
+        Queue the conversion of segments whose earlier conversion failed
+
+        Returns:
+            List of futures of the queued conversions
+        """
+        with self.lock:
+            failed = [segment for segment in self.segments
+                      if segment["result"] in (None, RESULT_ERROR) and not segment["queued"]
+                      and segment["attempts"] < MAX_CONVERSION_ATTEMPTS]
+            for segment in failed:
+                segment["queued"] = True
+        futures = []
+        for segment in failed:
+            print(colored(f"\n[*] Retrying conversion of {segment['path']}", 'cyan'))
+            futures.append(self.converter.submit(self._convert_segment, segment))
+        return futures
+
+    def _convert_segment(self, segment):
+        segment["attempts"] += 1
+        try:
+            result = convert_captures([segment["path"]], "handshakes")[0]
+            if result["result"] == RESULT_CONVERTED:
+                segment["handshake"] = True
+            if result["error"]:
+                print(colored(f"\n[!] Error converting {segment['path']}: {result['error']}", 'red'))
+            segment["path"] = result["cap_dest"]
+            segment["result"] = result["result"]
+        except Exception as e:
+            print(colored(f"\n[!] Error converting {segment['path']}: {e}", 'red'))
+        with self.lock:
+            segment["queued"] = False
+        self._enforce_quota()
+
+    def _usage(self):
+        total = 0
+        with self.lock:
+            segments = list(self.segments)
+        for segment in segments:
+            try:
+                total += os.path.getsize(segment["path"])
+            except OSError:
+                pass
+        return total
+
+    def _enforce_quota(self):
+        if not self.quota_bytes:
+            return
+        with self.lock:
+            segments = list(self.segments)
+        for segment in segments:
+            if self._usage() <= self.quota_bytes:
+                return
+            # Only a finished conversion proves a segment useless; failed ones are retried
+            if segment["result"] == RESULT_NO_HASHES and not segment["handshake"]:
+                try:
+                    os.remove(segment["path"])
+                except OSError:
+                    continue
+                with self.lock:
+                    self.segments.remove(segment)
+                self.evicted.append(segment["path"])
+                print(colored(f"\n[-] Quota reached, evicted segment without handshake: {segment['path']}", 'yellow'))
+        if self._usage() > self.quota_bytes:
+            print(colored(f"\n[!] Segments with handshakes alone exceed the {format_size(self.quota_bytes)} quota", 'yellow'))
+
+    def run(self):
+        """
+        Capture segments until the user stops or auto-stop triggers
+
+        Returns:
+            True if a handshake for the target was captured
+        """
+        number = 1
+        try:
+            while True:
+                watcher, stopped = self._run_segment(number)
+                self._close_segment(watcher)
+                if stopped or (self.auto_stop and watcher.found.is_set()):
+                    break
+                number += 1
+        finally:
+            print(colored("\n[*] Waiting for segment conversion to finish...", 'cyan'))
+            # The pool has a single worker: once this no-op ran, every queued conversion did
+            self.converter.submit(lambda: None).result()
+            while True:
+                retries = self._retry_failed()
+                if not retries:
+                    break
+                wait(retries)
+            self.converter.shutdown(wait=True)
+
+        with_handshake = sum(1 for segment in self.segments if segment["handshake"])
+        failed = sum(1 for segment in self.segments if segment["result"] in (None, RESULT_ERROR))
+        print(colored(f"\n[+] {number} segment(s), {with_handshake} with handshakes, "
+                      f"{len(self.evicted)} evicted, {format_size(self._usage())} on disk", 'green'))
+        if failed:
+            print(colored(f"[!] {failed} segment(s) could not be converted and were kept", 'yellow'))
+        return bool(self.hashes)
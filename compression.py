@@ -0,0 +1,194 @@
+import os
+import gzip
+import lzma
+import threading
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+METHOD_GZIP = "gzip"
+METHOD_XZ = "xz"
+METHOD_ZSTD = "zstd"
+
+SUFFIXES = {
+    METHOD_GZIP: ".gz",
+    METHOD_XZ: ".xz",
+    METHOD_ZSTD: ".zst",
+}
+
+CAPTURE_EXTENSIONS = (".cap",) + tuple(f".cap{suffix}" for suffix in SUFFIXES.values())
+
+def available_methods():
+    """Compression methods usable here (zstd needs the zstandard module)"""
+    return [method for method in SUFFIXES if method != METHOD_ZSTD or zstandard is not None]
+
+def compression_of(path):
+    """Return the compression method of a file from its suffix, or None"""
+    for method, suffix in SUFFIXES.items():
+        if path.endswith(suffix):
+            return method
+    return None
+
+def strip_compression(path):
+    """Path without its compression suffix"""
+    method = compression_of(path)
+    return path[:-len(SUFFIXES[method])] if method else path
+
+def capture_stem(path):
+    """Capture path without compression suffix and extension (handshakes/x/eapol-01)"""
+    return os.path.splitext(strip_compression(path))[0]
+
+def open_compressed(raw, method):
+    """
+    Wrap a binary file object in a streaming decompressor
+
+    Args:
+        raw: File object opened in binary mode
+        method: One of the METHOD_* constants or None for no compression
+
+    Returns:
+        Readable binary file object
+    """
+    if method is None:
+        return raw
+    if method == METHOD_GZIP:
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if method == METHOD_XZ:
+        return lzma.LZMAFile(raw, mode="rb")
+    if method == METHOD_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd compressed file, but the zstandard module is not installed")
+        return zstandard.ZstdDecompressor().stream_reader(raw)
+    raise ValueError(f"Unknown compression method: {method}")
+
+def _compressor(raw, method):
+    if method == METHOD_GZIP:
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+    if method == METHOD_XZ:
+        return lzma.LZMAFile(raw, mode="wb", preset=6)
+    if method == METHOD_ZSTD:
+        if zstandard is None:
+            raise ValueError("The zstandard module is not installed")
+        return zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+    raise ValueError(f"Unknown compression method: {method}")
+
+@contextmanager
+def open_file(path):
+    """Open a possibly compressed file for binary reading, decompressing on the fly"""
+    raw = open(path, "rb")
+    stream = None
+    try:
+        stream = open_compressed(raw, compression_of(path))
+        yield stream
+    finally:
+        if stream is not None and stream is not raw:
+            stream.close()
+        raw.close()
+
+def _read_exact(stream, length):
+    data = b""
+    while len(data) < length:
+        chunk = stream.read(length - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+def compress_file(path, method):
+    """
+    Compress a file next to itself and remove the original
+
+    The compressed copy is read back and compared with the original before the
+    original is deleted. Modification times are preserved.
+
+    Args:
+        path: Uncompressed file
+        method: One of available_methods()
+
+    Returns:
+        Path of the compressed file
+    """
+    dest = path + SUFFIXES[method]
+    tmp_dest = dest + ".tmp"
+    try:
+        with open(path, "rb") as src, open(tmp_dest, "wb") as raw:
+            writer = _compressor(raw, method)
+            try:
+                while True:
+                    chunk = src.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+            finally:
+                writer.close()
+
+        with open(path, "rb") as original, open(tmp_dest, "rb") as raw:
+            copy = open_compressed(raw, method)
+            try:
+                while True:
+                    expected = original.read(COPY_CHUNK_SIZE)
+                    actual = _read_exact(copy, len(expected)) if expected else copy.read(1)
+                    if actual != expected:
+                        raise ValueError(f"Compressed copy of {path} does not match the original")
+                    if not expected:
+                        break
+            finally:
+                copy.close()
+
+        stat = os.stat(path)
+        os.utime(tmp_dest, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_dest, dest)
+        os.remove(path)
+        return dest
+    finally:
+        if os.path.exists(tmp_dest):
+            os.remove(tmp_dest)
+
+@contextmanager
+def decompressed_path(path):
+    """
+    Give external tools a readable path to the decompressed content of a file
+
+    Uncompressed files are passed through. For compressed files a pipe is
+    created and a thread streams the decompressed bytes into it; the yielded
+    path is /dev/fd/N of the read end, whose descriptor must be handed to the
+    child with Popen(pass_fds=...).
+
+    Yields:
+        Tuple of (path, tuple of file descriptors to pass to the child)
+    """
+    if compression_of(path) is None:
+        yield path, ()
+        return
+
+    read_fd, write_fd = os.pipe()
+
+    def feed():
+        pipe = os.fdopen(write_fd, "wb")
+        try:
+            with open_file(path) as stream:
+                while True:
+                    chunk = stream.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    pipe.write(chunk)
+        except (OSError, ValueError, EOFError):
+            pass
+        finally:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=feed, daemon=True)
+    thread.start()
+    try:
+        yield f"/dev/fd/{read_fd}", (read_fd,)
+    finally:
+        os.close(read_fd)
+        thread.join(timeout=1)
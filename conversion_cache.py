@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import hashlib
+
+MANIFEST_PATH = os.path.join(os.path.expanduser("~"), ".snype", "conversion_manifest.json")
+
+RESULT_CONVERTED = "converted"
+RESULT_NO_HASHES = "no_hashes"
+RESULT_NO_ESSID = "no_essid"
+RESULT_UNREADABLE = "unreadable"
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """
+    Compute the SHA-256 content hash of a file without loading it into memory
+
+    Args:
+        path: File to hash
+        chunk_size: Number of bytes read per iteration
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ConversionManifest:
+    """
+    Persistent record of capture conversions, keyed by file size, mtime and content hash.
+
+    The manifest keeps two maps:
+    - paths: absolute path -> {size, mtime_ns, digest}, used for the cheap stat check
+    - entries: content digest -> {essid, bssid, networks, hc22000, result, converted_at}
+
+    A capture whose size and mtime match its path record is never hashed again.
+    A capture that was touched, renamed or copied is hashed once and matched by content.
+    """
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.paths = {}
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load the manifest from disk, starting empty if it is missing or unreadable"""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.paths = data.get("paths", {})
+            self.entries = data.get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            self.paths = {}
+            self.entries = {}
+
+    def save(self):
+        """Atomically write the manifest back to disk if it changed"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"paths": self.paths, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def _stat_key(self, cap_file):
+        st = os.stat(cap_file)
+        return os.path.abspath(cap_file), st.st_size, st.st_mtime_ns
+
+    def digest_for(self, cap_file):
+        """
+        Return the content digest of a capture, hashing it only if size or mtime changed
+
+        Args:
+            cap_file: Path to the capture file
+
+        Returns:
+            Hex digest string
+        """
+        abs_path, size, mtime_ns = self._stat_key(cap_file)
+        known = self.paths.get(abs_path)
+        if known and known["size"] == size and known["mtime_ns"] == mtime_ns:
+            return known["digest"]
+
+        digest = file_digest(cap_file)
+        self.paths[abs_path] = {"size": size, "mtime_ns": mtime_ns, "digest": digest}
+        self.dirty = True
+        return digest
+
+    def lookup(self, cap_file):
+        """
+        Look up the cached conversion result for a capture
+
+        Args:
+            cap_file: Path to the capture file
+
+        Returns:
+            Entry dict (essid, bssid, networks, hc22000, result, converted_at) or None if never converted
+        """
+        try:
+            return self.entries.get(self.digest_for(cap_file))
+        except OSError:
+            return None
+
+    def record(self, cap_file, essid, hc22000_file, result, networks=None):
+        """
+        Record the outcome of converting a capture
+
+        Args:
+            cap_file: Path of the capture when it was converted
+            essid: Extracted ESSID (or None)
+            hc22000_file: Path of the generated hc22000 file (or None)
+            result: One of the RESULT_* constants
+            networks: List of {bssid, essid} dicts found in the hash lines
+        """
+        try:
+            digest = self.digest_for(cap_file)
+        except OSError:
+            return
+
+        networks = networks or []
+        self.entries[digest] = {
+            "essid": essid,
+            "bssid": networks[0]["bssid"] if networks else None,
+            "networks": networks,
+            "hc22000": os.path.abspath(hc22000_file) if hc22000_file else None,
+            "result": result,
+            "converted_at": time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        self.dirty = True
+
+    def metadata_for(self, cap_file):
+        """
+        Return the ESSID/BSSID recorded for a capture by a previous conversion
+
+        Args:
+            cap_file: Path to the capture file
+
+        Returns:
+            Tuple of (essid, bssid), either of which may be None
+        """
+        entry = self.lookup(cap_file)
+        if not entry:
+            return None, None
+        return entry.get("essid"), entry.get("bssid")
+
+    def relocate(self, old_path, new_path):
+        """
+        Carry the stat record of a moved capture over to its new path
+
+        Args:
+            old_path: Path before the move
+            new_path: Path after the move (size and mtime are preserved by shutil.move)
+        """
+        record = self.paths.pop(os.path.abspath(old_path), None)
+        if record:
+            self.paths[os.path.abspath(new_path)] = record
+            self.dirty = True
+
+    def carry_over(self, cap_file, old_digest, **changes):
+        """
+        Keep the conversion entry of a capture whose content was rewritten
+
+        Args:
+            cap_file: Path of the rewritten capture
+            old_digest: Digest of the capture before it was rewritten
+            changes: Entry fields to update (e.g. compacted=True)
+        """
+        entry = dict(self.entries.get(old_digest) or {})
+        entry.update(changes)
+        try:
+            self.entries[self.digest_for(cap_file)] = entry
+        except OSError:
+            return
+        self.dirty = True
+
+    def prune(self):
+        """Forget path records whose files no longer exist"""
+        stale = [p for p in self.paths if not os.path.exists(p)]
+        for p in stale:
+            del self.paths[p]
+        if stale:
+            self.dirty = True
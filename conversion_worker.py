@@ -0,0 +1,133 @@
+import os
+import threading
+from contextlib import contextmanager
+from termcolor import colored
+from functions import check_and_convert_cap_files, cleanup_essidlist_files
+from capture_compact import compact_stored_captures
+
+class ConversionWorker(threading.Thread):
+    """
+    Background thread that owns capture conversion for the interactive menus
+
+    The worker runs check_and_convert_cap_files in a loop and publishes a snapshot
+    of its results. Menus read the snapshot and never wait on conversion.
+    Captures modified within settle_seconds are left alone, since airodump-ng
+    may still be writing them. Once converted, stored captures are compacted
+    down to the frames hash generation needs. hold() asks a running cycle to
+    pause: the worker stops between batches of captures and finishes the rest
+    on a later cycle.
+
+    Usage:
+        worker = ConversionWorker()
+        worker.start()
+        snapshot = worker.snapshot()
+        with worker.hold():
+            ...  # run something that converts or moves captures itself
+    """
+    def __init__(self, interval=5.0, settle_seconds=10.0):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        self._lock = threading.Lock()
+        self._cycle_lock = threading.Lock()
+        self._pause = threading.Event()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._sizes = {}
+        self._snapshot = {
+            "ready": False,
+            "hc22000_files": [],
+            "cap_files": [],
+            "processed_files": [],
+            "pending": 0,
+            "completed": 0,
+            "bytes_total": 0,
+            "bytes_done": 0,
+            "errors": [],
+        }
+
+    def snapshot(self):
+        """Return a copy of the latest conversion state"""
+        with self._lock:
+            return {key: list(value) if isinstance(value, list) else value
+                    for key, value in self._snapshot.items()}
+
+    def refresh(self):
+        """Ask the worker to run a conversion cycle now"""
+        self._wake.set()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+    @contextmanager
+    def hold(self):
+        """Keep the worker idle while the caller converts or moves captures"""
+        self._pause.set()
+        if not self._cycle_lock.acquire(blocking=False):
+            print(colored("[*] Waiting for the background conversion to pause...", 'yellow'))
+            self._cycle_lock.acquire()
+        self._pause.clear()
+        try:
+            yield
+        finally:
+            self._cycle_lock.release()
+        self.refresh()
+
+    def _should_stop(self):
+        return self._pause.is_set() or self._stop_event.is_set()
+
+    def _update(self, **values):
+        with self._lock:
+            self._snapshot.update(values)
+
+    def _on_pending(self, pending):
+        self._sizes = {}
+        for cap_file in pending:
+            try:
+                self._sizes[cap_file] = os.path.getsize(cap_file)
+            except OSError:
+                self._sizes[cap_file] = 0
+        self._update(pending=len(pending), completed=0,
+                     bytes_total=sum(self._sizes.values()), bytes_done=0)
+
+    def _on_result(self, result):
+        with self._lock:
+            self._snapshot["completed"] += 1
+            self._snapshot["bytes_done"] += self._sizes.get(result["cap_file"], 0)
+            if result["error"]:
+                self._snapshot["errors"] = (self._snapshot["errors"] + [
+                    f"{result['cap_file']}: {result['error']}"
+                ])[-10:]
+
+    def run(self):
+        try:
+            cleanup_essidlist_files()
+        except Exception:
+            pass
+
+        while not self._stop_event.is_set():
+            with self._cycle_lock:
+                try:
+                    hc22000_files, cap_files, processed = check_and_convert_cap_files(
+                        on_pending=self._on_pending, on_result=self._on_result,
+                        settle_seconds=self.settle_seconds, should_stop=self._should_stop
+                    )
+                    with self._lock:
+                        self._snapshot.update(
+                            ready=True,
+                            hc22000_files=hc22000_files,
+                            cap_files=cap_files,
+                            processed_files=self._snapshot["processed_files"] + processed,
+                            pending=0,
+                            completed=0,
+                            bytes_total=0,
+                            bytes_done=0,
+                        )
+                    compact_stored_captures(should_stop=self._should_stop)
+                except Exception as e:
+                    with self._lock:
+                        self._snapshot["errors"] = (self._snapshot["errors"] + [str(e)])[-10:]
+
+            self._wake.wait(self.interval)
+            self._wake.clear()
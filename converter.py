@@ -0,0 +1,286 @@
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from conversion_cache import (
+    ConversionManifest, RESULT_CONVERTED, RESULT_NO_HASHES, RESULT_NO_ESSID, RESULT_UNREADABLE
+)
+from hc22000 import convert_capture_native, parse_hash_line
+from handshake_index import HandshakeIndex
+from handshake_store import stored_name, stored_copy, duplicate_result
+
+RESULT_ERROR = "error"
+
+BACKEND_NATIVE = "native"
+BACKEND_HCXPCAPNGTOOL = "hcxpcapngtool"
+DEFAULT_BACKEND = BACKEND_NATIVE
+
+def default_workers():
+    """Number of concurrent conversions, bounded by the CPU count"""
+    return max(1, os.cpu_count() or 1)
+
+def safe_essid_name(essid):
+    """
+    Turn an extracted ESSID into a directory name under handshakes/
+
+    Args:
+        essid: ESSID as extracted from the capture
+
+    Returns:
+        Sanitized directory name
+    """
+    return "".join(c if c.isalnum() or c in ['-', '_'] else '_' for c in essid)
+
+def read_hash_metadata(hc22000_file):
+    """
+    Collect the networks contained in an hc22000 file
+
+    Args:
+        hc22000_file: Path to the hc22000 file
+
+    Returns:
+        List of {bssid, essid} dicts in order of first appearance
+    """
+    networks = []
+    seen = set()
+    with open(hc22000_file, 'r') as f:
+        for line in f:
+            fields = parse_hash_line(line)
+            if not fields:
+                continue
+            key = (fields["bssid"], fields["essid"])
+            if key not in seen:
+                seen.add(key)
+                networks.append({"bssid": fields["bssid"], "essid": fields["essid"]})
+    return networks
+
+def hcxpcapngtool_available():
+    """Check whether the optional hcxpcapngtool backend is installed"""
+    return shutil.which("hcxpcapngtool") is not None
+
+def run_backend(cap_file, hc22000_file, backend=DEFAULT_BACKEND):
+    """
+    Write the hc22000 lines of a capture with the selected backend
+
+    The native backend falls back to hcxpcapngtool for captures it cannot read,
+    when hcxpcapngtool is installed.
+
+    Args:
+        cap_file: Input capture
+        hc22000_file: Output hash file
+        backend: BACKEND_NATIVE or BACKEND_HCXPCAPNGTOOL
+    """
+    if backend == BACKEND_NATIVE:
+        try:
+            convert_capture_native(cap_file, hc22000_file)
+            return
+        except (ValueError, IndexError) as e:
+            if not hcxpcapngtool_available():
+                raise ValueError(f"Cannot read {cap_file}: {e}")
+
+    subprocess.run(['hcxpcapngtool', '-o', hc22000_file, cap_file], capture_output=True)
+
+def convert_capture(cap_file, handshakes_dir="handshakes", organize=True, backend=DEFAULT_BACKEND, digest=None):
+    """
+    Convert a single capture to hc22000 format in one pass
+
+    The backend reads the capture once. The ESSID and BSSID of every network
+    are then taken from the generated hash lines, so the capture is not parsed again.
+
+    Args:
+        cap_file: Path to the .cap file
+        handshakes_dir: Directory holding the per-network folders
+        organize: If True, move the .cap and .hc22000 into handshakes/<ESSID>/,
+                  otherwise write the .hc22000 into handshakes_dir and leave the .cap in place
+        backend: BACKEND_NATIVE (in-process generator) or BACKEND_HCXPCAPNGTOOL
+        digest: Content digest of the capture, used to keep its stored name unique
+
+    Returns:
+        Result dict with cap_file, essid, bssid, networks, hc22000, cap_dest, result and error keys
+    """
+    result = {
+        "cap_file": cap_file,
+        "essid": None,
+        "bssid": None,
+        "networks": [],
+        "hc22000": None,
+        "cap_dest": cap_file,
+        "result": RESULT_ERROR,
+        "error": None
+    }
+
+    try:
+        base_name = os.path.splitext(os.path.basename(cap_file))[0]
+        if organize:
+            hc22000_file = os.path.join(os.path.dirname(cap_file), f"{base_name}.hc22000")
+        else:
+            hc22000_file = os.path.join(handshakes_dir, f"{base_name}.hc22000")
+
+        run_backend(cap_file, hc22000_file, backend)
+
+        if not (os.path.exists(hc22000_file) and os.path.getsize(hc22000_file) > 0):
+            if os.path.exists(hc22000_file):
+                os.remove(hc22000_file)
+            result["result"] = RESULT_NO_HASHES
+            return result
+
+        result["hc22000"] = hc22000_file
+        result["networks"] = read_hash_metadata(hc22000_file)
+        essid = result["networks"][0]["essid"] if result["networks"] else None
+        result["essid"] = essid
+        result["bssid"] = result["networks"][0]["bssid"] if result["networks"] else None
+
+        if not organize:
+            result["result"] = RESULT_CONVERTED
+            return result
+
+        if not essid:
+            result["result"] = RESULT_NO_ESSID
+            return result
+
+        network_dir = os.path.join(handshakes_dir, safe_essid_name(essid))
+        os.makedirs(network_dir, exist_ok=True)
+
+        dest_hc22000 = os.path.join(network_dir, f"{stored_name(network_dir, base_name, digest)}.hc22000")
+        shutil.move(hc22000_file, dest_hc22000)
+        result["hc22000"] = dest_hc22000
+        result["result"] = RESULT_CONVERTED
+
+    except ValueError as e:
+        result["result"] = RESULT_UNREADABLE
+        result["error"] = str(e)
+    except Exception as e:
+        result["error"] = str(e)
+
+    return result
+
+def convert_captures(cap_files, handshakes_dir="handshakes", organize=True, on_result=None,
+                     max_workers=None, manifest=None, backend=DEFAULT_BACKEND):
+    """
+    Convert many captures concurrently on a bounded worker pool
+
+    The native backend parses captures in Python, so it runs on a process pool.
+    The hcxpcapngtool backend only waits on external processes and uses threads.
+    Manifest and handshake index updates and file moves of the .cap happen on the
+    calling thread as results complete.
+
+    When organizing, captures are stored by content: a capture whose digest is
+    already in the handshake index, or queued earlier in the same batch, is not
+    converted again. The incoming copy is removed and its result points at the
+    stored capture (duplicate key set).
+    A stored capture shares the stem of its hc22000 file, with a digest suffix
+    when another capture of the same ESSID already took the name.
+
+    Args:
+        cap_files: Capture paths to convert
+        handshakes_dir: Directory holding the per-network folders
+        organize: Move converted captures into handshakes/<ESSID>/ (see convert_capture)
+        on_result: Optional callback invoked with each result dict as it completes
+        max_workers: Pool size (default: CPU count)
+        manifest: ConversionManifest to update (default: load the shared one)
+        backend: BACKEND_NATIVE or BACKEND_HCXPCAPNGTOOL
+
+    Returns:
+        List of result dicts in completion order
+    """
+    os.makedirs(handshakes_dir, exist_ok=True)
+    manifest = manifest or ConversionManifest()
+    results = []
+
+    index = HandshakeIndex()
+
+    def store_duplicate(cap_file, stored):
+        result = duplicate_result(cap_file, stored)
+        try:
+            os.remove(cap_file)
+        except OSError as e:
+            result["error"] = str(e)
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    to_convert = []
+    # Digest -> capture converted in this batch; later copies wait for its result
+    queued = {}
+    repeats = []
+    for cap_file in cap_files:
+        try:
+            digest = manifest.digest_for(cap_file)
+        except OSError:
+            digest = None
+        stored = stored_copy(index, digest) if organize else None
+        if stored and stored["path"] != os.path.abspath(cap_file):
+            store_duplicate(cap_file, stored)
+            continue
+        if organize and digest in queued:
+            repeats.append((cap_file, digest))
+            continue
+        if digest:
+            queued[digest] = cap_file
+        to_convert.append((cap_file, digest))
+
+    if backend == BACKEND_NATIVE and len(to_convert) > 1:
+        executor = ProcessPoolExecutor
+    else:
+        executor = ThreadPoolExecutor
+
+    with executor(max_workers=max_workers or default_workers()) as pool:
+        futures = [
+            pool.submit(convert_capture, cap_file, handshakes_dir, organize, backend, digest)
+            for cap_file, digest in to_convert
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            cap_file = result["cap_file"]
+
+            try:
+                if result["result"] != RESULT_ERROR:
+                    manifest.record(cap_file, result["essid"], result["hc22000"], result["result"],
+                                    networks=result["networks"])
+
+                if organize and result["result"] == RESULT_CONVERTED:
+                    dest_cap = os.path.splitext(result["hc22000"])[0] + os.path.splitext(cap_file)[1]
+                    shutil.move(cap_file, dest_cap)
+                    manifest.relocate(cap_file, dest_cap)
+                    result["cap_dest"] = dest_cap
+
+                if result["result"] != RESULT_ERROR:
+                    index.add_capture(result["cap_dest"], result["hc22000"],
+                                      digest=manifest.digest_for(result["cap_dest"]),
+                                      essid=result["essid"], bssid=result["bssid"],
+                                      result=result["result"])
+                    index.conn.commit()
+            except Exception as e:
+                result["error"] = str(e)
+
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    converted = {result["cap_file"]: result for result in results}
+    for cap_file, digest in repeats:
+        stored = stored_copy(index, digest)
+        if stored:
+            store_duplicate(cap_file, stored)
+            continue
+        # The first copy was not stored (no hashes, no ESSID or an error): same outcome
+        result = dict(converted[queued[digest]], cap_file=cap_file, cap_dest=cap_file, duplicate=True)
+        if result["result"] != RESULT_ERROR:
+            try:
+                manifest.record(cap_file, result["essid"], result["hc22000"], result["result"],
+                                networks=result["networks"])
+            except OSError as e:
+                result["error"] = str(e)
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    index.close()
+
+    try:
+        manifest.prune()
+        manifest.save()
+    except OSError as e:
+        print(f"Error saving conversion manifest: {e}")
+
+    return results
@@ -0,0 +1,136 @@
+import os
+import re
+import time
+import hashlib
+import sqlite3
+import threading
+from itertools import islice
+from conversion_cache import file_digest
+from wpa_engine import wordlist_candidates
+
+CHECKPOINT_PATH = os.path.join(os.path.expanduser("~"), ".snype", "checkpoints.db")
+
+# Seconds between two checkpoint writes while cracking
+CHECKPOINT_INTERVAL = 30.0
+
+# aircrack-ng status line, e.g. "[00:01:02] 123456/14344391 keys tested (2345.67 k/s)"
+KEYS_TESTED = re.compile(r"(\d+)(?:/\d+)? keys tested")
+KEYS_RATE = re.compile(r"\(([\d.]+) k/s\)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    target TEXT NOT NULL,
+    wordlist TEXT NOT NULL,
+    wordlist_path TEXT,
+    offset INTEGER NOT NULL DEFAULT 0,
+    started_at REAL,
+    updated_at REAL,
+    PRIMARY KEY (target, wordlist)
+);
+"""
+
+def target_key(cap_file, hash_lines=None, bssid=None):
+    """
+    Identify what is being cracked
+
+    The sorted hash lines are used when the capture is indexed, so the same
+    handshake resumes from any copy of the capture; otherwise the capture
+    content and the targeted BSSID.
+    """
+    if hash_lines:
+        return hashlib.sha256("\n".join(sorted(hash_lines)).encode()).hexdigest()
+    return hashlib.sha256(f"{file_digest(cap_file)}:{(bssid or '').upper()}".encode()).hexdigest()
+
+class CheckpointStore:
+    """
+    SQLite record of how far each (hash, wordlist) crack got
+
+    offset counts the usable candidates (wpa_engine.wordlist_candidates) already
+    tested. The database lives in ~/.snype/checkpoints.db.
+
+    Usage:
+        with CheckpointStore() as checkpoints:
+            offset = checkpoints.offset(target, wordlist_digest)
+    """
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def offset(self, target, wordlist):
+        """Candidates already tested for a target and wordlist digest (0 when none)"""
+        row = self.conn.execute("SELECT offset FROM checkpoints WHERE target = ? AND wordlist = ?",
+                                (target, wordlist)).fetchone()
+        return row["offset"] if row else 0
+
+    def save(self, target, wordlist, offset, wordlist_path=None):
+        """Record the offset reached; checkpoints only move forward"""
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO checkpoints (target, wordlist, wordlist_path, offset, started_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(target, wordlist) DO UPDATE SET "
+            "offset = MAX(checkpoints.offset, excluded.offset), wordlist_path = excluded.wordlist_path, "
+            "updated_at = excluded.updated_at", (target, wordlist, wordlist_path, offset, now, now))
+        self.conn.commit()
+
+    def clear(self, target, wordlist):
+        """Forget a checkpoint once the wordlist was exhausted or the password found"""
+        self.conn.execute("DELETE FROM checkpoints WHERE target = ? AND wordlist = ?", (target, wordlist))
+        self.conn.commit()
+
+class CandidateFeeder:
+    """
+    Stream wordlist candidates from an offset into a pipe read by aircrack-ng
+
+    Runs in a background thread so aircrack-ng's output can be read at the
+    same time; the pipe is closed when the wordlist ends or aircrack-ng exits.
+    finished is only set once every candidate was handed to aircrack-ng, and
+    error holds the exception that stopped the feed early (e.g. an unreadable
+    wordlist), so a run that ended for another reason is not taken for an
+    exhausted wordlist.
+    """
+    def __init__(self, wordlist, offset, write_fd):
+        self.wordlist = wordlist
+        self.offset = offset
+        self.pipe = os.fdopen(write_fd, "wb", buffering=1024 * 1024)
+        self.thread = threading.Thread(target=self._feed, daemon=True)
+        self.finished = False
+        self.error = None
+
+    def _feed(self):
+        try:
+            for candidate in islice(wordlist_candidates(self.wordlist), self.offset, None):
+                self.pipe.write(candidate + b"\n")
+            self.pipe.close()
+            self.finished = True
+        except BrokenPipeError:
+            # aircrack-ng exited before reading everything
+            pass
+        except (ValueError, OSError) as e:
+            self.error = e
+        finally:
+            try:
+                self.pipe.close()
+            except OSError:
+                pass
+
+    def start(self):
+        self.thread.start()
+
+    def join(self, timeout=None):
+        """Wait for the feed to end; it does once aircrack-ng has exited"""
+        self.thread.join(timeout)
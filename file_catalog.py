@@ -0,0 +1,242 @@
+import os
+import time
+import struct
+import ctypes
+import ctypes.util
+import threading
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+class Inotify:
+    """Minimal non-blocking inotify binding through ctypes"""
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask=WATCH_MASK):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def rm_watch(self, wd):
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """
+        Drain every queued event without blocking
+
+        Yields:
+            Tuple of (watch descriptor, mask, name)
+        """
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                yield wd, mask, os.fsdecode(name)
+
+    def close(self):
+        os.close(self.fd)
+
+class FileCatalog:
+    """
+    In-memory catalog of the files under snype's working directories
+
+    Each root is scanned once. After that the catalog is kept current with Linux
+    inotify events, which are drained at the start of every query, so no
+    background thread is needed. Where inotify is unavailable, a root is rescanned
+    when it is queried and its last scan is older than poll_interval seconds.
+
+    Args:
+        roots: Dict of root directory -> recursive flag
+        poll_interval: Rescan interval for the polling fallback
+        use_inotify: Set to False to force the polling fallback
+    """
+    def __init__(self, roots=None, poll_interval=2.0, use_inotify=True):
+        self.roots = dict(roots or {".": False, "handshakes": True})
+        self.poll_interval = poll_interval
+        self.dirs = {}
+        self.scanned_at = {}
+        self.watches = {}
+        self.watch_paths = {}
+        self.lock = threading.RLock()
+        self.inotify = None
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except (OSError, AttributeError):
+                self.inotify = None
+        for root in self.roots:
+            self._scan_root(root)
+
+    def _watch(self, path):
+        if self.inotify is None or path in self.watch_paths:
+            return
+        try:
+            wd = self.inotify.add_watch(path)
+        except OSError:
+            return
+        self.watches[wd] = path
+        self.watch_paths[path] = wd
+
+    def _forget_tree(self, path):
+        prefix = path + os.sep
+        for dirpath in [d for d in self.dirs if d == path or d.startswith(prefix)]:
+            del self.dirs[dirpath]
+            wd = self.watch_paths.pop(dirpath, None)
+            if wd is not None:
+                self.watches.pop(wd, None)
+                if self.inotify is not None:
+                    self.inotify.rm_watch(wd)
+
+    def _scan_dir(self, path, recursive):
+        if not os.path.isdir(path):
+            return
+        self._watch(path)
+        try:
+            entries = list(os.scandir(path))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            return
+        files = set()
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    files.add(entry.name)
+            except OSError:
+                continue
+        self.dirs[path] = files
+        if recursive:
+            for subdir in subdirs:
+                self._scan_dir(subdir, True)
+
+    def _scan_root(self, root):
+        self._forget_tree(root)
+        self._scan_dir(root, self.roots[root])
+        self.scanned_at[root] = time.monotonic()
+
+    def _root_for(self, path):
+        for root, recursive in self.roots.items():
+            if path == root or (recursive and path.startswith(root + os.sep)):
+                return root, recursive
+        return None, False
+
+    def _apply_events(self):
+        for wd, mask, name in self.inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                for root in self.roots:
+                    self._scan_root(root)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                self._forget_tree(directory)
+                continue
+
+            path = os.path.join(directory, name)
+            files = self.dirs.setdefault(directory, set())
+            if mask & IN_ISDIR:
+                root, recursive = self._root_for(directory)
+                if mask & (IN_CREATE | IN_MOVED_TO) and recursive:
+                    self._scan_dir(path, True)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._forget_tree(path)
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                files.add(name)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                files.discard(name)
+
+    def _sync(self, root):
+        if root not in self.roots:
+            self.roots[root] = True
+            self._scan_root(root)
+            return
+        if root not in self.dirs:
+            if os.path.isdir(root):
+                self._scan_root(root)
+            return
+        if self.inotify is not None:
+            self._apply_events()
+        elif time.monotonic() - self.scanned_at.get(root, 0) > self.poll_interval:
+            self._scan_root(root)
+
+    def files(self, root, extensions=None, prefix=None, max_depth=None):
+        """
+        List the files under a root directory
+
+        Args:
+            root: Root directory (registered roots are "." and "handshakes")
+            extensions: Optional tuple of suffixes to keep (e.g. ('.cap',))
+            prefix: Optional file name prefix to keep
+            max_depth: Limit to files at most this many directories below root
+
+        Returns:
+            Sorted list of paths joined the way os.walk would produce them
+        """
+        with self.lock:
+            self._sync(root)
+            found = []
+            root_prefix = root + os.sep
+            base_depth = root.count(os.sep)
+            for directory, names in self.dirs.items():
+                if directory != root and not directory.startswith(root_prefix):
+                    continue
+                if max_depth is not None and directory.count(os.sep) - base_depth > max_depth:
+                    continue
+                for name in names:
+                    if extensions and not name.endswith(tuple(extensions)):
+                        continue
+                    if prefix and not name.startswith(prefix):
+                        continue
+                    found.append(name if directory == "." else os.path.join(directory, name))
+            return sorted(found)
+
+    def rescan(self):
+        """Rebuild the catalog from disk"""
+        with self.lock:
+            for root in list(self.roots):
+                self._scan_root(root)
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """Return the process-wide catalog for the current working directory"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = FileCatalog()
+        return _catalog
+
+def find_files_in_directory(directory, extensions):
+    """Find files with specific extensions under a directory, using the catalog"""
+    return get_catalog().files(directory, extensions=tuple(extensions))
@@ -7,6 +7,16 @@ from importlib import resources
 from pathlib import Path
 from datetime import datetime
 from termcolor import colored
+from conversion_cache import ConversionManifest, RESULT_NO_HASHES, RESULT_NO_ESSID, RESULT_UNREADABLE
+from converter import convert_captures, default_workers
+from file_catalog import get_catalog, find_files_in_directory
+from handshake_index import HandshakeIndex
+from hash_merge import merge_hashes
+from compression import CAPTURE_EXTENSIONS
+from airodump_live import LiveScan, CONVERGENCE_SECONDS, QUICK_CONVERGENCE_SECONDS
+from scan_planner import BANDS, plan_scan
+from scan_model import read_scan
+from scan_history import ScanHistory
 
 default_scripts = os.path.expanduser("~/snype")
 
@@ -148,7 +158,7 @@ def get_saved_network_info():
         if os.path.exists("selected_network.txt"):
             with open("selected_network.txt", "r") as f:
                 content = f.read().strip()
-                parts = content.split(',')
+                parts = content.split(',', 2)
                 if len(parts) >= 3:
                     bssid, channel, essid = parts[0], parts[1], parts[2]
                     
@@ -286,6 +296,11 @@ def save_password(network_ssid, password, cap_file):
             f.write(f"{json.dumps(password_data)}\n")
         
         print(colored(f"[+] Password added to master list: {master_file}", "green"))
+        
+        with HandshakeIndex() as index:
+            index.mark_cracked(network_ssid, password)
+        if os.path.isdir("handshakes"):
+            merge_hashes("handshakes")
     except Exception as e:
         print(colored(f"[!] Error saving password: {e}", "red"))
 
@@ -542,6 +557,117 @@ def flush_services():
         time.sleep(1)
         return None, None
 
+def record_scan_history(scan, interface):
+    """Append a scan to the scan history, warning instead of failing on errors"""
+    try:
+        with ScanHistory() as history:
+            history.record_scan(scan, interface)
+    except Exception as e:
+        print(colored(f"[!] Could not save the scan history: {e}", 'yellow'))
+
+def select_scanned_network(scan):
+    """
+    Show scanned networks and save the one the user picks to selected_network.txt
+    
+    Args:
+    - scan: ScanResult of the airodump-ng scan
+    
+    Returns:
+    - The selected BSSID, or None
+    """
+    networks = scan.sorted_aps()
+    if not networks:
+        print(colored("[!] No networks found.", 'red'))
+        time.sleep(2)
+        return None
+        
+    clear_screen()
+
+    try:
+        terminal_width = shutil.get_terminal_size().columns
+    except Exception:
+        terminal_width = 70  
+    
+    header1 = "=" * terminal_width
+    header2 = "-" * terminal_width
+    
+    print(colored("[+] Select Target Network:", 'green'))
+    print(colored(header1, 'cyan'))
+    print(colored("ID  BSSID              CH  PWR  CL  ESSID", 'cyan'))
+    print(colored(header2, 'cyan'))
+    
+    for i, ap in enumerate(networks):
+        print(colored(f"{i:<3} {ap.bssid:<18} {ap.channel:<3} {ap.power:<4} {len(scan.clients(ap.bssid)):<3} {ap.essid}", 'blue'))
+    
+    try:
+        selection = int(input(colored("\nEnter network ID to select: ", 'green')))
+        if 0 <= selection < len(networks):
+            selected_bssid = networks[selection].bssid
+            channel = networks[selection].channel
+            essid = networks[selection].essid
+            print(colored(f"[✓] Selected: BSSID={selected_bssid}, CH={channel}, ESSID={essid}", 'green'))
+            
+            with open("selected_network.txt", "w") as f:
+                f.write(f"{selected_bssid},{channel},{essid}")
+            
+            time.sleep(2)
+            return selected_bssid
+        else:
+            print(colored("[!] Invalid selection.", 'red'))
+            time.sleep(2)
+            return None
+    except ValueError:
+        print(colored("[!] Invalid input. Please enter a number.", 'red'))
+        time.sleep(2)
+        return None
+
+def ask_scan_plan():
+    """
+    Ask which bands to scan and whether to sweep historically busy channels only
+    
+    Returns:
+    - ScanPlan for the live scan
+    """
+    band = input(colored("Bands to scan: bg (2.4 GHz), a (5 GHz) or abg (both) [abg]: ", 'green')).strip().lower() or "abg"
+    if band not in BANDS:
+        print(colored(f"[!] Unknown band {band}, scanning both bands", 'yellow'))
+        band = "abg"
+    
+    plan = plan_scan(band, quick=True)
+    if plan.channels:
+        answer = input(colored(f"Quick sweep of the channels busy in earlier scans ({','.join(str(c) for c in plan.channels)})? [Y/n]: ", 'green')).strip().lower()
+        if answer == 'n':
+            plan = plan_scan(band)
+    return plan
+
+def run_live_scan(interface, tmp_file, target, plan):
+    """
+    Run a live scan with the given plan
+    
+    A quick sweep that misses the requested target is followed by a sweep of
+    every channel of the band, busiest first.
+    
+    Returns:
+    - ScanResult of the scan(s)
+    """
+    convergence = QUICK_CONVERGENCE_SECONDS if plan.quick else CONVERGENCE_SECONDS
+    scan = LiveScan(interface, tmp_file, target=target, convergence=convergence, plan=plan)
+    result = scan.run()
+    print(colored(f"\n[+] Scan finished: {scan.reason}", 'green'))
+    
+    if plan.quick and target and not result.find(target) and scan.reason != "stopped by user":
+        print(colored(f"[i] {target} was not on the busy channels, scanning the whole band", 'yellow'))
+        time.sleep(1)
+        full_scan = LiveScan(interface, f"{tmp_file}-full", target=target, plan=plan_scan(plan.band))
+        full_result = full_scan.run()
+        print(colored(f"\n[+] Scan finished: {full_scan.reason}", 'green'))
+        result.aps.update(full_result.aps)
+        result.stations.update(full_result.stations)
+    
+    if not result.aps and plan.includes_5ghz() and scan.reason == "airodump-ng exited":
+        print(colored("[!] airodump-ng stopped right away; the interface may not support 5 GHz, try band bg", 'yellow'))
+    return result
+
 def scan_networks_and_select_bssid(interface):
     """Run airodump-ng and allow user to select a BSSID"""
     import tempfile
@@ -553,16 +679,27 @@ def scan_networks_and_select_bssid(interface):
     
     clear_screen()
     print(colored("[+] Scanning networks with airodump-ng", 'cyan'))
-    print(colored("[i] We reccomend to scan for ", 'yellow',) + colored("20 seconds ",'yellow',attrs=['bold']) + colored("to avoid networks overflow", 'yellow'))
-    print(colored("[i] Press Ctrl+C ", 'yellow') + 
-      colored("TWO TIMES", 'yellow', attrs=['bold']) + 
-      colored(" when you've found the target network", 'yellow'))
-    time.sleep(4)
+    live = input(colored("Live scan that stops once no new networks appear? [Y/n]: ", 'green')).strip().lower() != 'n'
+    target = None
+    if live:
+        target = input(colored("Stop as soon as this ESSID or BSSID appears (Enter to skip): ", 'green')).strip() or None
+        plan = ask_scan_plan()
+    else:
+        print(colored("[i] We reccomend to scan for ", 'yellow',) + colored("20 seconds ",'yellow',attrs=['bold']) + colored("to avoid networks overflow", 'yellow'))
+        print(colored("[i] Press Ctrl+C ", 'yellow') + 
+          colored("TWO TIMES", 'yellow', attrs=['bold']) + 
+          colored(" when you've found the target network", 'yellow'))
+        time.sleep(4)
     tmp_file = tempfile.NamedTemporaryFile(delete=False).name
     
     try:
         subprocess.run(["sudo", "airmon-ng", "check", "kill"], capture_output=True)
         
+        if live:
+            result = run_live_scan(interface, tmp_file, target, plan)
+            record_scan_history(result, interface)
+            return select_scanned_network(result)
+        
         # DO NOT CHANGE THIS LINE
         process = subprocess.Popen(["sudo", "airodump-ng", "-w", tmp_file, "--output-format", "csv", interface])
         
@@ -579,67 +716,12 @@ def scan_networks_and_select_bssid(interface):
             time.sleep(2)
             return None
             
-        with open(csv_file, 'r') as f:
-            lines = f.readlines()
-        
-        station_index = next((i for i, line in enumerate(lines) if "Station MAC" in line), len(lines))
-        
-        bssid_lines = [line.strip() for line in lines[1:station_index] if line.strip() and "BSSID" not in line]
-        
-        if not bssid_lines:
-            print(colored("[!] No networks found.", 'red'))
-            time.sleep(2)
-            return None
-            
-        clear_screen()
-
-        try:
-            terminal_width = shutil.get_terminal_size().columns
-        except Exception:
-            terminal_width = 70  
-        
-        header1 = "=" * terminal_width
-        header2 = "-" * terminal_width
-        
-        print(colored("[+] Select Target Network:", 'green'))
-        print(colored(header1, 'cyan'))
-        print(colored("ID  BSSID              CH  PWR  ESSID", 'cyan'))
-        print(colored(header2, 'cyan'))
-        
-        for i, line in enumerate(bssid_lines):
-            parts = [part.strip() for part in line.split(',')]
-            if len(parts) >= 14: 
-                bssid = parts[0]
-                channel = parts[3]
-                power = parts[8]
-                essid = parts[13].strip()
-                print(colored(f"{i:<3} {bssid:<18} {channel:<3} {power:<4} {essid}", 'blue'))
-        
-        try:
-            selection = int(input(colored("\nEnter network ID to select: ", 'green')))
-            if 0 <= selection < len(bssid_lines):
-                parts = [part.strip() for part in bssid_lines[selection].split(',')]
-                selected_bssid = parts[0]
-                channel = parts[3]
-                essid = parts[13].strip()
-                print(colored(f"[✓] Selected: BSSID={selected_bssid}, CH={channel}, ESSID={essid}", 'green'))
-                
-                with open("selected_network.txt", "w") as f:
-                    f.write(f"{selected_bssid},{channel},{essid}")
-                
-                time.sleep(2)
-                return selected_bssid
-            else:
-                print(colored("[!] Invalid selection.", 'red'))
-                time.sleep(2)
-                return None
-        except ValueError:
-            print(colored("[!] Invalid input. Please enter a number.", 'red'))
-            time.sleep(2)
-            return None
+        result = read_scan(csv_file)
+        record_scan_history(result, interface)
+        return select_scanned_network(result)
             
     finally:
-        for ext in ["-01.csv", "-01.kismet.csv", "-01.kismet.netxml", "-01.cap"]:
+        for ext in ["-01.csv", "-01.kismet.csv", "-01.kismet.netxml", "-01.cap", "-full-01.csv"]:
             try:
                 if os.path.exists(f"{tmp_file}{ext}"):
                     os.remove(f"{tmp_file}{ext}")
@@ -657,7 +739,7 @@ def delete_cap_files():
             time.sleep(2)
             return
         
-        cap_files = [f for f in os.listdir('.') if f.endswith('.cap')]
+        cap_files = find_files_in_directory('.', ['.cap'])
         
         if not cap_files:
             print(colored("No .cap files found in the current directory.", 'yellow'))
@@ -689,25 +771,25 @@ def delete_cap_files():
         print(colored(f"[!] Error during operation: {e}", 'red'))
         time.sleep(2)
 
+def find_essidlist_files():
+    """
+    Find essidlist files in the current directory, handshakes directory and ESSID subdirectories
+    
+    Returns:
+    - A list of essidlist files in the current directory
+    - A list of essidlist files in handshakes/ and handshakes/<ESSID>/
+    """
+    catalog = get_catalog()
+    current_dir_files = catalog.files('.', extensions=('.txt',), prefix='essidlist_')
+    handshakes_files = catalog.files('handshakes', extensions=('.txt',), prefix='essidlist_', max_depth=1)
+    return current_dir_files, handshakes_files
+
 def delete_essidlist_files():
     """Delete all essidlist files in the current directory, handshakes directory, and ESSID subdirectories"""
     print(colored("[+] Searching for essidlist files to delete...", 'yellow'))
     
     try:
-        current_dir_files = [f for f in os.listdir('.') if f.startswith('essidlist_') and f.endswith('.txt')]
-        
-        handshakes_files = []
-        if os.path.exists('handshakes') and os.path.isdir('handshakes'):
-            main_dir_files = [os.path.join('handshakes', f) for f in os.listdir('handshakes') 
-                              if f.startswith('essidlist_') and f.endswith('.txt')]
-            handshakes_files.extend(main_dir_files)
-            
-            for subdir in os.listdir('handshakes'):
-                subdir_path = os.path.join('handshakes', subdir)
-                if os.path.isdir(subdir_path):
-                    subdir_files = [os.path.join(subdir_path, f) for f in os.listdir(subdir_path) 
-                                    if f.startswith('essidlist_') and f.endswith('.txt')]
-                    handshakes_files.extend(subdir_files)
+        current_dir_files, handshakes_files = find_essidlist_files()
         
         total_files = len(current_dir_files) + len(handshakes_files)
         
@@ -744,107 +826,108 @@ def delete_essidlist_files():
         print(colored(f"[!] Error while deleting essidlist files: {e}", 'red'))
         time.sleep(2)
         
-def check_and_convert_cap_files():
+def check_and_convert_cap_files(on_pending=None, on_result=None, settle_seconds=0, should_stop=None):
     """
     Check for .cap files and convert them to hc22000 format in the background.
-    Creates folders based on ESSID extracted using aircrack-ng.
+    Creates folders based on the ESSID found in the generated hash lines.
+    
+    Args:
+    - on_pending: Optional callback receiving the list of captures about to be converted
+    - on_result: Optional callback receiving each conversion result; when given,
+      errors are reported through it instead of being printed
+    - settle_seconds: Skip captures modified more recently than this, as they
+      may still be written by airodump-ng
+    - should_stop: Optional callable checked between batches of captures; when it
+      returns True the remaining captures are left for the next call
     
     Returns:
     - A list of existing hc22000 files in the handshakes folder
     - A list of existing .cap files in the handshakes folder
     - A list of .cap files that were processed
     """
-    def find_files_in_directory(directory, extensions):
-        found_files = []
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    found_files.append(os.path.join(root, file))
-        return found_files
-    
-    cap_files = [f for f in os.listdir('.') if f.endswith('.cap')]
+    cap_files = find_files_in_directory('.', ['.cap'])
     handshakes_dir = "handshakes"
     
     if not os.path.exists(handshakes_dir):
         return [], [], []
     
     if not cap_files:
-        existing_hc22000_files = find_files_in_directory(handshakes_dir, ['.hc22000'])
-        existing_cap_files = find_files_in_directory(handshakes_dir, ['.cap'])
-        return existing_hc22000_files, existing_cap_files, []
+        return indexed_handshake_files(cap_files) + ([],)
+    
+    manifest = ConversionManifest()
+    
+    pending_cap_files = []
+    for cap_file in cap_files:
+        if settle_seconds and time.time() - os.path.getmtime(cap_file) < settle_seconds:
+            continue
+        cached = manifest.lookup(cap_file)
+        if cached and cached["result"] in (RESULT_NO_HASHES, RESULT_NO_ESSID, RESULT_UNREADABLE):
+            continue
+        pending_cap_files.append(cap_file)
     
-    hc22000_files = []
     processed_cap_files = []
     
-    try:
-        cleanup_essidlist_files()
-    except NameError:
-        pass
+    if on_pending:
+        on_pending(pending_cap_files)
     
-    for cap_file in cap_files:
+    if pending_cap_files:
         try:
-            base_name = os.path.splitext(cap_file)[0]
-            hc22000_file = f"{base_name}.hc22000"
-            
-            extract_cmd = f"aircrack-ng {cap_file} | awk '/WPA \\(/ {{for (i=3; i<NF; i++) printf(\"%s%s\", i>3 ? \"_\" : \"\", $i); print \"\"}}'"
-            process = subprocess.run(extract_cmd, shell=True, capture_output=True, text=True)
-            
-            essid = process.stdout.strip()
-            
-            if not essid:
-                essidlist = os.path.join(handshakes_dir, f"essidlist_{int(time.time())}.txt")
-                conversion_cmd = [
-                    'hcxpcapngtool',
-                    '-o', hc22000_file,
-                    '-E', essidlist,
-                    cap_file
-                ]
-                subprocess.run(conversion_cmd, capture_output=True)
-                
-                if os.path.exists(essidlist):
-                    with open(essidlist, 'r') as f:
-                        essids = [line.strip() for line in f if line.strip()]
-                    if essids:
-                        essid = essids[0]
-                    if os.path.exists(essidlist):
-                        os.remove(essidlist)
-            
-            conversion_cmd = [
-                'hcxpcapngtool',
-                '-o', hc22000_file,
-                cap_file
-            ]
-            subprocess.run(conversion_cmd, capture_output=True)
-            
-            processed_cap_files.append(cap_file)
-            
-            if os.path.exists(hc22000_file) and os.path.getsize(hc22000_file) > 0:
-                if essid:
-                    clean_essid = essid.split('_WPA')[0]
-                    
-                    safe_essid = "".join(c if c.isalnum() or c in ['-', '_'] else '_' for c in clean_essid)
-                    network_dir = os.path.join(handshakes_dir, safe_essid)
-                    os.makedirs(network_dir, exist_ok=True)
-                    
-                    dest_hc22000 = os.path.join(network_dir, hc22000_file)
-                    shutil.move(hc22000_file, dest_hc22000)
-                    
-                    dest_cap = os.path.join(network_dir, cap_file)
-                    shutil.move(cap_file, dest_cap)
-                
-        except Exception as e:
-            print(f"Error processing {cap_file}: {e}")
+            cleanup_essidlist_files()
+        except NameError:
+            pass
+        
+        batch_size = default_workers()
+        for start in range(0, len(pending_cap_files), batch_size):
+            if should_stop and should_stop():
+                break
+            batch = pending_cap_files[start:start + batch_size]
+            for result in convert_captures(batch, handshakes_dir, manifest=manifest, on_result=on_result):
+                if result["error"]:
+                    if not on_result:
+                        print(f"Error processing {result['cap_file']}: {result['error']}")
+                else:
+                    processed_cap_files.append(result["cap_file"])
+    else:
+        manifest.save()
     
-    existing_hc22000_files = find_files_in_directory(handshakes_dir, ['.hc22000'])
-    existing_cap_files = find_files_in_directory(handshakes_dir, ['.cap'])
+    existing_hc22000_files, existing_cap_files = indexed_handshake_files(
+        find_files_in_directory('.', ['.cap']), changed=bool(processed_cap_files)
+    )
     
     return existing_hc22000_files, existing_cap_files, processed_cap_files
 
 
+def indexed_handshake_files(cwd_cap_files, changed=False):
+    """
+    List converted captures and their hc22000 files from the handshake index
+    
+    The index is first reconciled with the handshakes folder, so captures deleted
+    by hand disappear and captures organized before the index existed are picked
+    up; working directory captures may still be written and are never read here.
+    The deduplicated per-network and global hash files are refreshed only when
+    the index changed.
+    
+    Args:
+    - cwd_cap_files: .cap files currently in the working directory
+    - changed: Whether the conversion cycle that preceded this call added hashes
+    
+    Returns:
+    - A list of hc22000 files and a list of captures (compressed ones included) in the handshakes folder
+    """
+    with HandshakeIndex() as index:
+        if index.sync(find_files_in_directory("handshakes", CAPTURE_EXTENSIONS), keep=cwd_cap_files):
+            changed = True
+        hc22000_files = [f for f in index.hc22000_files() if os.path.exists(f)]
+        cap_files = [f for f in index.capture_files() if f.startswith("handshakes" + os.sep)]
+    if changed:
+        merge_hashes("handshakes")
+    return hc22000_files, cap_files
+
+
 def auto_convert_latest_cap_file():
     """
     Automatically convert the most recent .cap file to hc22000 format without user input
-    Extracts ESSID using aircrack-ng and moves both .cap and .hc22000 files to network-specific directories
+    Reads the ESSID from the generated hash lines and moves both .cap and .hc22000 files to network-specific directories
     
     Returns:
     - Path to the generated hc22000 file
@@ -854,7 +937,7 @@ def auto_convert_latest_cap_file():
         """
         Find the most recent .cap file based on modification time
         """
-        cap_files = [f for f in os.listdir('.') if f.endswith('.cap')]
+        cap_files = find_files_in_directory('.', ['.cap'])
         if not cap_files:
             return None
         latest_cap_file = max(
@@ -870,74 +953,23 @@ def auto_convert_latest_cap_file():
     if not cap_file:
         return None, None
     
-    try:
-        base_name = os.path.splitext(cap_file)[0]
-        hc22000_file = f"{base_name}.hc22000"
-        
-        extract_cmd = f"aircrack-ng {cap_file} | awk '/WPA \\(/ {{for (i=3; i<NF; i++) printf(\"%s%s\", i>3 ? \"_\" : \"\", $i); print \"\"}}'"
-        process = subprocess.run(extract_cmd, shell=True, capture_output=True, text=True)
-        
-        essid = process.stdout.strip()
-        
-        if not essid:
-            essidlist = os.path.join(handshakes_dir, f"essidlist_{int(time.time())}.txt")
-            conversion_cmd = [
-                'hcxpcapngtool',
-                '-o', hc22000_file,
-                '-E', essidlist,
-                cap_file
-            ]
-            subprocess.run(conversion_cmd, capture_output=True, check=True)
-            
-            if os.path.exists(essidlist):
-                with open(essidlist, 'r') as f:
-                    essids = [line.strip() for line in f if line.strip()]
-                if essids:
-                    essid = essids[0]
-                if os.path.exists(essidlist):
-                    os.remove(essidlist)
-        
-        conversion_cmd = [
-            'hcxpcapngtool',
-            '-o', hc22000_file,
-            cap_file
-        ]
-        subprocess.run(conversion_cmd, capture_output=True, check=True)
-        
-        if os.path.exists(hc22000_file) and os.path.getsize(hc22000_file) > 0:
-            if essid:
-                clean_essid = essid.split('_WPA')[0]
-                
-                safe_essid = "".join(
-                    c if c.isalnum() or c in ['-', '_'] else '_'
-                    for c in clean_essid
-                )
-                network_dir = os.path.join(handshakes_dir, safe_essid)
-                os.makedirs(network_dir, exist_ok=True)
-                
-                dest_hc22000 = os.path.join(network_dir, os.path.basename(hc22000_file))
-                shutil.move(hc22000_file, dest_hc22000)
-                
-                dest_cap = os.path.join(network_dir, os.path.basename(cap_file))
-                shutil.move(cap_file, dest_cap)
-                
-                hc22000_file = dest_hc22000
-                cap_file = dest_cap
-            
-            return hc22000_file, cap_file
-        else:
-            return None, None
-            
-    except Exception as e:
-        print(f"Error converting {cap_file}: {e}")
+    results = convert_captures([cap_file], handshakes_dir)
+    result = results[0] if results else None
+    
+    if not result or result["error"]:
+        print(f"Error converting {cap_file}: {result['error'] if result else 'no result'}")
         return None, None
     
+    if result["hc22000"]:
+        return result["hc22000"], result["cap_dest"]
+    return None, None
+    
 def convert_eapol():
     """Convert EAPOL packets to hashcat format with graceful interrupt handling"""
     print(colored("[+] Converting EAPOL packets to hashcat format...", "yellow"))
     
     try:
-        cap_files = [f for f in os.listdir('.') if f.endswith('.cap')]
+        cap_files = find_files_in_directory('.', ['.cap'])
         handshakes_dir = "handshakes"
         
         if not cap_files:
@@ -1016,26 +1048,16 @@ def convert_eapol():
         
         os.makedirs(handshakes_dir, exist_ok=True)
         
-        for cap_file in cap_files:
-            try:
-                base_name = os.path.splitext(cap_file)[0]
-                hc22000_file = os.path.join(handshakes_dir, f"{base_name}.hc22000")
-                essidlist = os.path.join(handshakes_dir, f"essidlist_{int(time.time())}.txt")
-                
-                conversion_cmd = [
-                    'hcxpcapngtool',
-                    '-o', hc22000_file,
-                    '-E', essidlist,
-                    cap_file
-                ]
-                
-                print(colored(f"\n[*] Converting {cap_file}...", "green"))
-                subprocess.run(conversion_cmd, check=True, capture_output=True)
-                
-                print(colored(f"[+] Converted {cap_file} successfully!", "green"))
-            
-            except subprocess.CalledProcessError as e:
-                print(colored(f"[!] Error converting {cap_file}: {e}", "red"))
+        def report_result(result):
+            if result["error"]:
+                print(colored(f"[!] Error converting {result['cap_file']}: {result['error']}", "red"))
+            elif result["hc22000"]:
+                print(colored(f"[+] Converted {result['cap_file']} successfully!", "green"))
+            else:
+                print(colored(f"[!] No hashes found in {result['cap_file']}", "yellow"))
+        
+        print(colored(f"\n[*] Converting {len(cap_files)} file(s)...", "green"))
+        convert_captures(cap_files, handshakes_dir, organize=False, on_result=report_result)
         
         print(colored("\n[+] Conversion completed!", "green"))
         time.sleep(2)
@@ -1051,20 +1073,7 @@ def convert_eapol():
 def cleanup_essidlist_files():
     """Automatically delete all essidlist files in the current directory and handshakes directory"""
     try:
-        current_dir_files = [f for f in os.listdir('.') if f.startswith('essidlist_') and f.endswith('.txt')]
-        handshakes_files = []
-        
-        if os.path.exists('handshakes') and os.path.isdir('handshakes'):
-            main_dir_files = [os.path.join('handshakes', f) for f in os.listdir('handshakes') 
-                              if f.startswith('essidlist_') and f.endswith('.txt')]
-            handshakes_files.extend(main_dir_files)
-            
-            for subdir in os.listdir('handshakes'):
-                subdir_path = os.path.join('handshakes', subdir)
-                if os.path.isdir(subdir_path):
-                    subdir_files = [os.path.join(subdir_path, f) for f in os.listdir(subdir_path) 
-                                    if f.startswith('essidlist_') and f.endswith('.txt')]
-                    handshakes_files.extend(subdir_files)
+        current_dir_files, handshakes_files = find_essidlist_files()
         
         for file in current_dir_files:
             try:
@@ -1107,4 +1116,66 @@ def print_header(text, color="blue", char="=", centered=True, padding_left=0):
     
     print(colored(text_line, color))
     
-    print(colored(char * term_width, color))
\ No newline at end of file
+    print(colored(char * term_width, color))
+
+def format_size(num_bytes):
+    """
+    Format a byte count for display
+    
+    Args:
+        num_bytes: Size in bytes
+    
+    Returns:
+        String such as "512 B", "3.4 MB" or "1.20 GB"
+    """
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    for unit, scale in (("KB", 1024), ("MB", 1024 ** 2), ("GB", 1024 ** 3), ("TB", 1024 ** 4)):
+        if num_bytes < scale * 1024 or unit == "TB":
+            value = num_bytes / scale
+            return f"{value:.2f} {unit}" if unit in ("GB", "TB") else f"{value:.1f} {unit}"
+
+def format_duration(seconds):
+    """
+    Format a duration for display
+    
+    Args:
+        seconds: Duration in seconds
+    
+    Returns:
+        String such as "42s", "7m 05s", "3h 12m" or "2d 04h"
+    """
+    seconds = int(max(0, seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    if seconds < 86400:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    return f"{seconds // 86400}d {seconds % 86400 // 3600:02d}h"
+
+
+def read_progress(label):
+    """
+    Build an on_progress callback that prints how much of a file was read
+    
+    Args:
+        label: Text shown before the percentage
+    
+    Returns:
+        Callback receiving (bytes read, total bytes); the line is only redrawn
+        when the whole percentage changes
+    """
+    last = [-1]
+    
+    def report(done, total):
+        if not total:
+            return
+        percent = min(100, done * 100 // total)
+        if percent != last[0]:
+            last[0] = percent
+            end = "\n" if percent == 100 else ""
+            print(colored(f"\r[*] {label}: {percent}% ({format_size(done)} / {format_size(total)})", "cyan"),
+                  end=end, flush=True)
+    
+    return report
@@ -0,0 +1,315 @@
+import os
+import time
+import sqlite3
+from hc22000 import parse_hash_line
+from conversion_cache import RESULT_CONVERTED, file_digest
+from compression import capture_stem
+
+INDEX_PATH = os.path.join(os.path.expanduser("~"), ".snype", "index.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hc22000_path TEXT,
+    digest TEXT,
+    essid TEXT,
+    bssid TEXT,
+    result TEXT,
+    captured_at REAL,
+    indexed_at REAL
+);
+CREATE TABLE IF NOT EXISTS hashes (
+    id INTEGER PRIMARY KEY,
+    capture_id INTEGER NOT NULL REFERENCES captures(id) ON DELETE CASCADE,
+    line TEXT NOT NULL,
+    type TEXT NOT NULL,
+    bssid TEXT NOT NULL,
+    essid TEXT NOT NULL,
+    station TEXT NOT NULL,
+    message_pair INTEGER,
+    captured_at REAL,
+    cracked INTEGER NOT NULL DEFAULT 0,
+    password TEXT,
+    UNIQUE (capture_id, line)
+);
+CREATE INDEX IF NOT EXISTS captures_essid ON captures(essid);
+CREATE INDEX IF NOT EXISTS captures_bssid ON captures(bssid);
+CREATE INDEX IF NOT EXISTS captures_digest ON captures(digest);
+CREATE INDEX IF NOT EXISTS hashes_essid_cracked ON hashes(essid, cracked);
+CREATE INDEX IF NOT EXISTS hashes_bssid ON hashes(bssid);
+CREATE INDEX IF NOT EXISTS hashes_capture ON hashes(capture_id);
+"""
+
+HASH_TYPES = {"01": "PMKID", "02": "EAPOL"}
+
+def read_hash_rows(hc22000_file):
+    """
+    Parse an hc22000 file into index rows
+
+    Returns:
+        List of (line, type, bssid, essid, station, message_pair) tuples
+    """
+    rows = []
+    try:
+        with open(hc22000_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                fields = parse_hash_line(line)
+                if not fields:
+                    continue
+                parts = line.split("*")
+                try:
+                    message_pair = int(parts[8], 16) if len(parts) > 8 and parts[8] else None
+                except ValueError:
+                    message_pair = None
+                rows.append((line, HASH_TYPES.get(fields["type"], fields["type"]), fields["bssid"],
+                             fields["essid"], fields["station"], message_pair))
+    except FileNotFoundError:
+        pass
+    return rows
+
+class HandshakeIndex:
+    """
+    SQLite catalog of captures and the hash lines they produced
+
+    One row per capture and one row per hash line, with BSSID, ESSID, station,
+    message pair, PMKID/EAPOL type, capture time, source file and cracked status.
+    The database lives in ~/.snype/index.db.
+
+    Usage:
+        with HandshakeIndex() as index:
+            index.uncracked_hashes(essid="MyNet")
+    """
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def add_capture(self, cap_file, hc22000_file=None, digest=None, essid=None, bssid=None, result=None):
+        """
+        Insert or refresh a capture and its hash lines
+
+        Args:
+            cap_file: Path of the capture
+            hc22000_file: Path of the hc22000 file generated from it, if any
+            digest: Content hash of the capture as ingested; it stays the capture's
+                    address when the file is later compacted or archived
+            essid: Primary ESSID
+            bssid: Primary BSSID
+            result: Conversion result (see conversion_cache)
+
+        Returns:
+            Capture row id
+        """
+        path = os.path.abspath(cap_file)
+        try:
+            captured_at = os.path.getmtime(cap_file)
+        except OSError:
+            captured_at = None
+
+        rows = read_hash_rows(hc22000_file) if hc22000_file else []
+        if rows and not essid:
+            essid, bssid = rows[0][3], rows[0][2]
+
+        cur = self.conn.execute("SELECT id FROM captures WHERE path = ?", (path,))
+        existing = cur.fetchone()
+        values = (os.path.abspath(hc22000_file) if hc22000_file else None, digest, essid, bssid,
+                  result, captured_at, time.time())
+        if existing:
+            capture_id = existing["id"]
+            self.conn.execute(
+                "UPDATE captures SET hc22000_path = ?, digest = ?, essid = ?, bssid = ?, result = ?, "
+                "captured_at = ?, indexed_at = ? WHERE id = ?", values + (capture_id,))
+        else:
+            capture_id = self.conn.execute(
+                "INSERT INTO captures (hc22000_path, digest, essid, bssid, result, captured_at, indexed_at, path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values + (path,)).lastrowid
+
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO hashes (capture_id, line, type, bssid, essid, station, message_pair, captured_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(capture_id,) + row + (captured_at,) for row in rows])
+        self.conn.execute(
+            "UPDATE hashes SET cracked = 1, password = (SELECT password FROM hashes h2 "
+            "WHERE h2.essid = hashes.essid AND h2.cracked = 1 LIMIT 1) "
+            "WHERE capture_id = ? AND cracked = 0 AND essid IN "
+            "(SELECT essid FROM hashes WHERE cracked = 1)", (capture_id,))
+        return capture_id
+
+    def move_capture(self, old_path, new_path):
+        """Update the stored path of a capture that was moved"""
+        self.conn.execute("UPDATE captures SET path = ? WHERE path = ?",
+                          (os.path.abspath(new_path), os.path.abspath(old_path)))
+
+    def remove_missing(self, existing_paths):
+        """
+        Drop captures whose files are no longer present
+
+        Args:
+            existing_paths: Iterable of capture paths currently on disk
+        """
+        keep = {os.path.abspath(p) for p in existing_paths}
+        stale = [row["id"] for row in self.conn.execute("SELECT id, path FROM captures")
+                 if row["path"] not in keep]
+        self.conn.executemany("DELETE FROM captures WHERE id = ?", [(i,) for i in stale])
+        return len(stale)
+
+    def sync(self, cap_files, keep=()):
+        """
+        Reconcile the index with the captures present on disk
+
+        Rows of vanished captures are dropped. Captures the index has never seen
+        (e.g. organized before the index existed) are added together with the
+        <name>.hc22000 file next to them. Captures already known are not read.
+
+        Args:
+            cap_files: Capture paths currently on disk
+            keep: Capture paths whose rows are kept but which are never added,
+                  e.g. captures that may still be written
+
+        Returns:
+            Number of captures added or removed
+        """
+        removed = self.remove_missing(list(cap_files) + list(keep))
+        known = self.known_paths()
+        added = 0
+        for cap_file in cap_files:
+            if os.path.abspath(cap_file) in known:
+                continue
+            hc22000_file = capture_stem(cap_file) + ".hc22000"
+            try:
+                digest = file_digest(cap_file)
+            except OSError:
+                continue
+            if os.path.exists(hc22000_file):
+                self.add_capture(cap_file, hc22000_file, digest=digest, result=RESULT_CONVERTED)
+            else:
+                self.add_capture(cap_file, digest=digest)
+            added += 1
+        return added + removed
+
+    def known_paths(self):
+        """Set of absolute capture paths in the index"""
+        return {row["path"] for row in self.conn.execute("SELECT path FROM captures")}
+
+    def capture_files(self, converted_only=True):
+        """
+        List indexed capture paths, relative to the working directory
+
+        Args:
+            converted_only: Only captures that produced hash lines
+        """
+        query = "SELECT path FROM captures"
+        if converted_only:
+            query += " WHERE hc22000_path IS NOT NULL"
+        return sorted(os.path.relpath(row["path"]) for row in self.conn.execute(query))
+
+    def hc22000_files(self):
+        """List the hc22000 files of indexed captures, relative to the working directory"""
+        return sorted(os.path.relpath(row["hc22000_path"]) for row in self.conn.execute(
+            "SELECT DISTINCT hc22000_path FROM captures WHERE hc22000_path IS NOT NULL"))
+
+    def capture_summaries(self):
+        """
+        Describe every converted capture
+
+        Returns:
+            List of dicts with path, essid, bssid, hashes and cracked keys
+        """
+        rows = self.conn.execute(
+            "SELECT c.path, c.essid, c.bssid, COUNT(h.id) AS hashes, "
+            "COALESCE(MAX(h.cracked), 0) AS cracked "
+            "FROM captures c LEFT JOIN hashes h ON h.capture_id = c.id "
+            "WHERE c.hc22000_path IS NOT NULL GROUP BY c.id ORDER BY c.essid, c.path")
+        return [dict(row, path=os.path.relpath(row["path"])) for row in rows]
+
+    def captures_by_digest(self, digest):
+        """Capture rows whose content digest (as ingested) is digest"""
+        return self.conn.execute("SELECT * FROM captures WHERE digest = ?", (digest,)).fetchall()
+
+    def captures_for_bssid(self, bssid):
+        """
+        List the captures holding hash lines or the primary network of an access point
+
+        Served from the BSSID indexes, without walking the handshakes tree.
+
+        Returns:
+            Sorted capture paths relative to the working directory
+        """
+        rows = self.conn.execute(
+            "SELECT c.path FROM hashes h JOIN captures c ON c.id = h.capture_id WHERE h.bssid = ? "
+            "UNION SELECT path FROM captures WHERE bssid = ?", (bssid.upper(), bssid.upper()))
+        return sorted(os.path.relpath(row["path"]) for row in rows)
+
+    def capture_metadata(self, cap_file):
+        """Return the (ESSID, BSSID) of an indexed capture, or (None, None)"""
+        row = self.conn.execute("SELECT essid, bssid FROM captures WHERE path = ?",
+                                (os.path.abspath(cap_file),)).fetchone()
+        return (row["essid"], row["bssid"]) if row else (None, None)
+
+    def capture_hashes(self, cap_file, bssid=None):
+        """Hash lines produced by an indexed capture, optionally for one BSSID"""
+        query = ("SELECT h.line FROM hashes h JOIN captures c ON c.id = h.capture_id "
+                 "WHERE c.path = ?")
+        params = [os.path.abspath(cap_file)]
+        if bssid:
+            query += " AND h.bssid = ?"
+            params.append(bssid.upper())
+        return [row["line"] for row in self.conn.execute(query, params)]
+
+    def uncracked_hashes(self, essid=None, bssid=None):
+        """
+        Query hash lines that have not been cracked yet
+
+        Args:
+            essid: Restrict to one ESSID
+            bssid: Restrict to one BSSID
+
+        Returns:
+            List of sqlite3.Row objects (hashes columns plus capture path)
+        """
+        query = ("SELECT h.*, c.path FROM hashes h JOIN captures c ON c.id = h.capture_id "
+                 "WHERE h.cracked = 0")
+        params = []
+        if essid is not None:
+            query += " AND h.essid = ?"
+            params.append(essid)
+        if bssid is not None:
+            query += " AND h.bssid = ?"
+            params.append(bssid.upper())
+        return self.conn.execute(query, params).fetchall()
+
+    def mark_cracked(self, essid, password, bssid=None):
+        """
+        Record a recovered passphrase for every hash of a network
+
+        Args:
+            essid: Network ESSID
+            password: Recovered passphrase
+            bssid: Restrict to one access point
+
+        Returns:
+            Number of hash rows updated
+        """
+        query = "UPDATE hashes SET cracked = 1, password = ? WHERE essid = ?"
+        params = [password, essid]
+        if bssid:
+            query += " AND bssid = ?"
+            params.append(bssid.upper())
+        return self.conn.execute(query, params).rowcount
@@ -0,0 +1,101 @@
+import os
+from handshake_index import HandshakeIndex
+from hash_merge import hash_identity
+from handshake_watch import describe_hash_line
+from hc22000 import (
+    generate_hashes, parse_hash_line, PAIR_M1M2_E2, PAIR_M1M4_E4, PAIR_M2M3_E2, PAIR_M3M4_E4, PAIR_RC_NOT_CHECKED
+)
+
+# An M3 (or M4) proves the AP accepted the station's MIC, so the pair was made
+# with the right passphrase. An M1+M2 pair alone may be a wrong password attempt.
+PAIR_SCORES = {
+    PAIR_M2M3_E2: (100, True),
+    PAIR_M3M4_E4: (85, True),
+    PAIR_M1M4_E4: (80, True),
+    PAIR_M1M2_E2: (60, False),
+}
+PMKID_SCORE = 90
+NONCE_CORRECTION_PENALTY = 20
+
+def score_hash_line(line):
+    """
+    Rate how likely a hash line is to crack with the right passphrase
+
+    Args:
+        line: hc22000 line
+
+    Returns:
+        Dict with line, bssid, station, essid, authorized, nonce_correction,
+        score and description keys, or None for unparsable lines
+    """
+    fields = parse_hash_line(line)
+    if not fields:
+        return None
+
+    nonce_correction = False
+    if fields["type"] == "01":
+        score, authorized = PMKID_SCORE, True
+    else:
+        try:
+            message_pair = int(line.split("*")[8], 16)
+        except (IndexError, ValueError):
+            message_pair = PAIR_M1M2_E2
+        score, authorized = PAIR_SCORES.get(message_pair & 0x07, (50, False))
+        if message_pair & PAIR_RC_NOT_CHECKED:
+            nonce_correction = True
+            score -= NONCE_CORRECTION_PENALTY
+
+    return {
+        "line": line,
+        "bssid": fields["bssid"],
+        "station": fields["station"],
+        "essid": fields["essid"],
+        "authorized": authorized,
+        "nonce_correction": nonce_correction,
+        "score": score,
+        "description": describe_hash_line(line),
+    }
+
+def rank_hashes(lines):
+    """
+    Score and deduplicate hash lines, best first
+
+    Returns:
+        List of score dicts (see score_hash_line)
+    """
+    best = {}
+    for line in lines:
+        scored = score_hash_line(line)
+        if scored is None:
+            continue
+        identity = hash_identity(line)
+        if identity not in best or scored["score"] > best[identity]["score"]:
+            best[identity] = scored
+    return sorted(best.values(), key=lambda s: (-s["score"], s["bssid"], s["station"]))
+
+def capture_hash_lines(cap_file):
+    """Hash lines of a capture, from the handshake index when it was converted already"""
+    try:
+        with HandshakeIndex() as index:
+            rows = index.conn.execute(
+                "SELECT h.line FROM hashes h JOIN captures c ON c.id = h.capture_id WHERE c.path = ?",
+                (os.path.abspath(cap_file),)).fetchall()
+        if rows:
+            return [row["line"] for row in rows]
+    except Exception:
+        pass
+    lines, _ = generate_hashes(cap_file)
+    return lines
+
+def assess_capture(cap_file):
+    """
+    Rank every candidate handshake in a capture
+
+    Returns:
+        Tuple of (ranked score dicts, dict of BSSID -> best score dict)
+    """
+    ranked = rank_hashes(capture_hash_lines(cap_file))
+    best = {}
+    for scored in ranked:
+        best.setdefault(scored["bssid"], scored)
+    return ranked, best
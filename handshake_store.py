@@ -0,0 +1,74 @@
+import os
+from compression import capture_stem
+
+# Length of the digest prefix appended to a stored name that is already taken
+NAME_DIGEST_LENGTH = 12
+
+def stored_name(network_dir, base_name, digest=None):
+    """
+    Pick the stem under which a capture and its hc22000 file are stored
+
+    Captures keep their own name unless a different capture of the same ESSID
+    already uses it (e.g. eapol-01 from two networks sharing an ESSID); the
+    name is then made unique with a prefix of the content digest.
+
+    Args:
+        network_dir: handshakes/<ESSID> folder
+        base_name: Capture file name without extension
+        digest: Content digest of the capture
+
+    Returns:
+        File stem, without extension
+    """
+    taken = os.path.exists(os.path.join(network_dir, f"{base_name}.hc22000")) or any(
+        capture_stem(name) == base_name for name in _listdir(network_dir))
+    if not taken or not digest:
+        return base_name
+    return f"{base_name}-{digest[:NAME_DIGEST_LENGTH]}"
+
+def _listdir(directory):
+    try:
+        return os.listdir(directory)
+    except OSError:
+        return []
+
+def stored_copy(index, digest):
+    """
+    Find the stored capture with the given content
+
+    Args:
+        index: Open HandshakeIndex
+        digest: Content digest of a capture as it was first ingested
+
+    Returns:
+        Index row of a converted capture still present on disk, or None
+    """
+    if not digest:
+        return None
+    for row in index.captures_by_digest(digest):
+        if row["hc22000_path"] and os.path.exists(row["path"]):
+            return row
+    return None
+
+def duplicate_result(cap_file, stored):
+    """
+    Build the conversion result of a capture that is already stored
+
+    Args:
+        cap_file: Incoming capture
+        stored: Index row returned by stored_copy
+
+    Returns:
+        Result dict shaped like converter.convert_capture results
+    """
+    return {
+        "cap_file": cap_file,
+        "essid": stored["essid"],
+        "bssid": stored["bssid"],
+        "networks": [{"bssid": stored["bssid"], "essid": stored["essid"]}] if stored["bssid"] else [],
+        "hc22000": os.path.relpath(stored["hc22000_path"]),
+        "cap_dest": os.path.relpath(stored["path"]),
+        "result": stored["result"],
+        "error": None,
+        "duplicate": True
+    }
@@ -0,0 +1,133 @@
+import os
+import glob
+import time
+import shutil
+import threading
+import subprocess
+from termcolor import colored
+from pcap_reader import PcapTailReader, EapolKey
+from hc22000 import Hc22000Generator, parse_hash_line
+
+PAIR_NAMES = {
+    0x00: "M1+M2",
+    0x01: "M1+M4",
+    0x02: "M2+M3",
+    0x05: "M3+M4",
+}
+
+def describe_hash_line(line):
+    """Human readable description of what an hc22000 line contains"""
+    parts = line.split('*')
+    if parts[1] == "01":
+        return "PMKID"
+    try:
+        message_pair = int(parts[8], 16)
+    except (IndexError, ValueError):
+        return "EAPOL"
+    description = f"EAPOL {PAIR_NAMES.get(message_pair & 0x07, 'pair')}"
+    if message_pair & 0x80:
+        description += " (nonce correction needed)"
+    return description
+
+def notify(title, message):
+    """Ring the terminal bell and raise a desktop notification when notify-send is available"""
+    print("\a", end="", flush=True)
+    if shutil.which("notify-send"):
+        try:
+            subprocess.Popen(["notify-send", title, message],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            pass
+
+class HandshakeWatcher(threading.Thread):
+    """
+    Background thread that follows a growing airodump-ng capture
+
+    The newest <prefix>-NN.cap written after the watcher started is tailed with
+    PcapTailReader and fed to the streaming hc22000 generator. As soon as a
+    crackable EAPOL pair or PMKID for the target BSSID appears, on_handshake is
+    called with the hash line and, if a process was given with auto_stop, the
+    capture is stopped.
+
+    Args:
+        prefix: airodump-ng -w prefix (e.g. "eapol")
+        bssid: Target access point
+        essid: Target ESSID if already known (lets hashes resolve before a beacon is seen)
+        process: The airodump-ng Popen object
+        auto_stop: Terminate the process once a handshake is found
+        on_handshake: Callback receiving (hash line, description)
+        poll_interval: Seconds between polls
+    """
+    def __init__(self, prefix, bssid, essid=None, process=None, auto_stop=False,
+                 on_handshake=None, poll_interval=0.5):
+        super().__init__(daemon=True)
+        self.prefix = prefix
+        self.bssid = bssid.upper()
+        self.process = process
+        self.auto_stop = auto_stop
+        self.on_handshake = on_handshake
+        self.poll_interval = poll_interval
+        self.started_at = time.time()
+        self.generator = Hc22000Generator()
+        if essid:
+            self.generator.essids[self.bssid] = essid.encode("utf-8")
+        self.hashes = []
+        self.capture_file = None
+        self.last_eapol = 0.0
+        self.found = threading.Event()
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def locate_capture(self):
+        """Newest capture of this prefix written since the watcher started, or None"""
+        candidates = [
+            path for path in glob.glob(f"{self.prefix}-*.cap")
+            if os.path.getmtime(path) >= self.started_at - 1
+        ]
+        if candidates:
+            return max(candidates, key=os.path.getmtime)
+        return None
+
+    def run(self):
+        tail = None
+        while not self._stop_event.is_set():
+            if tail is None:
+                self.capture_file = self.locate_capture()
+                if self.capture_file:
+                    tail = PcapTailReader(self.capture_file)
+
+            if tail is not None:
+                try:
+                    frames = tail.poll()
+                except ValueError:
+                    return
+                for frame in frames:
+                    if isinstance(frame, EapolKey) and frame.bssid == self.bssid:
+                        self.last_eapol = time.monotonic()
+                    for line in self.generator.feed(frame):
+                        fields = parse_hash_line(line)
+                        if fields and fields["bssid"] == self.bssid:
+                            self._handshake(line)
+
+            if self.process is not None and self.process.poll() is not None:
+                return
+            self._stop_event.wait(self.poll_interval)
+
+    def _handshake(self, line):
+        self.hashes.append(line)
+        description = describe_hash_line(line)
+        first = not self.found.is_set()
+        self.found.set()
+
+        if self.on_handshake:
+            self.on_handshake(line, description)
+
+        if first and self.auto_stop and self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+def print_handshake(line, description):
+    """Default on_handshake callback for interactive captures"""
+    print(colored(f"\n[✓] Handshake captured: {description}", 'green', attrs=['bold']))
+    notify("snype", f"Handshake captured: {description}")
@@ -0,0 +1,116 @@
+import os
+from converter import safe_essid_name
+from handshake_index import HandshakeIndex
+from hc22000 import pair_rank
+
+MERGED_NAME = "merged.hc22000"
+GLOBAL_NAME = "all.hc22000"
+
+def hash_identity(line):
+    """
+    Identity of an hc22000 line: type, MIC or PMKID, ANonce and the MAC pair
+
+    The same handshake seen in several captures (or paired twice with different
+    message pair codes) yields the same identity.
+    """
+    parts = line.split("*")
+    if len(parts) < 6:
+        return None
+    anonce = parts[6] if parts[1] == "02" and len(parts) > 6 else ""
+    return (parts[1], parts[2].lower(), anonce.lower(), parts[3].lower(), parts[4].lower())
+
+def _preference(row):
+    # Lowest wins: the generator's best pair (see hc22000.pair_rank), then the earliest capture
+    authorized, rc_checked, preference = pair_rank(row["message_pair"] or 0)
+    return (not authorized, not rc_checked, -preference, row["captured_at"] or 0)
+
+def unique_hashes(index, include_cracked=False):
+    """
+    Deduplicate the indexed hash lines
+
+    When several lines share an identity, the pair the hc22000 generator would
+    keep wins: authorized pairs first, then those whose replay counter was
+    checked, so hashcat does not have to apply nonce corrections.
+
+    Args:
+        index: Open HandshakeIndex
+        include_cracked: Keep lines of networks whose password is already known
+
+    Returns:
+        Dict of ESSID -> list of hc22000 lines
+    """
+    query = "SELECT line, essid, message_pair, captured_at, cracked FROM hashes"
+    if not include_cracked:
+        query += " WHERE cracked = 0"
+    best = {}
+    for row in index.conn.execute(query + " ORDER BY id"):
+        identity = hash_identity(row["line"])
+        if identity is None:
+            continue
+        if identity not in best or _preference(row) < _preference(best[identity]):
+            best[identity] = row
+
+    networks = {}
+    for row in best.values():
+        networks.setdefault(row["essid"], []).append(row["line"])
+    for lines in networks.values():
+        lines.sort()
+    return networks
+
+def _write_if_changed(path, lines):
+    content = "".join(f"{line}\n" for line in lines)
+    try:
+        with open(path, "r") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+def merge_hashes(handshakes_dir="handshakes", include_cracked=False):
+    """
+    Write one deduplicated hash file per network and one global file
+
+    Per network: handshakes/<ESSID>/merged.hc22000. Global: handshakes/all.hc22000.
+    Files are only rewritten when their content changes, and merged files of
+    networks that no longer have hashes are removed.
+
+    Args:
+        handshakes_dir: Directory holding the per-network folders
+        include_cracked: Keep lines of networks whose password is already known
+
+    Returns:
+        Tuple of (number of unique lines, number of indexed lines)
+    """
+    with HandshakeIndex() as index:
+        networks = unique_hashes(index, include_cracked)
+        total = index.conn.execute(
+            "SELECT COUNT(*) FROM hashes" + ("" if include_cracked else " WHERE cracked = 0")
+        ).fetchone()[0]
+
+    os.makedirs(handshakes_dir, exist_ok=True)
+    written = set()
+    for essid, lines in networks.items():
+        network_dir = os.path.join(handshakes_dir, safe_essid_name(essid))
+        os.makedirs(network_dir, exist_ok=True)
+        merged_file = os.path.join(network_dir, MERGED_NAME)
+        _write_if_changed(merged_file, lines)
+        written.add(merged_file)
+
+    for entry in os.scandir(handshakes_dir):
+        merged_file = os.path.join(handshakes_dir, entry.name, MERGED_NAME)
+        if entry.is_dir() and merged_file not in written and os.path.exists(merged_file):
+            os.remove(merged_file)
+
+    all_lines = sorted(line for lines in networks.values() for line in lines)
+    global_file = os.path.join(handshakes_dir, GLOBAL_NAME)
+    if all_lines:
+        _write_if_changed(global_file, all_lines)
+    elif os.path.exists(global_file):
+        os.remove(global_file)
+
+    return len(all_lines), total
@@ -0,0 +1,317 @@
+import struct
+from pcap_reader import Beacon, EapolKey, decode_essid, read_frames, EAPOL_SNAP, LINKTYPE_IEEE802_11
+from pcap_writer import PcapWriter
+
+EAPOL_TIMEOUT = 5.0
+
+PAIR_M1M2_E2 = 0x00
+PAIR_M1M4_E4 = 0x01
+PAIR_M2M3_E2 = 0x02
+PAIR_M3M4_E4 = 0x05
+PAIR_RC_NOT_CHECKED = 0x80
+
+RSN_PMKID_KDE = b"\xdd\x14\x00\x0f\xac\x04"
+
+# Preference between pairs that share a MIC and ANonce: an M3 or M4 proves the
+# AP accepted the station's MIC, and M2+M3 carries the most reliable nonces
+PAIR_PREFERENCE = {PAIR_M2M3_E2: 3, PAIR_M3M4_E4: 2, PAIR_M1M4_E4: 1, PAIR_M1M2_E2: 0}
+
+def _mac_hex(mac):
+    return mac.replace(":", "").lower()
+
+def _essid_hex(essid):
+    """Hex field of an ESSID given as raw bytes or as text"""
+    return (essid if isinstance(essid, bytes) else essid.encode("utf-8")).hex()
+
+def zero_mic(eapol):
+    """Return a copy of an 802.1X EAPOL-Key frame with the MIC field zeroed"""
+    return eapol[:81] + b"\x00" * 16 + eapol[97:]
+
+def extract_pmkid(key_data):
+    """
+    Find the PMKID KDE in the key data of an M1
+
+    Args:
+        key_data: Key data bytes of an EAPOL-Key frame
+
+    Returns:
+        16 byte PMKID or None
+    """
+    offset = 0
+    while offset + 2 <= len(key_data):
+        kde_len = key_data[offset + 1]
+        kde = key_data[offset:offset + 2 + kde_len]
+        if kde[:6] == RSN_PMKID_KDE and len(kde) >= 22:
+            pmkid = kde[6:22]
+            if any(pmkid):
+                return pmkid
+        offset += 2 + kde_len
+    return None
+
+def format_pmkid_line(pmkid, bssid, station, essid):
+    """Format a WPA*01 (PMKID) hc22000 line"""
+    return (f"WPA*01*{pmkid.hex()}*{_mac_hex(bssid)}*{_mac_hex(station)}*"
+            f"{_essid_hex(essid)}***")
+
+def format_eapol_line(mic, bssid, station, essid, anonce, eapol, message_pair):
+    """Format a WPA*02 (EAPOL) hc22000 line"""
+    return (f"WPA*02*{mic.hex()}*{_mac_hex(bssid)}*{_mac_hex(station)}*"
+            f"{_essid_hex(essid)}*{anonce.hex()}*{zero_mic(eapol).hex()}*{message_pair:02x}")
+
+# RSN element of the rebuilt beacons: CCMP group and pairwise cipher, PSK
+RSN_PSK_CCMP = b"\x30\x14\x01\x00\x00\x0f\xac\x04\x01\x00\x00\x0f\xac\x04\x01\x00\x00\x0f\xac\x02\x00\x00"
+
+def _eapol_data_frame(eapol, ap, station, from_ap):
+    if from_ap:
+        header = b"\x08\x02\x00\x00" + station + ap + ap
+    else:
+        header = b"\x08\x01\x00\x00" + ap + station + ap
+    return header + b"\x00\x00" + EAPOL_SNAP + eapol
+
+def hash_line_frames(line):
+    """
+    Rebuild the minimal 802.11 frames a tool needs to crack one hc22000 line
+
+    The beacon names the ESSID; a PMKID comes back as an M1 carrying the PMKID
+    KDE, an EAPOL pair as an M1 with the pair's ANonce and replay counter
+    followed by the station's message with its MIC restored.
+
+    Args:
+        line: WPA*01 or WPA*02 hc22000 line
+
+    Returns:
+        List of 802.11 frames (bytes), in transmission order
+    """
+    parts = line.strip().split("*")
+    ap, station, essid = bytes.fromhex(parts[3]), bytes.fromhex(parts[4]), bytes.fromhex(parts[5])
+    beacon = (b"\x80\x00\x00\x00" + b"\xff" * 6 + ap + ap + b"\x00\x00" + b"\x00" * 8 + b"\x64\x00\x11\x04"
+              + bytes([0, len(essid)]) + essid + RSN_PSK_CCMP)
+    if parts[1] == "01":
+        key_data = RSN_PMKID_KDE + bytes.fromhex(parts[2])
+        m1 = struct.pack(">BBHBHHQ", 2, 3, 95 + len(key_data), 2, 0x008a, 16, 1) + b"\x00" * 32
+        m1 += b"\x00" * 48 + struct.pack(">H", len(key_data)) + key_data
+        return [beacon, _eapol_data_frame(m1, ap, station, True)]
+
+    eapol = bytes.fromhex(parts[7])
+    eapol = eapol[:81] + bytes.fromhex(parts[2]) + eapol[97:]
+    key_version = struct.unpack(">H", eapol[5:7])[0] & 0x0007
+    m1 = (eapol[:1] + struct.pack(">BHBHH", 3, 95, eapol[4], 0x0088 | key_version, 16) + eapol[9:17]
+          + bytes.fromhex(parts[6]) + b"\x00" * 48 + b"\x00\x00")
+    return [beacon, _eapol_data_frame(m1, ap, station, True), _eapol_data_frame(eapol, ap, station, False)]
+
+def write_hash_capture(line, path):
+    """Write a capture holding only the frames of one hc22000 line (see hash_line_frames)"""
+    with PcapWriter(path, LINKTYPE_IEEE802_11) as writer:
+        for number, frame in enumerate(hash_line_frames(line)):
+            writer.write(1.0 + number * 0.01, frame)
+    return path
+
+def pair_rank(message_pair):
+    """Sort key of a message pair: authorized first, then replay counter checked"""
+    preference = PAIR_PREFERENCE.get(message_pair & 0x07, 0)
+    return (preference > 0, not message_pair & PAIR_RC_NOT_CHECKED, preference)
+
+def parse_hash_line(line):
+    """
+    Split an hc22000 line into its metadata fields
+
+    Args:
+        line: WPA*TYPE*PMKID/MIC*MAC_AP*MAC_CLIENT*ESSID*... line
+
+    Returns:
+        Dict with type, bssid, station and essid keys, or None if the line is malformed
+    """
+    parts = line.strip().split('*')
+    if len(parts) < 6 or parts[0] != "WPA":
+        return None
+    try:
+        essid = decode_essid(bytes.fromhex(parts[5]))
+    except ValueError:
+        return None
+    return {
+        "type": parts[1],
+        "bssid": ":".join(parts[3][i:i + 2] for i in range(0, 12, 2)).upper(),
+        "station": ":".join(parts[4][i:i + 2] for i in range(0, 12, 2)).upper(),
+        "essid": essid
+    }
+
+class Hc22000Generator:
+    """
+    Streaming hc22000 generator fed one frame at a time
+
+    EAPOL messages are paired per (BSSID, station) by replay counter and nonce:
+    - M1 + M2: ANonce from M1, EAPOL from M2, equal replay counters
+    - M2 + M3: ANonce from M3, EAPOL from M2, M3 replay counter = M2 + 1
+    - M1 + M4 / M3 + M4: EAPOL and SNonce from M4 (only when the M4 nonce is set)
+    Pairs matched only by time (replay counters differ) get the "replay counter
+    not checked" bit so hashcat applies nonce error corrections.
+
+    Lines are held back until a beacon, probe response or (re)association
+    request gives the ESSID of their BSSID, so the generator can follow a capture that is still being written.
+    essids maps each BSSID to its raw ESSID bytes, embedded unchanged in the lines.
+
+    The same MIC and ANonce can be paired twice (M1+M2 and M2+M3 embed the same
+    M2); only the best message pair is kept (see pair_rank). When a better pair
+    arrives after the first one was returned, feed() returns the better line
+    too, and lines() gives the final set.
+
+    Usage:
+        generator = Hc22000Generator()
+        for frame in read_frames(path):
+            for line in generator.feed(frame):
+                ...
+    """
+    def __init__(self, eapol_timeout=EAPOL_TIMEOUT):
+        self.eapol_timeout = eapol_timeout
+        self.essids = {}
+        self.best = {}
+        self.pending = {}
+        self.messages = {}
+
+    def _within(self, earlier, later):
+        return abs(later.timestamp - earlier.timestamp) <= self.eapol_timeout
+
+    def _emit(self, bssid, line_fields):
+        identity = (line_fields[0], line_fields[1], line_fields[4], bssid, line_fields[2])
+        kept = self.best.get(identity)
+        if kept is not None:
+            if line_fields[0] != "02" or pair_rank(line_fields[5]) <= pair_rank(kept[1][5]):
+                return []
+        self.best[identity] = (bssid, line_fields)
+        essid = self.essids.get(bssid)
+        if essid is None:
+            pending = self.pending.setdefault(bssid, [])
+            if identity not in pending:
+                pending.append(identity)
+            return []
+        return [self._format(bssid, essid, line_fields)]
+
+    @staticmethod
+    def _format(bssid, essid, fields):
+        kind, value, station, eapol, anonce, message_pair = fields
+        if kind == "01":
+            return format_pmkid_line(value, bssid, station, essid)
+        return format_eapol_line(value, bssid, station, essid, anonce, eapol, message_pair)
+
+    def _pair(self, bssid, station, anonce_frame, eapol_frame, base_pair, expected_rc):
+        message_pair = base_pair
+        if eapol_frame.replay_counter != expected_rc:
+            message_pair |= PAIR_RC_NOT_CHECKED
+        return self._emit(bssid, ("02", eapol_frame.mic, station, eapol_frame.eapol,
+                                  anonce_frame.nonce, message_pair))
+
+    def feed(self, frame):
+        """
+        Process one frame from the capture reader
+
+        Args:
+            frame: Beacon or EapolKey
+
+        Returns:
+            List of hc22000 lines that became complete with this frame
+        """
+        if isinstance(frame, Beacon):
+            if frame.essid_raw and frame.bssid not in self.essids:
+                self.essids[frame.bssid] = frame.essid_raw
+                return [self._format(frame.bssid, frame.essid_raw, self.best[identity][1])
+                        for identity in self.pending.pop(frame.bssid, [])]
+            return []
+
+        if not isinstance(frame, EapolKey):
+            return []
+
+        message = frame.message
+        if message is None:
+            return []
+
+        key = (frame.bssid, frame.station)
+        state = self.messages.setdefault(key, {1: [], 2: [], 3: []})
+        lines = []
+
+        if message == 1:
+            pmkid = extract_pmkid(frame.key_data)
+            if pmkid:
+                lines += self._emit(frame.bssid, ("01", pmkid, frame.station, None, None, None))
+            state[1] = [m for m in state[1] if self._within(m, frame)][-7:] + [frame]
+
+        elif message == 2:
+            exact = [m for m in state[1] if m.replay_counter == frame.replay_counter and self._within(m, frame)]
+            candidates = exact or [m for m in state[1] if self._within(m, frame)][-1:]
+            for m1 in candidates:
+                lines += self._pair(frame.bssid, frame.station, m1, frame, PAIR_M1M2_E2, m1.replay_counter)
+            state[2] = [m for m in state[2] if self._within(m, frame)][-7:] + [frame]
+
+        elif message == 3:
+            for m2 in state[2]:
+                if self._within(m2, frame):
+                    lines += self._pair(frame.bssid, frame.station, frame, m2, PAIR_M2M3_E2,
+                                        frame.replay_counter - 1)
+            state[3] = [m for m in state[3] if self._within(m, frame)][-7:] + [frame]
+
+        elif message == 4 and any(frame.nonce):
+            for m3 in state[3]:
+                if self._within(m3, frame):
+                    lines += self._pair(frame.bssid, frame.station, m3, frame, PAIR_M3M4_E4,
+                                        m3.replay_counter)
+            if not lines:
+                for m1 in state[1]:
+                    if self._within(m1, frame):
+                        lines += self._pair(frame.bssid, frame.station, m1, frame, PAIR_M1M4_E4,
+                                            m1.replay_counter + 1)
+
+        return lines
+
+    def unresolved(self):
+        """Number of hash lines still waiting for the ESSID of their BSSID"""
+        return sum(len(lines) for lines in self.pending.values())
+
+    def lines(self):
+        """Best hc22000 line of every handshake whose ESSID is known, in discovery order"""
+        return [self._format(bssid, self.essids[bssid], fields)
+                for bssid, fields in self.best.values() if bssid in self.essids]
+
+def generate_hashes(path, on_progress=None):
+    """
+    Generate every hc22000 line contained in a capture file
+
+    The capture is streamed, so memory use does not depend on its size (see
+    CaptureReader); the generator only keeps a few recent EAPOL messages per
+    station plus the lines found.
+
+    Args:
+        path: Path to a .cap, .pcap or .pcapng file
+        on_progress: Optional callback receiving (bytes read, file size)
+
+    Returns:
+        Tuple of (list of hc22000 lines, dict of BSSID -> ESSID)
+    """
+    generator = Hc22000Generator()
+    for frame in read_frames(path, on_progress):
+        generator.feed(frame)
+    return generator.lines(), generator.essids
+
+def convert_capture_native(cap_file, hc22000_file, essidlist_file=None, on_progress=None):
+    """
+    Write the hc22000 lines of a capture, the way 'hcxpcapngtool -o [-E]' does
+
+    Args:
+        cap_file: Input capture
+        hc22000_file: Output hash file, only created when hashes were found
+        essidlist_file: Optional output file receiving one ESSID per line
+        on_progress: Optional callback receiving (bytes read, file size)
+
+    Returns:
+        Number of hash lines written
+    """
+    lines, essids = generate_hashes(cap_file, on_progress)
+
+    if lines:
+        with open(hc22000_file, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    if essidlist_file:
+        with open(essidlist_file, "wb") as f:
+            for essid in dict.fromkeys(essids.values()):
+                f.write(essid + b"\n")
+
+    return len(lines)
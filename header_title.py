@@ -1,6 +1,6 @@
 import shutil
 from termcolor import colored
-from functions import check_and_convert_cap_files, load_found_passwords, show_status_info, print_header , main_header
+from functions import check_and_convert_cap_files, load_found_passwords, show_status_info, print_header , main_header, format_size
 def print_snype_title():
     terminal_width = shutil.get_terminal_size().columns
     
@@ -24,7 +24,29 @@ def print_snype_title():
         print(" " * padding + colored_line)
     print("\n")
 
-def show_menu1():
+def capture_status(worker=None):
+    """
+    Return the capture lists shown in the menus
+
+    With a ConversionWorker the cached snapshot is used and conversion progress is
+    reported; without one, conversion runs synchronously as before.
+    """
+    if worker is None:
+        hc22000_files, cap_files, processed_cap_files = check_and_convert_cap_files()
+        return hc22000_files, cap_files, None
+
+    snapshot = worker.snapshot()
+    progress = None
+    if not snapshot["ready"]:
+        progress = "    [*] Scanning captures in background..."
+    elif snapshot["pending"]:
+        progress = f"    [*] Converting captures in background: {snapshot['completed']}/{snapshot['pending']}"
+        if snapshot["bytes_total"]:
+            progress += (f" ({format_size(snapshot['bytes_done'])} / "
+                         f"{format_size(snapshot['bytes_total'])})")
+    return snapshot["hc22000_files"], snapshot["cap_files"], progress
+
+def show_menu1(worker=None):
     terminal_width = shutil.get_terminal_size().columns
     separator = "=" * terminal_width
 
@@ -33,7 +55,10 @@ def show_menu1():
     print(colored(separator, 'cyan'))
     print(colored(f"   Welcome to snype!", 'cyan', attrs=['bold']))
     
-    hc22000_files, cap_files, processed_cap_files = check_and_convert_cap_files()
+    hc22000_files, cap_files, progress = capture_status(worker)
+
+    if progress:
+        print(colored(progress, 'yellow'))
 
     if hc22000_files:
         print(colored(f"\n    [✓] {len(hc22000_files)} .hc22000 file(s) generated:", 'green', attrs=['bold']))
@@ -72,7 +97,7 @@ def show_menu1():
 
     return user_option1
 
-def show_menu2():
+def show_menu2(worker=None):
     terminal_width = shutil.get_terminal_size().columns
     separator = "=" * terminal_width
     dash_separator = "-" * terminal_width
@@ -82,7 +107,10 @@ def show_menu2():
     print(colored(separator, 'cyan'))
     print(colored(f"   Welcome to snype!", 'cyan', attrs=['bold']))
 
-    hc22000_files, cap_files, processed_cap_files = check_and_convert_cap_files()
+    hc22000_files, cap_files, progress = capture_status(worker)
+
+    if progress:
+        print(colored(progress, 'yellow'))
 
     if hc22000_files:
         print(colored(f"    [✓] {len(hc22000_files)} .hc22000 file(s) generated:", 'green', attrs=['bold']))
@@ -126,6 +154,7 @@ def show_menu2():
         f"{colored('[10]', 'magenta', attrs=['bold'])} Convert EAPOL to hc22000",
         f"{colored('[11]', 'magenta', attrs=['bold'])} Delete Capture Files",
         f"{colored('[12]', 'magenta', attrs=['bold'])} Clear ESSID Lists",
+        f"{colored('[13]', 'magenta', attrs=['bold'])} Archive Captures",
     ]
 
     print(colored("\n ATTACK MODULES:", 'blue', attrs=['bold']))
@@ -135,5 +164,5 @@ def show_menu2():
     print(" " + "\n ".join(utility_options))
     print(colored("\n" + separator, 'magenta'))
 
-    user_option2 = input(colored("\nEnter option (1-12, Q to quit): ", 'cyan', attrs=['bold'])).strip().lower()
+    user_option2 = input(colored("\nEnter option (1-13, Q to quit): ", 'cyan', attrs=['bold'])).strip().lower()
     return user_option2
\ No newline at end of file
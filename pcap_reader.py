@@ -0,0 +1,661 @@
+import os
+import lzma
+import struct
+from compression import compression_of, open_compressed
+
+PCAP_MAGIC_US = 0xA1B2C3D4
+PCAP_MAGIC_NS = 0xA1B23C4D
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER = 0x1A2B3C4D
+
+PCAPNG_IDB = 0x00000001
+PCAPNG_PB = 0x00000002
+PCAPNG_SPB = 0x00000003
+PCAPNG_EPB = 0x00000006
+
+UINT32_LE = struct.Struct("<I")
+UINT32_BE = struct.Struct(">I")
+
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_PRISM = 119
+LINKTYPE_RADIOTAP = 127
+LINKTYPE_AVS = 163
+LINKTYPE_PPI = 192
+
+EAPOL_SNAP = b"\xaa\xaa\x03\x00\x00\x00\x88\x8e"
+EAPOL_TYPE_KEY = 3
+
+SUBTYPE_ASSOCIATION_REQUEST = 0
+SUBTYPE_REASSOCIATION_REQUEST = 2
+SUBTYPE_PROBE_RESPONSE = 5
+SUBTYPE_BEACON = 8
+
+# Offset of the information elements in the management frames read for ESSIDs:
+# 24 byte header + fixed fields (timestamp, interval and capabilities for
+# beacons and probe responses; capabilities, listen interval and, for a
+# reassociation, the current AP address for requests)
+IE_OFFSETS = {
+    SUBTYPE_BEACON: 36,
+    SUBTYPE_PROBE_RESPONSE: 36,
+    SUBTYPE_ASSOCIATION_REQUEST: 28,
+    SUBTYPE_REASSOCIATION_REQUEST: 34,
+}
+
+def format_mac(raw):
+    """Format 6 raw bytes as an upper-case colon separated MAC address"""
+    return ":".join(f"{b:02X}" for b in raw)
+
+def frequency_to_channel(freq):
+    """Convert a radiotap channel frequency in MHz to a channel number"""
+    if freq == 2484:
+        return 14
+    if 2412 <= freq <= 2472:
+        return (freq - 2407) // 5
+    if 5000 <= freq <= 5895:
+        return (freq - 5000) // 5
+    if 5955 <= freq <= 7115:
+        return (freq - 5950) // 5
+    return None
+
+class Beacon:
+    """
+    A management frame carrying the identity of an access point
+
+    Beacons and probe responses come from the AP; (re)association requests
+    name the ESSID a station joins, which reveals hidden networks whose
+    beacons carry an empty SSID.
+
+    essid_raw holds the SSID element bytes, which hash lines must embed
+    unchanged; essid is its UTF-8 decoding for display.
+    """
+    __slots__ = ("timestamp", "bssid", "essid_raw", "channel", "subtype")
+
+    def __init__(self, timestamp, bssid, essid_raw, channel, subtype):
+        self.timestamp = timestamp
+        self.bssid = bssid
+        self.essid_raw = essid_raw
+        self.channel = channel
+        self.subtype = subtype
+
+    @property
+    def essid(self):
+        return decode_essid(self.essid_raw) if self.essid_raw else None
+
+    def __repr__(self):
+        return f"Beacon(bssid={self.bssid!r}, essid={self.essid!r}, channel={self.channel!r})"
+
+class EapolKey:
+    """
+    An EAPOL-Key frame between an access point and a station
+
+    eapol holds the complete 802.1X frame (header included) as raw bytes,
+    which is what hc22000 lines embed for MIC verification.
+    """
+    __slots__ = ("timestamp", "bssid", "station", "from_ap", "key_info", "replay_counter",
+                 "nonce", "mic", "key_data", "eapol")
+
+    def __init__(self, timestamp, bssid, station, from_ap, key_info, replay_counter,
+                 nonce, mic, key_data, eapol):
+        self.timestamp = timestamp
+        self.bssid = bssid
+        self.station = station
+        self.from_ap = from_ap
+        self.key_info = key_info
+        self.replay_counter = replay_counter
+        self.nonce = nonce
+        self.mic = mic
+        self.key_data = key_data
+        self.eapol = eapol
+
+    @property
+    def key_version(self):
+        return self.key_info & 0x0007
+
+    @property
+    def has_mic(self):
+        return bool(self.key_info & 0x0100)
+
+    @property
+    def has_ack(self):
+        return bool(self.key_info & 0x0080)
+
+    @property
+    def has_install(self):
+        return bool(self.key_info & 0x0040)
+
+    @property
+    def has_secure(self):
+        return bool(self.key_info & 0x0200)
+
+    @property
+    def message(self):
+        """Position of the frame in the 4-way handshake (1-4), or None"""
+        if not self.key_info & 0x0008:
+            return None
+        if self.has_ack and not self.has_mic:
+            return 1
+        if self.has_ack and self.has_mic:
+            return 3
+        if self.has_mic and not self.has_secure and any(self.nonce):
+            return 2
+        if self.has_mic:
+            return 4
+        return None
+
+    def __repr__(self):
+        return (f"EapolKey(M{self.message}, bssid={self.bssid!r}, station={self.station!r}, "
+                f"replay_counter={self.replay_counter})")
+
+def _radiotap_info(packet):
+    """
+    Parse the parts of a radiotap header snype needs
+
+    Returns:
+        Tuple of (header length, has FCS, channel or None)
+    """
+    if len(packet) < 8:
+        return None, False, None
+    header_len = struct.unpack_from("<H", packet, 2)[0]
+
+    offset = 4
+    present_words = []
+    while offset + 4 <= header_len:
+        word = struct.unpack_from("<I", packet, offset)[0]
+        present_words.append(word)
+        offset += 4
+        if not word & 0x80000000:
+            break
+    present = present_words[0] if present_words else 0
+
+    has_fcs = False
+    channel = None
+    if present & 0x01:
+        offset = (offset + 7) & ~7
+        offset += 8
+    if present & 0x02 and offset < header_len:
+        has_fcs = bool(packet[offset] & 0x10)
+        offset += 1
+    if present & 0x04:
+        offset += 1
+    if present & 0x08:
+        offset = (offset + 1) & ~1
+        if offset + 2 <= header_len:
+            channel = frequency_to_channel(struct.unpack_from("<H", packet, offset)[0])
+
+    return header_len, has_fcs, channel
+
+def strip_link_header(linktype, packet):
+    """
+    Remove the link layer header in front of an 802.11 frame
+
+    Args:
+        linktype: Capture link type
+        packet: Memoryview of the captured packet
+
+    Returns:
+        Tuple of (memoryview of the 802.11 frame, radiotap channel or None),
+        or (None, None) for unsupported link types
+    """
+    if linktype == LINKTYPE_IEEE802_11:
+        return packet, None
+    if linktype == LINKTYPE_RADIOTAP:
+        header_len, has_fcs, channel = _radiotap_info(packet)
+        if header_len is None or header_len > len(packet):
+            return None, None
+        frame = packet[header_len:]
+        if has_fcs and len(frame) >= 4:
+            frame = frame[:-4]
+        return frame, channel
+    if linktype == LINKTYPE_PRISM and len(packet) >= 8:
+        header_len = struct.unpack_from("<I", packet, 4)[0]
+        return packet[header_len:], None
+    if linktype == LINKTYPE_AVS and len(packet) >= 8:
+        header_len = struct.unpack_from(">I", packet, 4)[0]
+        return packet[header_len:], None
+    if linktype == LINKTYPE_PPI and len(packet) >= 4:
+        header_len = struct.unpack_from("<H", packet, 2)[0]
+        return packet[header_len:], None
+    return None, None
+
+def decode_essid(essid):
+    """Printable form of raw ESSID bytes (not valid UTF-8 bytes are replaced)"""
+    return essid.decode("utf-8", errors="replace")
+
+def _parse_ies(body):
+    """Return the raw SSID and DS channel information elements of a management frame body"""
+    essid = None
+    channel = None
+    offset = 0
+    end = len(body)
+    while offset + 2 <= end:
+        ie_id = body[offset]
+        ie_len = body[offset + 1]
+        if offset + 2 + ie_len > end:
+            break
+        if ie_id == 0 and essid is None:
+            raw = bytes(body[offset + 2:offset + 2 + ie_len])
+            if raw.strip(b"\x00"):
+                essid = raw
+        elif ie_id == 3 and ie_len >= 1:
+            channel = body[offset + 2]
+        offset += 2 + ie_len
+    return essid, channel
+
+def parse_frame(frame, timestamp, radiotap_channel=None):
+    """
+    Decode an 802.11 frame into a Beacon or EapolKey
+
+    Args:
+        frame: Memoryview of the 802.11 frame (without link layer header)
+        timestamp: Capture timestamp in seconds
+        radiotap_channel: Channel taken from the radiotap header, if any
+
+    Returns:
+        Beacon, EapolKey or None for frames snype does not use
+    """
+    if len(frame) < 24:
+        return None
+
+    fc0 = frame[0]
+    fc1 = frame[1]
+    frame_type = (fc0 >> 2) & 0x03
+    subtype = fc0 >> 4
+
+    if frame_type == 0:
+        ie_offset = IE_OFFSETS.get(subtype)
+        if ie_offset is None:
+            return None
+        essid, channel = _parse_ies(frame[ie_offset:])
+        return Beacon(timestamp, format_mac(frame[16:22]), essid,
+                      channel or radiotap_channel, subtype)
+
+    if frame_type != 2 or fc1 & 0x40:
+        return None
+
+    to_ds = fc1 & 0x01
+    from_ds = fc1 & 0x02
+    header_len = 24
+    if to_ds and from_ds:
+        header_len += 6
+    if subtype & 0x08:
+        header_len += 2
+        if fc1 & 0x80:
+            header_len += 4
+
+    if len(frame) < header_len + 8 + 4 or frame[header_len:header_len + 8] != EAPOL_SNAP:
+        return None
+
+    eapol_start = header_len + 8
+    eapol_type = frame[eapol_start + 1]
+    if eapol_type != EAPOL_TYPE_KEY:
+        return None
+
+    eapol_len = struct.unpack_from(">H", frame, eapol_start + 2)[0] + 4
+    key = eapol_start + 4
+    if len(frame) < key + 95 or eapol_start + eapol_len > len(frame):
+        return None
+
+    if from_ds and not to_ds:
+        bssid, station, from_ap = frame[10:16], frame[4:10], True
+    elif to_ds and not from_ds:
+        bssid, station, from_ap = frame[4:10], frame[10:16], False
+    else:
+        return None
+
+    key_info = struct.unpack_from(">H", frame, key + 1)[0]
+    replay_counter = struct.unpack_from(">Q", frame, key + 5)[0]
+    key_data_len = struct.unpack_from(">H", frame, key + 93)[0]
+
+    return EapolKey(
+        timestamp,
+        format_mac(bssid),
+        format_mac(station),
+        from_ap,
+        key_info,
+        replay_counter,
+        bytes(frame[key + 13:key + 45]),
+        bytes(frame[key + 77:key + 93]),
+        bytes(frame[key + 95:key + 95 + key_data_len]),
+        bytes(frame[eapol_start:eapol_start + eapol_len])
+    )
+
+CHUNK_SIZE = 4 * 1024 * 1024
+MAX_RECORD_SIZE = 1024 * 1024
+
+class ChunkBuffer:
+    """
+    Sliding window over a file that is read in fixed-size chunks
+
+    At most one chunk plus the unread tail of the previous one is held, so
+    memory stays constant whatever the file size. Views handed out by view()
+    stay valid after the window moves on, because every refill builds a new
+    bytes object instead of resizing the old one.
+    """
+    def __init__(self, f, chunk_size=CHUNK_SIZE, on_progress=None, total=None, position=None):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.total = total
+        self.position = position
+        self.data = b""
+        self.pos = 0
+        self.bytes_read = 0
+
+    def available(self, length):
+        """
+        Make at least length unread bytes available
+
+        Returns:
+            False when the file ends first
+        """
+        if len(self.data) - self.pos >= length:
+            return True
+        rest = self.data[self.pos:]
+        chunk = self.f.read(max(self.chunk_size, length - len(rest)))
+        self.data = rest + chunk
+        self.pos = 0
+        if chunk:
+            self.bytes_read += len(chunk)
+            if self.on_progress:
+                self.on_progress(self.position() if self.position else self.bytes_read, self.total)
+        return len(self.data) >= length
+
+    def unpack(self, fmt, offset=0):
+        return fmt.unpack_from(self.data, self.pos + offset)
+
+    def view(self, offset, length):
+        return memoryview(self.data)[self.pos + offset:self.pos + offset + length]
+
+    def skip(self, length):
+        self.pos += length
+
+class CaptureReader:
+    """
+    Streaming reader for pcap and pcapng captures
+
+    The capture is read in chunk_size pieces through a ChunkBuffer and records
+    are parsed in place on the current chunk. Only the frames snype uses
+    (beacons, probe responses and EAPOL-Key frames) are copied out of it.
+
+    Memory ceiling: about chunk_size plus one record (at most MAX_RECORD_SIZE)
+    for the reader, i.e. roughly 5 MB with the defaults, independent of the
+    capture size. Records larger than MAX_RECORD_SIZE are treated as corruption
+    and end the read, like a truncated file does.
+
+    Args:
+        path: Path to a .cap, .pcap or .pcapng file, optionally gzip, xz or zstd
+              compressed (.gz/.xz/.zst), which is decompressed while reading
+        chunk_size: Bytes read from disk at a time
+        on_progress: Optional callback receiving (bytes read, file size)
+
+    Usage:
+        with CaptureReader("eapol-01.cap") as reader:
+            for frame in reader.frames():
+                ...
+    """
+    def __init__(self, path, chunk_size=CHUNK_SIZE, on_progress=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.size = 0
+        self.compression = None
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self.compression = compression_of(self.path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def records(self):
+        """
+        Yield every captured packet
+
+        A packet view is only guaranteed to hold its data until the next record
+        is requested; copy it to keep it longer.
+
+        Yields:
+            Tuple of (timestamp, linktype, memoryview of the packet data)
+        """
+        self._file.seek(0)
+        stream = open_compressed(self._file, self.compression)
+        buffer = ChunkBuffer(stream, self.chunk_size, self.on_progress, self.size,
+                             position=self._file.tell if self.compression else None)
+        try:
+            if not buffer.available(4):
+                return
+            magic = buffer.unpack(UINT32_LE)[0]
+            if magic == PCAPNG_SHB:
+                yield from self._pcapng_records(buffer)
+            elif magic in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+                yield from self._pcap_records(buffer, "<", magic == PCAP_MAGIC_NS)
+            elif buffer.unpack(UINT32_BE)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+                yield from self._pcap_records(buffer, ">", buffer.unpack(UINT32_BE)[0] == PCAP_MAGIC_NS)
+            else:
+                raise ValueError(f"{self.path} is not a pcap or pcapng capture")
+        except (EOFError, OSError, lzma.LZMAError) as e:
+            if not self.compression:
+                raise
+            raise ValueError(f"Cannot decompress {self.path}: {e}")
+        finally:
+            if stream is not self._file:
+                stream.close()
+
+    def _pcap_records(self, buffer, endian, nanoseconds):
+        if not buffer.available(24):
+            return
+        linktype = buffer.unpack(struct.Struct(endian + "I"), 20)[0]
+        buffer.skip(24)
+        divisor = 1e9 if nanoseconds else 1e6
+        record_header = struct.Struct(endian + "IIII")
+        while buffer.available(16):
+            ts_sec, ts_frac, incl_len, _ = buffer.unpack(record_header)
+            if incl_len > MAX_RECORD_SIZE or not buffer.available(16 + incl_len):
+                break
+            yield ts_sec + ts_frac / divisor, linktype, buffer.view(16, incl_len)
+            buffer.skip(16 + incl_len)
+
+    def _pcapng_records(self, buffer):
+        endian = "<"
+        uint32 = UINT32_LE
+        interfaces = []
+        while buffer.available(12):
+            block_type = buffer.unpack(uint32)[0]
+            if block_type == PCAPNG_SHB:
+                byte_order = buffer.unpack(UINT32_LE, 8)[0]
+                endian, uint32 = ("<", UINT32_LE) if byte_order == PCAPNG_BYTE_ORDER else (">", UINT32_BE)
+                interfaces = []
+            block_len = buffer.unpack(uint32, 4)[0]
+            if block_len < 12 or block_len > MAX_RECORD_SIZE or not buffer.available(block_len):
+                break
+            block = buffer.view(0, block_len)
+
+            if block_type == PCAPNG_IDB:
+                linktype = struct.unpack_from(endian + "H", block, 8)[0]
+                interfaces.append((linktype, self._pcapng_tsresol(block, endian, 16, block_len - 4)))
+            elif block_type in (PCAPNG_EPB, PCAPNG_PB):
+                if block_type == PCAPNG_EPB:
+                    if_id, ts_high, ts_low, cap_len = struct.unpack_from(endian + "IIII", block, 8)
+                else:
+                    if_id, _, ts_high, ts_low, cap_len = struct.unpack_from(endian + "HHIII", block, 8)
+                if if_id < len(interfaces) and 28 + cap_len <= block_len:
+                    linktype, resolution = interfaces[if_id]
+                    timestamp = ((ts_high << 32) | ts_low) * resolution
+                    yield timestamp, linktype, block[28:28 + cap_len]
+            elif block_type == PCAPNG_SPB and interfaces:
+                linktype, _ = interfaces[0]
+                cap_len = min(struct.unpack_from(endian + "I", block, 8)[0], block_len - 16)
+                yield 0.0, linktype, block[12:12 + cap_len]
+
+            buffer.skip(block_len)
+
+    @staticmethod
+    def _pcapng_tsresol(view, endian, offset, end):
+        """Read the if_tsresol option of an interface description block"""
+        while offset + 4 <= end:
+            code, length = struct.unpack_from(endian + "HH", view, offset)
+            if code == 0:
+                break
+            if code == 9 and length >= 1:
+                value = view[offset + 4]
+                if value & 0x80:
+                    return 2.0 ** -(value & 0x7F)
+                return 10.0 ** -value
+            offset += 4 + ((length + 3) & ~3)
+        return 1e-6
+
+    def frames(self):
+        """
+        Yield the beacons, probe responses and EAPOL-Key frames of the capture
+
+        Yields:
+            Beacon or EapolKey objects in capture order
+        """
+        for timestamp, linktype, packet in self.records():
+            frame, radiotap_channel = strip_link_header(linktype, packet)
+            if frame is None:
+                continue
+            parsed = parse_frame(frame, timestamp, radiotap_channel)
+            if parsed is not None:
+                yield parsed
+
+def read_frames(path, on_progress=None):
+    """
+    Iterate over the frames snype cares about in a capture file
+
+    Args:
+        path: Path to a .cap, .pcap or .pcapng file
+        on_progress: Optional callback receiving (bytes read, file size)
+
+    Yields:
+        Beacon or EapolKey objects
+    """
+    with CaptureReader(path, on_progress=on_progress) as reader:
+        yield from reader.frames()
+
+def capture_networks(path, on_progress=None):
+    """
+    Summarize the access points found in a capture
+
+    Args:
+        path: Path to a .cap, .pcap or .pcapng file
+        on_progress: Optional callback receiving (bytes read, file size)
+
+    Returns:
+        Dict of BSSID -> {essid, channel, eapol} where eapol counts EAPOL-Key frames
+    """
+    networks = {}
+    for frame in read_frames(path, on_progress):
+        network = networks.setdefault(frame.bssid, {"essid": None, "channel": None, "eapol": 0})
+        if isinstance(frame, Beacon):
+            if frame.essid and not network["essid"]:
+                network["essid"] = frame.essid
+            if frame.channel and not network["channel"]:
+                network["channel"] = frame.channel
+        else:
+            network["eapol"] += 1
+    return networks
+
+def primary_network(path, on_progress=None):
+    """
+    Pick the network a capture was most likely taken for
+
+    Networks with EAPOL-Key frames win over networks that were only beaconing.
+
+    Args:
+        path: Path to a .cap, .pcap or .pcapng file
+        on_progress: Optional callback receiving (bytes read, file size)
+
+    Returns:
+        Tuple of (essid, bssid), either of which may be None
+    """
+    networks = capture_networks(path, on_progress)
+    if not networks:
+        return None, None
+    bssid, network = max(
+        networks.items(),
+        key=lambda item: (item[1]["eapol"] > 0, item[1]["essid"] is not None, item[1]["eapol"])
+    )
+    return network["essid"], bssid
+
+class PcapTailReader:
+    """
+    Incremental reader for a pcap file that is still being written
+
+    Each poll() reads only the bytes appended since the previous call and
+    returns the frames of every complete record. A partially written record
+    is left for the next poll. airodump-ng writes classic pcap, so pcapng is
+    not handled here.
+    """
+    def __init__(self, path, max_read=4 * 1024 * 1024):
+        self.path = path
+        self.max_read = max_read
+        self.offset = 0
+        self.record_header = None
+        self.linktype = None
+        self.divisor = 1e6
+
+    def _read_global_header(self, f):
+        header = f.read(24)
+        if len(header) < 24:
+            return False
+        magic = struct.unpack_from("<I", header, 0)[0]
+        if magic in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+            endian = "<"
+        elif struct.unpack_from(">I", header, 0)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+            endian = ">"
+            magic = struct.unpack_from(">I", header, 0)[0]
+        else:
+            raise ValueError(f"{self.path} is not a pcap capture")
+        self.divisor = 1e9 if magic == PCAP_MAGIC_NS else 1e6
+        self.linktype = struct.unpack_from(endian + "I", header, 20)[0]
+        self.record_header = struct.Struct(endian + "IIII")
+        self.offset = 24
+        return True
+
+    def poll(self):
+        """
+        Read the records appended since the last call
+
+        Returns:
+            List of Beacon and EapolKey objects
+        """
+        frames = []
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return frames
+
+        with f:
+            if self.record_header is None and not self._read_global_header(f):
+                return frames
+
+            f.seek(self.offset)
+            data = f.read(self.max_read)
+            view = memoryview(data)
+            position = 0
+            while position + 16 <= len(view):
+                ts_sec, ts_frac, incl_len, _ = self.record_header.unpack_from(view, position)
+                if position + 16 + incl_len > len(view):
+                    break
+                packet = view[position + 16:position + 16 + incl_len]
+                frame, radiotap_channel = strip_link_header(self.linktype, packet)
+                if frame is not None:
+                    parsed = parse_frame(frame, ts_sec + ts_frac / self.divisor, radiotap_channel)
+                    if parsed is not None:
+                        frames.append(parsed)
+                position += 16 + incl_len
+            self.offset += position
+
+        return frames
@@ -0,0 +1,60 @@
+import struct
+from pcap_reader import PCAP_MAGIC_US
+
+PCAP_GLOBAL_HEADER = struct.Struct("<IHHiIII")
+PCAP_RECORD_HEADER = struct.Struct("<IIII")
+PCAP_SNAPLEN = 262144
+
+class PcapWriter:
+    """
+    Streaming writer for classic little-endian pcap files (microsecond timestamps)
+
+    Usage:
+        with PcapWriter("out.cap", LINKTYPE_RADIOTAP) as writer:
+            writer.write(timestamp, packet)
+    """
+    def __init__(self, path, linktype):
+        self.path = path
+        self.linktype = linktype
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        self._file = open(self.path, "wb")
+        self._file.write(PCAP_GLOBAL_HEADER.pack(PCAP_MAGIC_US, 2, 4, 0, 0, PCAP_SNAPLEN, self.linktype))
+
+    def write(self, timestamp, packet):
+        """
+        Append one packet
+
+        Args:
+            timestamp: Capture time in seconds
+            packet: Packet bytes or memoryview, including the link layer header
+        """
+        seconds = int(timestamp)
+        microseconds = int(round((timestamp - seconds) * 1e6))
+        if microseconds >= 1000000:
+            seconds, microseconds = seconds + 1, microseconds - 1000000
+        self._file.write(PCAP_RECORD_HEADER.pack(seconds, microseconds, len(packet), len(packet)))
+        self._file.write(packet)
+        self.count += 1
+
+    def write_raw(self, data, records):
+        """Append already encoded records (record headers included)"""
+        self._file.write(data)
+        self.count += records
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,188 @@
+import os
+import time
+import sqlite3
+from itertools import islice
+from conversion_cache import file_digest
+from wpa_engine import wordlist_candidates
+
+PMK_STORE_PATH = os.path.join(os.path.expanduser("~"), ".snype", "pmk.db")
+
+# PMKs written per transaction while filling; an interrupted pass resumes after the last one
+COMMIT_ROWS = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wordlists (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    candidates INTEGER
+);
+CREATE TABLE IF NOT EXISTS passes (
+    essid BLOB NOT NULL,
+    wordlist_id INTEGER NOT NULL REFERENCES wordlists(id) ON DELETE CASCADE,
+    derived INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL,
+    PRIMARY KEY (essid, wordlist_id)
+);
+CREATE TABLE IF NOT EXISTS pmks (
+    essid BLOB NOT NULL,
+    wordlist_id INTEGER NOT NULL REFERENCES wordlists(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    pmk BLOB NOT NULL,
+    PRIMARY KEY (essid, wordlist_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS wordlists_path ON wordlists(path, size, mtime_ns);
+"""
+
+class PmkStore:
+    """
+    SQLite store of precomputed PMKs, in the spirit of airolib-ng
+
+    PMKs are keyed by (ESSID, wordlist content hash, candidate position), where
+    the position counts the usable 8-63 byte candidates of the wordlist. Once a
+    wordlist has been run against an ESSID, any later handshake of that ESSID is
+    checked with MIC comparisons only. The passphrases themselves are not stored:
+    a hit is resolved by reading the wordlist up to its position. The database
+    lives in ~/.snype/pmk.db.
+
+    Usage:
+        with PmkStore() as store, PmkEngine() as engine:
+            found = match_pmks(store.derive(b"MyNet", "rockyou.txt", engine), targets)
+            store.passphrases("rockyou.txt", found.values())
+    """
+    def __init__(self, path=PMK_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def wordlist_id(self, wordlist):
+        """
+        Row id of a wordlist, identified by its content hash
+
+        The hash is only recomputed when the file's path, size or mtime changed,
+        so a renamed or copied wordlist keeps its precomputed PMKs.
+        """
+        path = os.path.abspath(wordlist)
+        stat = os.stat(path)
+        row = self.conn.execute("SELECT id FROM wordlists WHERE path = ? AND size = ? AND mtime_ns = ?",
+                                (path, stat.st_size, stat.st_mtime_ns)).fetchone()
+        if row:
+            return row["id"]
+        digest = file_digest(path)
+        self.conn.execute(
+            "INSERT INTO wordlists (digest, path, size, mtime_ns) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(digest) DO UPDATE SET path = excluded.path, size = excluded.size, "
+            "mtime_ns = excluded.mtime_ns", (digest, path, stat.st_size, stat.st_mtime_ns))
+        self.conn.commit()
+        return self.conn.execute("SELECT id FROM wordlists WHERE digest = ?", (digest,)).fetchone()["id"]
+
+    def progress(self, essid, wordlist_id):
+        """
+        Returns:
+            Tuple of (PMKs stored, whole wordlist derived) for an ESSID
+        """
+        row = self.conn.execute("SELECT derived, complete FROM passes WHERE essid = ? AND wordlist_id = ?",
+                                (essid, wordlist_id)).fetchone()
+        return (row["derived"], bool(row["complete"])) if row else (0, False)
+
+    def stored(self, essid, wordlist_id):
+        """
+        Yields:
+            Tuple of (position, PMK) for the stored PMKs of an ESSID, in wordlist order
+        """
+        cursor = self.conn.execute("SELECT position, pmk FROM pmks WHERE essid = ? AND wordlist_id = ? "
+                                   "ORDER BY position", (essid, wordlist_id))
+        for row in cursor:
+            yield row["position"], row["pmk"]
+
+    def _save(self, essid, wordlist_id, rows, derived, complete=False):
+        self.conn.executemany("INSERT OR REPLACE INTO pmks (essid, wordlist_id, position, pmk) VALUES (?, ?, ?, ?)",
+                              rows)
+        self.conn.execute(
+            "INSERT INTO passes (essid, wordlist_id, derived, complete, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(essid, wordlist_id) DO UPDATE SET derived = excluded.derived, "
+            "complete = excluded.complete, updated_at = excluded.updated_at",
+            (essid, wordlist_id, derived, int(complete), time.time()))
+        if complete:
+            self.conn.execute("UPDATE wordlists SET candidates = ? WHERE id = ?", (derived, wordlist_id))
+        self.conn.commit()
+
+    def derive(self, essid, wordlist, engine):
+        """
+        Stream every PMK of an ESSID and wordlist, computing only the missing ones
+
+        Stored PMKs come first; the rest are derived on the engine's worker pool
+        and stored in batches. Stopping early (e.g. once the password is found)
+        keeps what was derived so far.
+
+        Args:
+            essid: ESSID (bytes)
+            wordlist: Wordlist path
+            engine: Open PmkEngine
+
+        Yields:
+            Tuple of (position, PMK)
+        """
+        wordlist_id = self.wordlist_id(wordlist)
+        derived, complete = self.progress(essid, wordlist_id)
+        yield from self.stored(essid, wordlist_id)
+        if complete:
+            return
+
+        candidates = islice(wordlist_candidates(wordlist), derived, None)
+        position = derived
+        rows = []
+        finished = False
+        try:
+            for _, pmk in engine.derive(essid, candidates):
+                rows.append((essid, wordlist_id, position, pmk))
+                position += 1
+                yield position - 1, pmk
+                if len(rows) >= COMMIT_ROWS:
+                    self._save(essid, wordlist_id, rows, position)
+                    rows = []
+            finished = True
+        finally:
+            self._save(essid, wordlist_id, rows, position, complete=finished)
+
+    def passphrases(self, wordlist, positions):
+        """
+        Read the candidates at the given positions of a wordlist
+
+        Returns:
+            Dict of position -> passphrase (bytes)
+        """
+        wanted = set(positions)
+        found = {}
+        if not wanted:
+            return found
+        for position, candidate in enumerate(wordlist_candidates(wordlist)):
+            if position in wanted:
+                found[position] = candidate
+                if len(found) == len(wanted):
+                    break
+        return found
+
+    def summary(self):
+        """Stored passes, most recently updated first"""
+        return self.conn.execute(
+            "SELECT p.essid, p.derived, p.complete, p.updated_at, w.path, w.candidates FROM passes p "
+            "JOIN wordlists w ON w.id = p.wordlist_id ORDER BY p.updated_at DESC").fetchall()
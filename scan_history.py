@@ -0,0 +1,162 @@
+import os
+import time
+import sqlite3
+
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".snype", "history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    scanned_at REAL NOT NULL,
+    interface TEXT,
+    aps INTEGER NOT NULL,
+    stations INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    bssid TEXT NOT NULL,
+    essid TEXT,
+    channel INTEGER,
+    power INTEGER,
+    privacy TEXT,
+    cipher TEXT,
+    authentication TEXT,
+    first_seen REAL,
+    last_seen REAL,
+    stations INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS networks (
+    bssid TEXT PRIMARY KEY,
+    essid TEXT,
+    channel INTEGER,
+    power INTEGER,
+    privacy TEXT,
+    cipher TEXT,
+    authentication TEXT,
+    stations INTEGER NOT NULL DEFAULT 0,
+    first_seen REAL,
+    last_seen REAL,
+    scans INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS observations_bssid ON observations(bssid, last_seen);
+CREATE INDEX IF NOT EXISTS observations_scan ON observations(scan_id);
+CREATE INDEX IF NOT EXISTS networks_essid ON networks(essid);
+CREATE INDEX IF NOT EXISTS networks_last_seen ON networks(last_seen);
+"""
+
+class ScanHistory:
+    """
+    SQLite time series of every airodump-ng scan
+
+    observations holds one row per access point per scan (channel, power,
+    encryption, first/last seen and associated station count). networks keeps
+    the latest observation of every BSSID, so looking up a known network is a
+    single primary key read. The database lives in ~/.snype/history.db.
+
+    Usage:
+        with ScanHistory() as history:
+            history.lookup("AA:BB:CC:DD:EE:FF")
+    """
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def record_scan(self, scan, interface=None, scanned_at=None):
+        """
+        Append a scan to the history
+
+        Args:
+            scan: ScanResult of the scan
+            interface: Interface the scan ran on
+            scanned_at: Scan time (default: now)
+
+        Returns:
+            Scan row id
+        """
+        scanned_at = scanned_at or time.time()
+        scan_id = self.conn.execute(
+            "INSERT INTO scans (scanned_at, interface, aps, stations) VALUES (?, ?, ?, ?)",
+            (scanned_at, interface, len(scan.aps), len(scan.stations))).lastrowid
+
+        clients = {}
+        for station in scan.stations.values():
+            if station.bssid:
+                clients[station.bssid] = clients.get(station.bssid, 0) + 1
+
+        rows = []
+        for ap in scan.aps.values():
+            rows.append((ap.bssid, ap.essid, ap.channel, ap.power, ap.privacy, ap.cipher,
+                         ap.authentication, ap.first_seen or scanned_at, ap.last_seen or scanned_at,
+                         clients.get(ap.bssid, 0)))
+
+        self.conn.executemany(
+            "INSERT INTO observations (scan_id, bssid, essid, channel, power, privacy, cipher, "
+            "authentication, first_seen, last_seen, stations) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(scan_id,) + row for row in rows])
+        self.conn.executemany(
+            "INSERT INTO networks (bssid, essid, channel, power, privacy, cipher, authentication, "
+            "first_seen, last_seen, stations, scans) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1) "
+            "ON CONFLICT(bssid) DO UPDATE SET "
+            "essid = CASE WHEN excluded.essid != '' THEN excluded.essid ELSE networks.essid END, "
+            "channel = CASE WHEN excluded.channel > 0 THEN excluded.channel ELSE networks.channel END, "
+            "power = excluded.power, privacy = excluded.privacy, cipher = excluded.cipher, "
+            "authentication = excluded.authentication, stations = excluded.stations, "
+            "first_seen = MIN(networks.first_seen, excluded.first_seen), "
+            "last_seen = MAX(networks.last_seen, excluded.last_seen), scans = networks.scans + 1",
+            rows)
+        return scan_id
+
+    def lookup(self, bssid):
+        """Latest known state of an access point, or None"""
+        return self.conn.execute("SELECT * FROM networks WHERE bssid = ?", (bssid.upper(),)).fetchone()
+
+    def find(self, target):
+        """
+        Look up a network by BSSID or ESSID
+
+        Returns:
+            Most recently seen matching networks row, or None
+        """
+        row = self.lookup(target)
+        if row:
+            return row
+        return self.conn.execute("SELECT * FROM networks WHERE essid = ? ORDER BY last_seen DESC LIMIT 1",
+                                 (target,)).fetchone()
+
+    def recent_networks(self, limit=20):
+        """Networks seen most recently first"""
+        return self.conn.execute("SELECT * FROM networks ORDER BY last_seen DESC LIMIT ?", (limit,)).fetchall()
+
+    def channel_activity(self, since=None):
+        """
+        Access points and associated stations seen per channel
+
+        Args:
+            since: Only count scans after this time (default: all scans)
+
+        Returns:
+            Dict of channel -> {aps, stations, last_seen}
+        """
+        rows = self.conn.execute(
+            "SELECT o.channel, COUNT(DISTINCT o.bssid) AS aps, SUM(o.stations) AS stations, "
+            "MAX(s.scanned_at) AS last_seen FROM observations o JOIN scans s ON s.id = o.scan_id "
+            "WHERE o.channel > 0 AND s.scanned_at >= ? GROUP BY o.channel", (since or 0,))
+        return {row["channel"]: {"aps": row["aps"], "stations": row["stations"] or 0,
+                                 "last_seen": row["last_seen"]} for row in rows}
@@ -0,0 +1,219 @@
+from datetime import datetime
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+AP_HEADER = "BSSID"
+STATION_HEADER = "Station MAC"
+NOT_ASSOCIATED = "(not associated)"
+
+# Fixed columns before the ESSID in the access point section, and before the
+# probed ESSIDs in the station section
+AP_FIXED_FIELDS = 13
+STATION_FIXED_FIELDS = 6
+
+def _int(text, default=-1):
+    try:
+        return int(text.strip())
+    except (AttributeError, ValueError):
+        return default
+
+def _time(text):
+    try:
+        return datetime.strptime(text.strip(), TIME_FORMAT).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+class AccessPoint:
+    """An access point row of an airodump-ng CSV"""
+    __slots__ = ("bssid", "first_seen", "last_seen", "channel", "speed", "privacy", "cipher",
+                 "authentication", "power", "beacons", "ivs", "lan_ip", "essid")
+
+    def __init__(self, bssid, first_seen, last_seen, channel, speed, privacy, cipher,
+                 authentication, power, beacons, ivs, lan_ip, essid):
+        self.bssid = bssid
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.channel = channel
+        self.speed = speed
+        self.privacy = privacy
+        self.cipher = cipher
+        self.authentication = authentication
+        self.power = power
+        self.beacons = beacons
+        self.ivs = ivs
+        self.lan_ip = lan_ip
+        self.essid = essid
+
+    @property
+    def signal(self):
+        """Power for sorting; airodump-ng reports -1 when it could not measure it"""
+        return self.power if self.power < -1 else -1000
+
+    def __repr__(self):
+        return f"AccessPoint(bssid={self.bssid!r}, essid={self.essid!r}, channel={self.channel!r})"
+
+class Station:
+    """A station row of an airodump-ng CSV; bssid is None while not associated"""
+    __slots__ = ("mac", "first_seen", "last_seen", "power", "packets", "bssid", "probes")
+
+    def __init__(self, mac, first_seen, last_seen, power, packets, bssid, probes):
+        self.mac = mac
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.power = power
+        self.packets = packets
+        self.bssid = bssid
+        self.probes = probes
+
+    def __repr__(self):
+        return f"Station(mac={self.mac!r}, bssid={self.bssid!r})"
+
+class ScanResult:
+    """
+    Access points and stations of one airodump-ng scan
+
+    aps maps BSSID -> AccessPoint and stations maps MAC -> Station, both in
+    the order airodump-ng listed them.
+    """
+    __slots__ = ("aps", "stations")
+
+    def __init__(self, aps=None, stations=None):
+        self.aps = aps if aps is not None else {}
+        self.stations = stations if stations is not None else {}
+
+    def sorted_aps(self):
+        """Access points, strongest signal first"""
+        return sorted(self.aps.values(), key=lambda ap: ap.signal, reverse=True)
+
+    def clients(self, bssid):
+        """Stations associated with an access point"""
+        bssid = bssid.upper()
+        return [station for station in self.stations.values() if station.bssid == bssid]
+
+    def find(self, target):
+        """Access point whose BSSID or ESSID is target, or None"""
+        for ap in self.aps.values():
+            if ap.bssid == target.upper() or ap.essid == target:
+                return ap
+        return None
+
+def split_fields(line, fixed):
+    """
+    Split a CSV row into its fixed leading fields and the free-form remainder
+
+    airodump-ng does not quote its fields, so an ESSID may contain ", " or
+    quotes, which are part of its name. Only the first fixed separators are
+    trusted; everything after them is returned unsplit.
+
+    Returns:
+        Tuple of (list of fixed fields, remainder), or None when the row is too short
+    """
+    fields = line.split(",", fixed)
+    if len(fields) <= fixed:
+        return None
+    return [f.strip() for f in fields[:fixed]], fields[fixed]
+
+def parse_ap(line):
+    """
+    Parse one line of the access point section
+
+    The ESSID runs up to the last separator, which precedes the (usually
+    empty) key column; its length is checked against the ID-length column.
+
+    Returns:
+        AccessPoint, or None for headers and partial lines
+    """
+    split = split_fields(line.rstrip("\r\n"), AP_FIXED_FIELDS)
+    if split is None:
+        return None
+    fields, rest = split
+    if fields[0] == AP_HEADER or len(fields[0]) != 17:
+        return None
+
+    rest = rest[1:] if rest.startswith(" ") else rest
+    essid_length = _int(fields[12], default=None)
+    if essid_length is not None and rest[essid_length:essid_length + 1] == ",":
+        essid = rest[:essid_length]
+    else:
+        cut = rest.rfind(",")
+        essid = rest[:cut] if cut >= 0 else rest
+    essid = essid.strip()
+
+    return AccessPoint(
+        bssid=fields[0].upper(),
+        first_seen=_time(fields[1]),
+        last_seen=_time(fields[2]),
+        channel=_int(fields[3]),
+        speed=_int(fields[4]),
+        privacy=fields[5],
+        cipher=fields[6],
+        authentication=fields[7],
+        power=_int(fields[8]),
+        beacons=_int(fields[9], default=0),
+        ivs=_int(fields[10], default=0),
+        lan_ip=fields[11].replace(" ", ""),
+        essid=essid
+    )
+
+def parse_station(line):
+    """
+    Parse one line of the station section
+
+    Returns:
+        Station, or None for headers and partial lines
+    """
+    split = split_fields(line.rstrip("\r\n"), STATION_FIXED_FIELDS)
+    if split is None:
+        fields = [f.strip() for f in line.rstrip("\r\n").split(",")]
+        if len(fields) < STATION_FIXED_FIELDS:
+            return None
+        fields, rest = fields[:STATION_FIXED_FIELDS], ""
+    else:
+        fields, rest = split
+    if fields[0] == STATION_HEADER or len(fields[0]) != 17:
+        return None
+
+    bssid = fields[5]
+    probes = tuple(p.strip() for p in rest.split(",") if p.strip())
+    return Station(
+        mac=fields[0].upper(),
+        first_seen=_time(fields[1]),
+        last_seen=_time(fields[2]),
+        power=_int(fields[3]),
+        packets=_int(fields[4], default=0),
+        bssid=None if bssid == NOT_ASSOCIATED else bssid.upper(),
+        probes=probes
+    )
+
+def parse_scan(lines, scan=None):
+    """
+    Parse both sections of an airodump-ng CSV
+
+    Args:
+        lines: Iterable of CSV lines
+        scan: ScanResult to fill (default: a new one)
+
+    Returns:
+        ScanResult
+    """
+    scan = scan if scan is not None else ScanResult()
+    in_stations = False
+    for line in lines:
+        if not line.strip():
+            continue
+        if line.startswith(STATION_HEADER):
+            in_stations = True
+            continue
+        if in_stations:
+            station = parse_station(line)
+            if station:
+                scan.stations[station.mac] = station
+        else:
+            ap = parse_ap(line)
+            if ap:
+                scan.aps[ap.bssid] = ap
+    return scan
+
+def read_scan(csv_file):
+    """Parse an airodump-ng CSV file into a ScanResult"""
+    with open(csv_file, "r", errors="replace", newline="") as f:
+        return parse_scan(f)
@@ -0,0 +1,96 @@
+import time
+from scan_history import ScanHistory
+
+CHANNELS_24GHZ = list(range(1, 14))
+CHANNELS_5GHZ = [36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112, 116, 120, 124, 128,
+                 132, 136, 140, 144, 149, 153, 157, 161, 165]
+
+BANDS = {
+    "bg": "2.4 GHz",
+    "a": "5 GHz",
+    "abg": "2.4 and 5 GHz",
+}
+
+# Scans older than this do not influence the channel order
+HISTORY_DAYS = 30
+# A quick sweep visits the busiest channels that together held this share of the activity
+QUICK_COVERAGE = 0.9
+
+def band_channels(band):
+    """Channels airodump-ng hops over for a --band value"""
+    channels = []
+    if "b" in band or "g" in band:
+        channels += CHANNELS_24GHZ
+    if "a" in band:
+        channels += CHANNELS_5GHZ
+    return channels
+
+class ScanPlan:
+    """
+    Channels and band of an airodump-ng scan
+
+    Without channels airodump-ng hops over the whole band; with channels it
+    hops over exactly those, in the given order.
+    """
+    __slots__ = ("band", "channels", "quick")
+
+    def __init__(self, band="abg", channels=None, quick=False):
+        self.band = band
+        self.channels = channels
+        self.quick = quick
+
+    def airodump_args(self):
+        if self.channels:
+            return ["-c", ",".join(str(channel) for channel in self.channels)]
+        return ["--band", self.band]
+
+    def includes_5ghz(self):
+        channels = self.channels or band_channels(self.band)
+        return any(channel in CHANNELS_5GHZ for channel in channels)
+
+    def describe(self):
+        if not self.channels:
+            return f"all {BANDS.get(self.band, self.band)} channels"
+        kind = "quick sweep of" if self.quick else "busiest first over"
+        return f"{kind} {len(self.channels)} channel(s): {','.join(str(c) for c in self.channels)}"
+
+def plan_scan(band="abg", quick=False, history_path=None):
+    """
+    Build a scan plan from past scan activity
+
+    Channels of the band are ordered by how many access points and associated
+    stations earlier scans found on them, so busy channels are visited first in
+    every hop cycle. A quick sweep keeps only the busiest channels holding
+    QUICK_COVERAGE of that activity. Without usable history the plan falls back
+    to airodump-ng's own hopping over the band.
+
+    Args:
+        band: "bg", "a" or "abg"
+        quick: Only visit historically busy channels
+        history_path: Scan history database (default: ~/.snype/history.db)
+
+    Returns:
+        ScanPlan
+    """
+    channels = band_channels(band)
+    with ScanHistory(history_path) if history_path else ScanHistory() as history:
+        activity = history.channel_activity(since=time.time() - HISTORY_DAYS * 86400)
+
+    scores = {channel: activity[channel]["aps"] + activity[channel]["stations"]
+              for channel in channels if channel in activity}
+    if not scores:
+        return ScanPlan(band)
+
+    busy = sorted(scores, key=lambda channel: (-scores[channel], channel))
+    if quick:
+        total = sum(scores.values())
+        covered = 0
+        selected = []
+        for channel in busy:
+            selected.append(channel)
+            covered += scores[channel]
+            if covered >= total * QUICK_COVERAGE:
+                break
+        return ScanPlan(band, selected, quick=True)
+
+    return ScanPlan(band, busy + [channel for channel in channels if channel not in scores])
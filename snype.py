@@ -7,6 +7,8 @@ from header_title import (
     show_menu1,
     show_menu2
 )
+from conversion_worker import ConversionWorker
+from capture_archive import archive_stored_captures
 
 try:
     from snype import (
@@ -21,11 +23,8 @@ try:
         convert_eapol,
         delete_cap_files,
         delete_essidlist_files,
-        cleanup_essidlist_files,
-        check_and_convert_cap_files,
         select_primary_interface,
         select_secondary_interface,
-        auto_convert_latest_cap_file,
         view_saved_passwords  
     )
 except ImportError:
@@ -42,18 +41,15 @@ except ImportError:
         convert_eapol,
         delete_cap_files,
         delete_essidlist_files,
-        cleanup_essidlist_files,
-        check_and_convert_cap_files,
         select_primary_interface,
         select_secondary_interface,
-        auto_convert_latest_cap_file,
         view_saved_passwords
     )
 
 def main():
     clear_screen() 
-    cleanup_essidlist_files()
-    check_and_convert_cap_files()
+    worker = ConversionWorker()
+    worker.start()
     iface1, iface2 = get_saved_interface_info()
     network_info = get_saved_network_info()
     bssid = network_info[0] if network_info and network_info[0] else None
@@ -62,7 +58,7 @@ def main():
     while True:
         if not iface1:
             clear_screen()
-            user_option = show_menu1()
+            user_option = show_menu1(worker)
             
             if user_option.lower() == "q":
                 print(colored("Exiting snype...", 'yellow'))
@@ -88,18 +84,18 @@ def main():
                 clear_screen()
         else:
             clear_screen() 
-            check_and_convert_cap_files()
-            user_option = show_menu2()
+            user_option = show_menu2(worker)
             if user_option.lower() == "q":
                 print(colored("Exiting snype...", 'yellow'))
                 sys.exit(0)
             elif user_option == "4":
-                try:
-                    subprocess.run(["python3", "wordlist_crack.py"], 
-                        check=True, 
-                        capture_output=False)
-                except KeyboardInterrupt:
-                    print(colored("\n[!] Operation cancelled by user.", 'yellow'))
+                with worker.hold():
+                    try:
+                        subprocess.run(["python3", "wordlist_crack.py"], 
+                            check=True, 
+                            capture_output=False)
+                    except KeyboardInterrupt:
+                        print(colored("\n[!] Operation cancelled by user.", 'yellow'))
                 clear_screen()
             elif user_option == "5":
                 clear_screen()
@@ -121,16 +117,24 @@ def main():
                 bssid = None
                 clear_screen() 
             elif user_option == "10":
-                convert_eapol()
+                with worker.hold():
+                    convert_eapol()
                 clear_screen() 
             elif user_option == "11":
-                delete_cap_files()
+                with worker.hold():
+                    delete_cap_files()
                 clear_screen() 
             elif user_option == "12":
                 delete_essidlist_files()
                 clear_screen()  
+            elif user_option == "13":
+                clear_screen()
+                with worker.hold():
+                    archive_stored_captures()
+                clear_screen()
             elif user_option in ["1", "2"]:
-                handle_option(user_option, iface1, iface2, bssid)
+                with worker.hold():
+                    handle_option(user_option, iface1, iface2, bssid)
                 clear_screen() 
             elif user_option == "3":
                 bssid = get_saved_network_info
@@ -150,5 +154,4 @@ def main():
                 channel = network_info[1] if network_info and network_info[1] else None
 
 if __name__ == "__main__":
-    auto_convert_latest_cap_file()
     main()
\ No newline at end of file
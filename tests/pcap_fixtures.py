@@ -0,0 +1,75 @@
+"""
+Synthetic WPA2-PSK captures for the capture parsing tests
+
+Frames are built from a known passphrase, so every MIC and PMKID in them can
+be verified with wpa_engine.
+"""
+import hmac
+import struct
+import hashlib
+
+AP = bytes.fromhex("aabbccddeeff")
+STATION = bytes.fromhex("112233445566")
+ESSID = b"My Net"
+PASSPHRASE = b"password123"
+ANONCE = bytes(range(32))
+SNONCE = bytes(range(100, 132))
+
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_RADIOTAP = 127
+
+def pmk(essid=ESSID, passphrase=PASSPHRASE):
+    return hashlib.pbkdf2_hmac("sha1", passphrase, essid, 4096, 32)
+
+def kck(essid=ESSID):
+    data = min(AP, STATION) + max(AP, STATION) + min(ANONCE, SNONCE) + max(ANONCE, SNONCE)
+    return hmac.new(pmk(essid), b"Pairwise key expansion\x00" + data + b"\x00", hashlib.sha1).digest()[:16]
+
+def pmkid_kde(essid=ESSID):
+    return b"\xdd\x14\x00\x0f\xac\x04" + hmac.new(pmk(essid), b"PMK Name" + AP + STATION, hashlib.sha1).digest()[:16]
+
+def eapol_key(key_info, replay_counter, nonce, key_data=b"", essid=None):
+    """802.1X EAPOL-Key frame, signed with the fixture KCK when essid is given"""
+    body = (struct.pack(">BHHQ", 2, key_info, 16, replay_counter) + nonce + b"\x00" * 32 + b"\x00" * 16
+            + struct.pack(">H", len(key_data)) + key_data)
+    frame = struct.pack(">BBH", 1, 3, len(body)) + body
+    if essid is not None:
+        mic = hmac.new(kck(essid), frame, hashlib.sha1).digest()[:16]
+        frame = frame[:81] + mic + frame[97:]
+    return frame
+
+def data_frame(eapol, from_ap):
+    flags = 0x02 if from_ap else 0x01
+    addresses = STATION + AP + AP if from_ap else AP + STATION + AP
+    return bytes([0x08, flags]) + b"\x00\x00" + addresses + b"\x00\x00" + b"\xaa\xaa\x03\x00\x00\x00\x88\x8e" + eapol
+
+def _ssid_ie(essid, channel=6):
+    return bytes([0, len(essid)]) + essid + bytes([3, 1, channel])
+
+def beacon(essid=ESSID):
+    header = bytes([0x80, 0]) + b"\x00\x00" + b"\xff" * 6 + AP + AP + b"\x00\x00"
+    return header + b"\x00" * 8 + b"\x64\x00\x11\x04" + _ssid_ie(essid)
+
+def association_request(essid=ESSID):
+    header = bytes([0x00, 0]) + b"\x00\x00" + AP + STATION + AP + b"\x00\x00"
+    return header + b"\x11\x04\x0a\x00" + _ssid_ie(essid)
+
+def handshake(essid=ESSID, pmkid=True):
+    """M1 (optionally carrying a PMKID) to M4 of one authentication"""
+    return [
+        data_frame(eapol_key(0x008a, 1, ANONCE, pmkid_kde(essid) if pmkid else b""), True),
+        data_frame(eapol_key(0x010a, 1, SNONCE, b"\x30\x14" + b"\x01" * 20, essid), False),
+        data_frame(eapol_key(0x13ca, 2, ANONCE, b"\x00" * 56, essid), True),
+        data_frame(eapol_key(0x030a, 2, SNONCE, essid=essid), False),
+    ]
+
+def radiotap(frame):
+    return struct.pack("<BBHI", 0, 0, 14, 0x0a) + b"\x00\x00" + struct.pack("<HH", 2437, 0x00a0) + frame
+
+def write_pcap(path, frames, linktype=LINKTYPE_RADIOTAP):
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, linktype))
+        for index, frame in enumerate(frames):
+            data = radiotap(frame) if linktype == LINKTYPE_RADIOTAP else frame
+            f.write(struct.pack("<IIII", 1700000000, index, len(data), len(data)) + data)
+    return path
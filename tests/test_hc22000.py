@@ -0,0 +1,72 @@
+import pytest
+import pcap_fixtures as fx
+from hc22000 import (
+    PAIR_M1M2_E2, PAIR_M2M3_E2, PAIR_M3M4_E4, generate_hashes, parse_hash_line, write_hash_capture
+)
+from wpa_engine import HashTarget, derive_pmk
+
+def hash_lines(tmp_path, frames, linktype=fx.LINKTYPE_RADIOTAP):
+    lines, _ = generate_hashes(fx.write_pcap(str(tmp_path / "capture.cap"), frames, linktype))
+    return lines
+
+def eapol_pairs(lines):
+    return {line.split("*")[2]: int(line.split("*")[8], 16) & 0x07 for line in lines if line.startswith("WPA*02*")}
+
+@pytest.mark.parametrize("linktype", [fx.LINKTYPE_RADIOTAP, fx.LINKTYPE_IEEE802_11])
+def test_full_handshake_keeps_the_authorized_pairs(tmp_path, linktype):
+    lines = hash_lines(tmp_path, [fx.beacon()] + fx.handshake(), linktype)
+    pairs = eapol_pairs(lines)
+
+    # M2+M3 replaces M1+M2 (same MIC), M3+M4 adds the M4 MIC
+    assert sorted(pairs.values()) == [PAIR_M2M3_E2, PAIR_M3M4_E4]
+    assert PAIR_M1M2_E2 not in pairs.values()
+    pmk = derive_pmk(fx.PASSPHRASE, fx.ESSID)
+    assert all(HashTarget(line).matches(pmk) for line in lines)
+
+def test_m1_m2_only_is_unauthorized(tmp_path):
+    lines = hash_lines(tmp_path, [fx.beacon()] + fx.handshake(pmkid=False)[:2])
+    assert list(eapol_pairs(lines).values()) == [PAIR_M1M2_E2]
+
+def test_pmkid_is_extracted(tmp_path):
+    lines = hash_lines(tmp_path, [fx.beacon()] + fx.handshake()[:1])
+
+    assert len(lines) == 1 and lines[0].startswith("WPA*01*")
+    parsed = parse_hash_line(lines[0])
+    assert parsed["essid"] == fx.ESSID.decode()
+    assert HashTarget(lines[0]).matches(derive_pmk(fx.PASSPHRASE, fx.ESSID))
+    assert not HashTarget(lines[0]).matches(derive_pmk(b"wrongpass", fx.ESSID))
+
+def test_lines_wait_for_the_essid(tmp_path):
+    lines = hash_lines(tmp_path, fx.handshake() + [fx.beacon()])
+    assert len(lines) == 3
+
+def test_non_utf8_essid_keeps_its_bytes(tmp_path):
+    essid = b"caf\xe9 \xff"
+    cap_file = fx.write_pcap(str(tmp_path / "capture.cap"), [fx.beacon(essid)] + fx.handshake(essid))
+    lines, essids = generate_hashes(cap_file)
+
+    assert essids == {"AA:BB:CC:DD:EE:FF": essid}
+    assert {line.split("*")[5] for line in lines} == {essid.hex()}
+    pmk = derive_pmk(fx.PASSPHRASE, essid)
+    assert all(HashTarget(line).matches(pmk) for line in lines)
+
+def test_hidden_essid_from_association_request(tmp_path):
+    frames = [fx.beacon(b"")] + [fx.association_request()] + fx.handshake()
+    lines = hash_lines(tmp_path, frames)
+
+    assert len(lines) == 3
+    assert {line.split("*")[5] for line in lines} == {fx.ESSID.hex()}
+
+def test_hidden_essid_stays_unresolved(tmp_path):
+    assert hash_lines(tmp_path, [fx.beacon(b"\x00" * 6)] + fx.handshake()) == []
+
+@pytest.mark.parametrize("kind", ["WPA*01*", "WPA*02*"])
+def test_hash_capture_rebuilds_one_line(tmp_path, kind):
+    lines = hash_lines(tmp_path, [fx.beacon()] + fx.handshake())
+    pmk = derive_pmk(fx.PASSPHRASE, fx.ESSID)
+    for line in (line for line in lines if line.startswith(kind)):
+        rebuilt, essids = generate_hashes(write_hash_capture(line, str(tmp_path / "pair.cap")))
+
+        assert essids == {"AA:BB:CC:DD:EE:FF": fx.ESSID}
+        assert [candidate.split("*")[2] for candidate in rebuilt] == [line.split("*")[2]]
+        assert HashTarget(rebuilt[0]).matches(pmk)
@@ -0,0 +1,124 @@
+import os
+import re
+import json
+import mmap
+import time
+import hashlib
+
+CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".snype", "wordlist_catalog.json")
+
+# Bytes hashed and counted per step of a wordlist scan
+SCAN_CHUNK = 64 * 1024 * 1024
+# Wordlists up to this size are scanned while listing; larger ones when selected
+AUTO_SCAN_BYTES = 512 * 1024 * 1024
+
+# A line whose content, without trailing "\r", is 8 to 63 bytes long
+# (the candidates wpa_engine.wordlist_candidates keeps)
+WPA_CANDIDATE = re.compile(rb"^[^\n]{7,62}[^\n\r]\r*$", re.M)
+
+ENGINE_AIRCRACK = "aircrack-ng"
+ENGINE_NATIVE = "native"
+
+def scan_wordlist(wordlist, on_progress=None):
+    """
+    Count the lines and WPA candidates of a wordlist and hash its content
+
+    The file is memory-mapped and processed in SCAN_CHUNK windows cut at line
+    boundaries; newlines are counted and candidates matched by C-level bytes
+    and regex scans, so no Python code runs per line.
+
+    Args:
+        wordlist: Wordlist path
+        on_progress: Optional callback receiving (bytes scanned, total bytes)
+
+    Returns:
+        Dict with lines, candidates and digest keys
+    """
+    digest = hashlib.sha256()
+    lines = 0
+    candidates = 0
+    size = os.path.getsize(wordlist)
+    if size:
+        with open(wordlist, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            while start < size:
+                end = data.find(b"\n", min(start + SCAN_CHUNK, size) - 1)
+                end = size if end < 0 else end + 1
+                chunk = data[start:end]
+                digest.update(chunk)
+                lines += chunk.count(b"\n")
+                candidates += len(WPA_CANDIDATE.findall(chunk))
+                start = end
+                if on_progress:
+                    on_progress(start, size)
+            if data[size - 1:size] != b"\n":
+                lines += 1
+    return {"lines": lines, "candidates": candidates, "digest": digest.hexdigest()}
+
+class WordlistCatalog:
+    """
+    Persistent catalog of wordlist statistics, keyed by absolute path
+
+    Each entry holds size, mtime_ns, line count, WPA candidate count and the
+    sha256 of the content; it is rescanned only when the size or mtime changed.
+    The catalog also remembers the last throughput measured for each cracking
+    engine, which turns a keyspace into an estimated duration.
+    """
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self.files = {}
+        self.rates = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.rates = data.get("rates", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            pass
+
+    def save(self):
+        """Atomically write the catalog back to disk"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self.files, "rates": self.rates}, f)
+        os.replace(tmp_path, self.path)
+
+    def cached(self, wordlist):
+        """Catalog entry of a wordlist if it is still current, without scanning"""
+        path = os.path.abspath(wordlist)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        entry = self.files.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry
+        return None
+
+    def entry(self, wordlist, on_progress=None):
+        """
+        Catalog entry of a wordlist, scanning it when new or modified
+
+        Returns:
+            Dict with size, mtime_ns, lines, candidates, digest and scanned_at keys
+        """
+        entry = self.cached(wordlist)
+        if entry:
+            return entry
+        path = os.path.abspath(wordlist)
+        stat = os.stat(path)
+        entry = scan_wordlist(path, on_progress)
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, scanned_at=time.time())
+        self.files[path] = entry
+        return entry
+
+    def record_rate(self, engine, rate):
+        """Remember the candidates per second an engine reached"""
+        if rate > 0:
+            self.rates[engine] = rate
+
+    def estimate(self, candidates, engine=ENGINE_AIRCRACK):
+        """Seconds needed to test candidates at the engine's last measured rate, or None"""
+        rate = self.rates.get(engine)
+        return candidates / rate if rate else None
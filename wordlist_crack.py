@@ -8,9 +8,30 @@ import time
 import signal
 import re
 import shutil
+import struct
+import tempfile
+from contextlib import ExitStack
 from functions import(
-    check_and_convert_cap_files, view_saved_passwords, save_password, load_found_passwords, print_header
+    check_and_convert_cap_files, view_saved_passwords, save_password, load_found_passwords, print_header,
+    read_progress, format_size, format_duration
 )
+from conversion_cache import ConversionManifest
+from pcap_reader import primary_network
+from converter import hcxpcapngtool_available
+from file_catalog import find_files_in_directory
+from handshake_index import HandshakeIndex
+from handshake_quality import assess_capture
+from hc22000 import write_hash_capture
+from compression import decompressed_path
+from batch_crack import batch_crack
+from wpa_engine import PmkEngine, HashTarget, match_pmks
+from pmk_store import PmkStore
+from wordlist_prep import WordlistCache
+from crack_checkpoint import CheckpointStore, CandidateFeeder, target_key, KEYS_TESTED, KEYS_RATE, CHECKPOINT_INTERVAL
+from wordlist_catalog import WordlistCatalog, AUTO_SCAN_BYTES, ENGINE_AIRCRACK, ENGINE_NATIVE
+
+# Seconds between two ETA lines while aircrack-ng runs
+ETA_INTERVAL = 10.0
 
 class WifiCrackingTool:
     def __init__(self):
@@ -18,6 +39,7 @@ class WifiCrackingTool:
         self.setup_logging()
         self.check_dependencies()
         self.found_passwords = {} 
+        self.capture_info = {}
         self.term_width = shutil.get_terminal_size().columns
 
     def setup_logging(self):
@@ -31,7 +53,7 @@ class WifiCrackingTool:
 
     def check_dependencies(self):
         """Check if required tools are installed"""
-        dependencies = ['aircrack-ng', 'hcxpcapngtool']
+        dependencies = ['aircrack-ng']
         for tool in dependencies:
             try:
                 subprocess.run([tool, '--help'], 
@@ -41,20 +63,17 @@ class WifiCrackingTool:
             except (subprocess.CalledProcessError, FileNotFoundError):
                 self.logger.error(f"{tool} is not installed. Please install it.")
                 sys.exit(1)
+        
+        if not hcxpcapngtool_available():
+            self.logger.info("hcxpcapngtool not found, using the built-in hc22000 converter.")
 
     def list_cap_files(self):
         """Find all .cap files in the current directory and handshakes subdirectory"""
         try:
-            current_dir_files = [f for f in os.listdir() if f.endswith(".cap")]
-            
-            handshakes_dir = "handshakes"
-            handshakes_files = []
-            
-            if os.path.exists(handshakes_dir) and os.path.isdir(handshakes_dir):
-                for root, dirs, files in os.walk(handshakes_dir):
-                    handshakes_files.extend([
-                        os.path.join(root, f) for f in files if f.endswith(".cap")
-                    ])
+            current_dir_files = find_files_in_directory(".", [".cap"])
+            with HandshakeIndex() as index:
+                self.capture_info = {row["path"]: row for row in index.capture_summaries()}
+            handshakes_files = [f for f in self.capture_info if f not in current_dir_files]
             
             all_cap_files = current_dir_files + handshakes_files
             
@@ -74,8 +93,16 @@ class WifiCrackingTool:
             return None
         print("\n")
         print_header("SELECT CAPTURE FILE", "yellow","-")
+        capture_info = self.capture_info
         for idx, file in enumerate(cap_files, 1):
-            print(f"{colored(f'[{idx}]', 'yellow')} {file}")
+            info = capture_info.get(file)
+            if info:
+                details = f"{info['essid'] or '?'} / {info['bssid'] or '?'}, {info['hashes']} hash(es)"
+                if info['cracked']:
+                    details += ", cracked"
+                print(f"{colored(f'[{idx}]', 'yellow')} {file} {colored(f'({details})', 'white')}")
+            else:
+                print(f"{colored(f'[{idx}]', 'yellow')} {file}")
 
         try:
             while True:
@@ -124,8 +151,11 @@ class WifiCrackingTool:
             
             print("\n")
             print_header("AVAILABLE WORDLISTS", "yellow","-")
+            catalog = WordlistCatalog()
             for idx, file in enumerate(wordlist_files, 1):
-                print(f"{colored(f'[{idx}]', 'yellow')} {file}")
+                print(f"{colored(f'[{idx}]', 'yellow')} {file} "
+                      f"{colored(f'({self.wordlist_details(catalog, os.path.join(wordlist_dir, file))})', 'white')}")
+            catalog.save()
             
             try:
                 default_wordlist="rockyou.txt"
@@ -160,44 +190,236 @@ class WifiCrackingTool:
             self.logger.error(colored(f"[!] Error in wordlist selection: {e}", "red"))
             return None
         
+    def wordlist_details(self, catalog, path):
+        """One-line size, keyspace and estimated duration of a wordlist for the selection list"""
+        try:
+            size = os.path.getsize(path)
+            entry = catalog.cached(path)
+            if not entry and size <= AUTO_SCAN_BYTES:
+                entry = catalog.entry(path)
+            if not entry:
+                return f"{format_size(size)}, not scanned yet"
+            details = f"{format_size(size)}, {entry['lines']} lines, {entry['candidates']} WPA candidates"
+            estimate = catalog.estimate(entry["candidates"])
+            if estimate is not None:
+                details += f", ~{format_duration(estimate)}"
+            return details
+        except OSError as e:
+            return f"unreadable: {e}"
+
+    def prepare_wordlist(self, wordlist):
+        """
+        Swap a wordlist for its cached WPA-ready derivative (8-63 bytes, no duplicates)
+
+        The derivative is built once per wordlist content; on failure the
+        original wordlist is used unchanged.
+        """
+        try:
+            cache = WordlistCache()
+            entry = cache.lookup(wordlist)
+            if not entry:
+                print(colored(f"[*] Preparing WPA-ready copy of {os.path.basename(wordlist)} (one-time)", "cyan"))
+                entry = cache.prepare(wordlist, on_progress=read_progress("Scanning wordlist"))
+            else:
+                cache.save()
+            dropped = entry["source_lines"] - entry["candidates"]
+            print(colored(f"[+] Keyspace: {entry['candidates']} WPA candidates "
+                          f"({dropped} short, long or duplicate lines skipped)", "green"))
+            for engine in (ENGINE_AIRCRACK, ENGINE_NATIVE):
+                estimate = cache.catalog.estimate(entry["candidates"], engine)
+                if estimate is not None:
+                    print(colored(f"[*] Estimated time with {engine}: {format_duration(estimate)} "
+                                  f"at {cache.catalog.rates[engine]:.0f} keys/s", "cyan"))
+            return entry["prepared"]
+        except KeyboardInterrupt:
+            print(colored("\n[!] Wordlist preparation interrupted, using the original wordlist.", "yellow"))
+            return wordlist
+        except Exception as e:
+            self.logger.warning(colored(f"[!] Could not prepare the wordlist: {e}", "yellow"))
+            return wordlist
+
+    def capture_metadata(self, cap_file):
+        """Return the (ESSID, BSSID) recorded for the capture when it was converted"""
+        try:
+            with HandshakeIndex() as index:
+                essid, bssid = index.capture_metadata(cap_file)
+            if essid:
+                return essid, bssid
+            return ConversionManifest().metadata_for(cap_file)
+        except Exception as e:
+            self.logger.warning(colored(f"[!] Could not read capture metadata: {e}", "yellow"))
+            return None, None
+
     def extract_ssid(self, cap_file):
-        """Extract SSID from the capture file using aircrack-ng"""
+        """Extract SSID and BSSID by reading the capture file in-process"""
         try:
-            cmd = f"aircrack-ng {cap_file} | awk '/WPA \\(/ {{for (i=3; i<NF-2; i++) printf \"%s%s\", (i>3 ? \"_\" : \"\"), $i; print \"\"}}'"
-            
-            process = subprocess.Popen(
-                cmd, 
-                shell=True,
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE, 
-                text=True
-            )
-            
-            stdout, stderr = process.communicate()
-            
-            if process.returncode != 0:
-                self.logger.warning(colored(f"[!] Failed to extract SSID: {stderr}", "red"))
-                return None
+            ssid, bssid = primary_network(cap_file, on_progress=read_progress("Reading capture"))
             
-            lines = stdout.strip().split('\n')
-            if lines and lines[0]:
-                ssid = lines[0].strip()
+            if ssid:
                 self.logger.info(colored(f"[+] Extracted SSID: {ssid}", "green"))
-                return ssid
             else:
                 self.logger.warning(colored("[!] No SSID found in the capture file", "yellow"))
-                return None
+            return ssid, bssid
             
         except Exception as e:
             self.logger.error(colored(f"[!] Error extracting SSID: {e}", "red"))
-            return None
+            return None, None
     
+    def review_handshakes(self, cap_file, network_bssid=None):
+        """
+        Score the handshakes in a capture and pick the network to crack
+        
+        Returns:
+            Best score dict of the chosen network, None to crack without a target,
+            or False when the user aborts
+        """
+        try:
+            ranked, best = assess_capture(cap_file)
+        except Exception as e:
+            self.logger.warning(colored(f"[!] Could not score handshakes: {e}", "yellow"))
+            return None
+        
+        if not ranked:
+            print(colored("[!] No crackable handshake in this capture (no complete EAPOL pair or PMKID).", "red"))
+            choice = input(colored("[?] Crack anyway? (y/N): ", "cyan")).strip().lower()
+            return None if choice == 'y' else False
+        
+        print_header("HANDSHAKE QUALITY", "yellow", "-")
+        for bssid, scored in best.items():
+            score = f"[{scored['score']:3d}]"
+            print(f"{colored(score, 'yellow')} {scored['essid']} ({bssid}) - "
+                  f"{scored['description']}, station {scored['station']}")
+        
+        target = best.get(network_bssid.upper()) if network_bssid else None
+        target = target or ranked[0]
+        
+        if not target["authorized"]:
+            print(colored("[!] Only M1+M2 pairs were captured for this network: the client may have "
+                          "used a wrong password.", "yellow"))
+        if target["nonce_correction"]:
+            print(colored("[!] The best pair needs nonce error correction, which aircrack-ng does not "
+                          "apply. hashcat on merged.hc22000 is more reliable.", "yellow"))
+        return target
+
+    def crack_with_pmk_store(self, cap_file, wordlist, catalog, network_bssid=None, target_line=None):
+        """
+        Check the capture's hashes against the PMK store, deriving the missing PMKs
+
+        Only target_line is checked when a pair was selected; otherwise every
+        hash line of the capture (for network_bssid).
+
+        PMKs already computed for the ESSID and wordlist (from earlier captures)
+        only cost a MIC comparison each; new ones are derived on all cores and
+        stored for the next capture of the same ESSID.
+
+        Returns:
+            Recovered password, False when the whole wordlist was tested without
+            success, or None to fall back to aircrack-ng
+        """
+        try:
+            if target_line:
+                lines = [target_line]
+            else:
+                with HandshakeIndex() as index:
+                    lines = index.capture_hashes(cap_file, network_bssid)
+            targets = []
+            for line in lines:
+                try:
+                    targets.append(HashTarget(line))
+                except (ValueError, IndexError, struct.error):
+                    continue
+            if not targets or not all(target.supported for target in targets):
+                return None
+            essid = targets[0].essid
+            targets = [target for target in targets if target.essid == essid]
+
+            with PmkStore() as store:
+                derived, complete = store.progress(essid, store.wordlist_id(wordlist))
+                if derived:
+                    state = "all" if complete else f"{derived}"
+                    print(colored(f"[+] PMK store: {state} PMKs of this wordlist already computed for this ESSID", "green"))
+                elif input(colored("[?] Precompute PMKs for this ESSID and wordlist, reusable for later "
+                                   "captures? (y/N): ", "cyan")).strip().lower() != 'y':
+                    return None
+
+                total = self.keyspace(catalog, wordlist)
+                started = time.monotonic()
+                rate = [0.0]
+
+                def on_progress(tested):
+                    # Stored PMKs only cost a MIC check, so the rate counts the newly derived ones
+                    if tested > derived:
+                        rate[0] = (tested - derived) / max(time.monotonic() - started, 1e-6)
+                    eta = f", ETA {format_duration((total - tested) / rate[0])}" if total and rate[0] else ""
+                    print(f"\r[*] {tested}/{total or '?'} PMKs tested ({rate[0]:.0f}/s){eta}", end="", flush=True)
+
+                with PmkEngine() as engine:
+                    pmks = store.derive(essid, wordlist, engine)
+                    try:
+                        found = match_pmks(pmks, targets, on_progress)
+                    finally:
+                        pmks.close()
+                print()
+                catalog.record_rate(ENGINE_NATIVE, rate[0])
+                catalog.save()
+
+                if not found:
+                    return False
+                passphrase = store.passphrases(wordlist, found.values()).get(next(iter(found.values())))
+            return passphrase.decode("utf-8", errors="replace") if passphrase else None
+        except KeyboardInterrupt:
+            print(colored("\n[!] PMK precomputation interrupted, progress saved.", "yellow"))
+            return None
+        except Exception as e:
+            self.logger.warning(colored(f"[!] PMK store unavailable: {e}", "yellow"))
+            return None
+
+    def resume_point(self, cap_file, wordlist, catalog, network_bssid=None, target_line=None):
+        """
+        Find where an earlier crack of this handshake with this wordlist stopped
+
+        Returns:
+            Tuple of (target key, wordlist digest, candidate offset to start from),
+            or None when checkpoints are unavailable
+        """
+        try:
+            if target_line:
+                lines = [target_line]
+            else:
+                with HandshakeIndex() as index:
+                    lines = index.capture_hashes(cap_file, network_bssid)
+            target = target_key(cap_file, lines, network_bssid)
+            cache = WordlistCache(catalog=catalog)
+            wordlist_digest = cache.digest_of(wordlist)
+            cache.save()
+            with CheckpointStore() as checkpoints:
+                offset = checkpoints.offset(target, wordlist_digest)
+            if offset:
+                choice = input(colored(f"[?] An earlier run stopped after {offset} candidates. "
+                                       "Resume from there? (Y/n): ", "cyan")).strip().lower()
+                if choice == 'n':
+                    offset = 0
+            return target, wordlist_digest, offset
+        except Exception as e:
+            self.logger.warning(colored(f"[!] Checkpoints unavailable: {e}", "yellow"))
+            return None
+
     def crack_wifi(self, cap_file, wordlist):
         process = None
         password_found = False
         password = None
         network_ssid = None
+        network_bssid = None
         success_message = ""
+        capture_input = ExitStack()
+        checkpoint = None
+        feeder = None
+        offset = 0
+        tested = 0
+        rate = 0.0
+        # One catalog for the whole run: the wordlist is scanned at most once and
+        # a single object writes wordlist_catalog.json
+        catalog = WordlistCatalog()
         
         try:
             if not os.path.exists(cap_file):
@@ -208,7 +430,18 @@ class WifiCrackingTool:
                 print(colored(f"[ERROR] Wordlist not found: {wordlist}", "red"))
                 return False
             
-            network_ssid = self.extract_ssid(cap_file)
+            network_ssid, network_bssid = self.capture_metadata(cap_file)
+            if network_ssid:
+                self.logger.info(colored(f"[+] Extracted SSID: {network_ssid}", "green"))
+            else:
+                network_ssid, network_bssid = self.extract_ssid(cap_file)
+            
+            target = self.review_handshakes(cap_file, network_bssid)
+            if target is False:
+                return False
+            target_line = target["line"] if target else None
+            if target:
+                network_ssid, network_bssid = target["essid"], target["bssid"]
             
             print("\n")
             print_header("CRACKING WIFI PASSWORD", "yellow","-")
@@ -216,35 +449,89 @@ class WifiCrackingTool:
             print(colored("Capture file: ", 'yellow') + cap_file)
             if network_ssid:
                 print(colored("Network SSID: ", 'yellow') + network_ssid)
+            if network_bssid:
+                print(colored("Network BSSID: ", 'yellow') + network_bssid)
             print(colored("Wordlist: ", 'yellow') + wordlist)
+            
+            stored_password = self.crack_with_pmk_store(cap_file, wordlist, catalog, network_bssid, target_line)
+            if stored_password:
+                if network_ssid:
+                    save_password(network_ssid, stored_password, cap_file)
+                print_header("CRACKING COMPLETE", "green","=")
+                print(colored(f"[SUCCESS] PASSWORD FOUND: {stored_password}", "green"))
+                return True
+            if stored_password is False:
+                print(colored("[RESULT] No password found (all PMKs of this wordlist tested)", "yellow"))
+                return False
+            
+            if network_bssid:
+                checkpoint = self.resume_point(cap_file, wordlist, catalog, network_bssid, target_line)
+                offset = checkpoint[2] if checkpoint else 0
+            else:
+                print(colored("[!] No target BSSID known: cracking from the wordlist file, "
+                              "without checkpoints", "yellow"))
+            total = self.keyspace(catalog, wordlist)
+            
             print(colored("\n[*] Cracking will start in:", "green"))
             for i in range(3, 0, -1):
                 print(colored(f"{i}...", "cyan"))
                 time.sleep(1)
             
-            cmd = [
-                "aircrack-ng",
-                "-w", wordlist,   
-                cap_file
-            ]
+            if target_line:
+                # aircrack-ng picks its own pair from a full capture, so it gets only the selected one
+                pair_dir = tempfile.mkdtemp(prefix="snype-pair-")
+                capture_input.callback(shutil.rmtree, pair_dir, ignore_errors=True)
+                input_path = write_hash_capture(target_line, os.path.join(pair_dir, "pair.cap"))
+                pass_fds = ()
+                print(colored(f"[*] Cracking the selected pair only: {target['description']}", "cyan"))
+            else:
+                input_path, pass_fds = capture_input.enter_context(decompressed_path(cap_file))
+            # Candidates are streamed on stdin so a run can resume from its checkpoint;
+            # "-w -" needs "-b", otherwise aircrack-ng reads the target choice from stdin
+            if network_bssid:
+                cmd = [
+                    "aircrack-ng",
+                    "-b", network_bssid,
+                    "-w", "-",
+                    input_path
+                ]
+            else:
+                cmd = [
+                    "aircrack-ng",
+                    "-w", wordlist,
+                    input_path
+                ]
             
 
             print(colored("[+] Executing command: " + " ".join(cmd), "green"))
             print(colored("[*] Press Ctrl+C to interrupt the cracking process", "yellow"))
             
+            if offset:
+                print(colored(f"[*] Resuming after {offset} candidates", "yellow"))
+            
             original_sigint = signal.signal(signal.SIGINT, signal.SIG_IGN)
             
+            read_fd, write_fd = os.pipe() if network_bssid else (None, None)
             process = subprocess.Popen(
                 cmd, 
+                stdin=read_fd,
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE, 
                 text=True,
-                preexec_fn=os.setsid
+                preexec_fn=os.setsid,
+                pass_fds=pass_fds
             )
             
+            if network_bssid:
+                os.close(read_fd)
+                feeder = CandidateFeeder(wordlist, offset, write_fd)
+                feeder.start()
+            
             signal.signal(signal.SIGINT, original_sigint)
             
             output_buffer = []
+            last_checkpoint = time.monotonic()
+            last_eta = time.monotonic()
             
             try:
                 for line in iter(process.stdout.readline, ''):
@@ -256,15 +543,46 @@ class WifiCrackingTool:
                         if ssid_match:
                             network_ssid = ssid_match.group(1).strip()
                     
+                    tested_match = KEYS_TESTED.search(line)
+                    if tested_match:
+                        tested = int(tested_match.group(1))
+                        rate_match = KEYS_RATE.search(line)
+                        if rate_match:
+                            rate = float(rate_match.group(1))
+                        if total and rate and time.monotonic() - last_eta >= ETA_INTERVAL:
+                            remaining = max(0, total - offset - tested)
+                            print(colored(f"[*] {offset + tested}/{total} candidates tested, "
+                                          f"ETA {format_duration(remaining / rate)}", "cyan"))
+                            last_eta = time.monotonic()
+                        if checkpoint and time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                            self.save_checkpoint(checkpoint, offset + tested, wordlist)
+                            last_checkpoint = time.monotonic()
+                    
                     key_match = re.search(r"KEY FOUND!\s*\[\s*(.+?)\s*\]", line)
                     if key_match:
                         password = key_match.group(1).strip()
                         password_found = True
                         
                 process.wait()
+                if feeder:
+                    feeder.join()
                 
             except KeyboardInterrupt:
+                if checkpoint:
+                    print(colored(f"\n[*] Progress saved after {offset + tested} candidates", "yellow"))
+                return False
+            
+            if feeder and feeder.error:
+                print(colored(f"[!] Reading the wordlist failed after {offset + tested} candidates: "
+                              f"{feeder.error}", "red"))
+                if checkpoint:
+                    print(colored("[*] Progress saved, the next run resumes from there", "yellow"))
                 return False
+            
+            # The checkpoint is only dropped when aircrack-ng saw the whole wordlist
+            if checkpoint and (password_found or (process.returncode == 0 and feeder.finished)):
+                self.clear_checkpoint(checkpoint)
+                checkpoint = None
                 
             if password_found and password:
                 success_message = "\n" + "=" * self.term_width + "\n"
@@ -297,15 +615,45 @@ class WifiCrackingTool:
                     os.killpg(os.getpgid(process.pid), signal.SIGKILL)
                 except Exception:
                     pass
+            if rate:
+                catalog.record_rate(ENGINE_AIRCRACK, rate)
+                try:
+                    catalog.save()
+                except OSError:
+                    pass
+            if checkpoint and tested:
+                self.save_checkpoint(checkpoint, offset + tested, wordlist)
+            capture_input.close()
+
+    def keyspace(self, catalog, wordlist):
+        """Number of WPA candidates in a wordlist, or None if it cannot be scanned"""
+        try:
+            return catalog.entry(wordlist, on_progress=read_progress("Counting candidates"))["candidates"]
+        except OSError as e:
+            self.logger.warning(colored(f"[!] Could not scan the wordlist: {e}", "yellow"))
+            return None
+
+    def save_checkpoint(self, checkpoint, reached, wordlist):
+        """Record how many candidates of the wordlist were tested"""
+        target, wordlist_digest, _ = checkpoint
+        try:
+            with CheckpointStore() as checkpoints:
+                checkpoints.save(target, wordlist_digest, reached, os.path.abspath(wordlist))
+        except Exception as e:
+            self.logger.warning(colored(f"[!] Could not save checkpoint: {e}", "yellow"))
+
+    def clear_checkpoint(self, checkpoint):
+        """Forget the checkpoint of a finished run"""
+        target, wordlist_digest, _ = checkpoint
+        try:
+            with CheckpointStore() as checkpoints:
+                checkpoints.clear(target, wordlist_digest)
+        except Exception as e:
+            self.logger.warning(colored(f"[!] Could not clear checkpoint: {e}", "yellow"))
 
     def find_files_in_directory(self, directory, extensions):
         """Find files with specific extensions in a directory"""
-        found_files = []
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    found_files.append(os.path.join(root, file))
-        return found_files
+        return find_files_in_directory(directory, extensions)
 
     def run(self, cap_file=None, wordlist=None):
         """Main execution method"""
@@ -342,6 +690,7 @@ class WifiCrackingTool:
                         f"{colored('[1]', 'yellow', attrs=['bold'])} Crack WiFi password",
                         f"{colored('[2]', 'yellow', attrs=['bold'])} View saved passwords",
                         f"{colored('[3]', 'yellow', attrs=['bold'])} Check and convert CAP files",
+                        f"{colored('[4]', 'yellow', attrs=['bold'])} Batch crack all uncracked handshakes",
                         f"{colored('[Q]', 'yellow', attrs=['bold'])} Quit"
                     ]
                     
@@ -353,7 +702,7 @@ class WifiCrackingTool:
                     
                     print(colored("-" * self.term_width, "yellow"))
                     
-                    choice = input(colored("\n[?] Choose an option (1-3 or Q): ", "cyan")).strip()
+                    choice = input(colored("\n[?] Choose an option (1-4 or Q): ", "cyan")).strip()
                     
                     if choice == "1":
                         if not cap_file:
@@ -373,7 +722,7 @@ class WifiCrackingTool:
                             wordlist = None  
                             continue
                         
-                        success = self.crack_wifi(cap_file, wordlist)
+                        success = self.crack_wifi(cap_file, self.prepare_wordlist(wordlist))
                         
                         cap_file = None
                         wordlist = None
@@ -405,6 +754,21 @@ class WifiCrackingTool:
                         except KeyboardInterrupt:
                             pass
 
+                    elif choice == "4":
+                        if not wordlist:
+                            wordlist = self.get_wordlist()
+                        
+                        if wordlist:
+                            print_header("BATCH CRACKING", "yellow", "-")
+                            check_and_convert_cap_files()
+                            batch_crack(self.prepare_wordlist(wordlist))
+                        wordlist = None
+                        
+                        try:
+                            input(colored("\n[*] Press Enter to return to the menu...", "cyan"))
+                        except KeyboardInterrupt:
+                            pass
+
                     elif choice.strip().lower() == "q":
                         print_header("GOODBYE!", "green")
                         print(colored("\n[*] Exiting the WiFi Cracking Tool. Goodbye!", "green"))
@@ -0,0 +1,234 @@
+import os
+import json
+import mmap
+import time
+import heapq
+import struct
+import tempfile
+from wordlist_catalog import WordlistCatalog
+from wpa_engine import MIN_PASSPHRASE, MAX_PASSPHRASE
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".snype", "wordlists")
+MANIFEST_NAME = "manifest.json"
+
+# Candidates sorted in memory per run file; bounds RAM use of the external sort
+RUN_LINES = 500000
+# Run files merged at once; bounds the open file descriptors of the external sort
+MERGE_FAN_IN = 64
+PROGRESS_BYTES = 16 * 1024 * 1024
+
+# Run record: source position, candidate length, candidate
+RECORD = struct.Struct(">QB")
+
+def _write_run(records, directory):
+    """Write sorted (candidate, position) records to a temporary run file"""
+    fd, path = tempfile.mkstemp(prefix="run-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb", buffering=1024 * 1024) as f:
+            for candidate, position in records:
+                f.write(RECORD.pack(position, len(candidate)))
+                f.write(candidate)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+def _read_run(path):
+    """
+    Yields:
+        Tuple of (candidate, position) records of a run file, in file order
+    """
+    with open(path, "rb", buffering=1024 * 1024) as f:
+        while True:
+            header = f.read(RECORD.size)
+            if not header:
+                return
+            position, length = RECORD.unpack(header)
+            yield f.read(length), position
+
+def scan_candidates(wordlist, on_progress=None, stats=None):
+    """
+    Memory-map a wordlist and yield its usable WPA passphrases
+
+    Lines are split on b"\\n" with trailing b"\\r" removed, like
+    wpa_engine.wordlist_candidates, so both agree on the candidates. The
+    number of lines scanned is stored in stats["lines"] when stats is given.
+
+    Yields:
+        Tuple of (candidate, line number)
+    """
+    size = os.path.getsize(wordlist)
+    if not size:
+        return
+    with open(wordlist, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        line_number = 0
+        reported = 0
+        while start < size:
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = size
+            if end - start >= MIN_PASSPHRASE:
+                candidate = data[start:end].rstrip(b"\r")
+                if MIN_PASSPHRASE <= len(candidate) <= MAX_PASSPHRASE:
+                    yield candidate, line_number
+            line_number += 1
+            start = end + 1
+            if on_progress and start - reported >= PROGRESS_BYTES:
+                reported = start
+                on_progress(min(start, size), size)
+        if stats is not None:
+            stats["lines"] = line_number
+        if on_progress:
+            on_progress(size, size)
+
+def _sorted_runs(records, key, directory):
+    """Split a record stream into sorted run files"""
+    runs = []
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= RUN_LINES:
+            chunk.sort(key=key)
+            runs.append(_write_run(chunk, directory))
+            chunk = []
+    if chunk:
+        chunk.sort(key=key)
+        runs.append(_write_run(chunk, directory))
+    return runs
+
+def _merged_runs(runs, key=None):
+    """Records of sorted run files merged into one sorted stream"""
+    return heapq.merge(*(_read_run(run) for run in runs), key=key)
+
+def _reduce_runs(runs, key, directory):
+    """
+    Merge run files MERGE_FAN_IN at a time until no more than MERGE_FAN_IN remain
+
+    runs is updated in place, so the caller's cleanup always sees the live files.
+    """
+    while len(runs) > MERGE_FAN_IN:
+        group = runs[:MERGE_FAN_IN]
+        merged = _write_run(_merged_runs(group, key), directory)
+        runs[:MERGE_FAN_IN] = []
+        runs.append(merged)
+        for run in group:
+            os.remove(run)
+
+def build_wpa_wordlist(wordlist, output, on_progress=None):
+    """
+    Write the WPA-ready derivative of a wordlist
+
+    Keeps only 8 to 63 byte candidates and the first occurrence of each one,
+    in the original order. Both steps are external sorts over temporary run
+    files, so memory use is bounded by RUN_LINES whatever the wordlist size:
+    runs sorted by candidate are merged to drop duplicates, and the survivors
+    are sorted back into source order. Runs are merged at most MERGE_FAN_IN
+    at a time, so the number of open files stays bounded as well.
+
+    Args:
+        wordlist: Source wordlist
+        output: Destination file
+        on_progress: Optional callback receiving (bytes scanned, total bytes)
+
+    Returns:
+        Tuple of (source lines, candidates written)
+    """
+    directory = os.path.dirname(os.path.abspath(output))
+    stats = {"lines": 0}
+    runs = []
+    position_runs = []
+    try:
+        runs = _sorted_runs(scan_candidates(wordlist, on_progress, stats), None, directory)
+        _reduce_runs(runs, None, directory)
+
+        def first_occurrences():
+            previous = None
+            for candidate, position in _merged_runs(runs):
+                if candidate != previous:
+                    previous = candidate
+                    yield candidate, position
+
+        by_position = lambda record: record[1]
+        position_runs = _sorted_runs(first_occurrences(), by_position, directory)
+        _reduce_runs(position_runs, by_position, directory)
+
+        kept = 0
+        tmp_output = f"{output}.tmp"
+        with open(tmp_output, "wb", buffering=1024 * 1024) as f:
+            for candidate, _ in _merged_runs(position_runs, by_position):
+                f.write(candidate + b"\n")
+                kept += 1
+        os.replace(tmp_output, output)
+        return stats["lines"], kept
+    finally:
+        for run in runs + position_runs:
+            try:
+                os.remove(run)
+            except OSError:
+                pass
+
+class WordlistCache:
+    """
+    Cache of WPA-ready wordlist derivatives, keyed by source content hash
+
+    The manifest maps content digest -> {prepared, source_lines, candidates,
+    built_at}; content hashes come from the WordlistCatalog, so a wordlist is
+    only hashed again when its size or mtime changed. The derivatives live in
+    ~/.snype/wordlists.
+    """
+    def __init__(self, directory=CACHE_DIR, catalog=None):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.catalog = catalog or WordlistCatalog()
+        self.entries = {}
+        try:
+            with open(self.path, "r") as f:
+                self.entries = json.load(f).get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            pass
+
+    def save(self):
+        """Atomically write the manifest and the catalog back to disk"""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.catalog.save()
+
+    def digest_of(self, wordlist, on_progress=None):
+        """Content hash of a wordlist, recomputed only when its size or mtime changed"""
+        return self.catalog.entry(wordlist, on_progress)["digest"]
+
+    def lookup(self, wordlist):
+        """
+        Returns:
+            Manifest entry of the wordlist's derivative, or None if it was not built
+        """
+        entry = self.entries.get(self.digest_of(wordlist))
+        if entry and os.path.exists(entry["prepared"]):
+            return entry
+        return None
+
+    def prepare(self, wordlist, on_progress=None):
+        """
+        Return the derivative of a wordlist, building it on first use
+
+        Returns:
+            Manifest entry with prepared path, source_lines and candidates
+        """
+        entry = self.lookup(wordlist)
+        if entry:
+            self.save()
+            return entry
+
+        digest = self.digest_of(wordlist, on_progress)
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(wordlist))[0]
+        prepared = os.path.join(self.directory, f"{stem}-{digest[:12]}.wpa.txt")
+        lines, kept = build_wpa_wordlist(wordlist, prepared, on_progress)
+        entry = {"prepared": prepared, "source_lines": lines, "candidates": kept, "built_at": time.time()}
+        self.entries[digest] = entry
+        self.save()
+        return entry
@@ -0,0 +1,226 @@
+import os
+import hmac
+import hashlib
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from hc22000 import PAIR_RC_NOT_CHECKED
+
+try:
+    from cryptography.hazmat.primitives import cmac
+    from cryptography.hazmat.primitives.ciphers import algorithms
+except ImportError:
+    cmac = None
+
+PMK_ITERATIONS = 4096
+MIN_PASSPHRASE = 8
+MAX_PASSPHRASE = 63
+
+# Message pair bits set by the hc22000 generators
+PAIR_AP_LESS = 0x10
+PAIR_LE_ROUTER = 0x20
+PAIR_BE_ROUTER = 0x40
+# ANonce offsets tried when the replay counter could not be checked (hashcat's default)
+NONCE_CORRECTIONS = 8
+
+BATCH_SIZE = 256
+
+def derive_pmk(passphrase, essid):
+    """WPA-PSK pairwise master key of a passphrase and ESSID (both bytes)"""
+    return hashlib.pbkdf2_hmac("sha1", passphrase, essid, PMK_ITERATIONS, 32)
+
+def _derive_batch(essid, candidates):
+    return [derive_pmk(candidate, essid) for candidate in candidates]
+
+def wordlist_candidates(wordlist):
+    """
+    Stream the usable WPA passphrases of a wordlist
+
+    Lines are read as bytes; only 8 to 63 byte candidates are yielded.
+    """
+    with open(wordlist, "rb") as f:
+        for line in f:
+            candidate = line.rstrip(b"\r\n")
+            if MIN_PASSPHRASE <= len(candidate) <= MAX_PASSPHRASE:
+                yield candidate
+
+def _prf_kck(pmk, mac_ap, mac_sta, anonce, snonce):
+    data = (b"Pairwise key expansion\x00" + min(mac_ap, mac_sta) + max(mac_ap, mac_sta) +
+            min(anonce, snonce) + max(anonce, snonce) + b"\x00")
+    return hmac.new(pmk, data, hashlib.sha1).digest()[:16]
+
+def _kdf_kck(pmk, mac_ap, mac_sta, anonce, snonce):
+    data = (struct.pack("<H", 1) + b"Pairwise key expansion" + min(mac_ap, mac_sta) + max(mac_ap, mac_sta) +
+            min(anonce, snonce) + max(anonce, snonce) + struct.pack("<H", 384))
+    return hmac.new(pmk, data, hashlib.sha256).digest()[:16]
+
+def _aes_cmac(key, data):
+    mac = cmac.CMAC(algorithms.AES(key))
+    mac.update(data)
+    return mac.finalize()
+
+class HashTarget:
+    """
+    One hc22000 line prepared for passphrase verification
+
+    Supports PMKIDs and EAPOL MICs of key versions 1 (HMAC-MD5) and 2
+    (HMAC-SHA1); version 3 (AES-CMAC) needs the cryptography module.
+    """
+    __slots__ = ("line", "type", "mic", "mac_ap", "mac_sta", "essid", "anonces", "snonce",
+                 "eapol", "key_version")
+
+    def __init__(self, line):
+        parts = line.strip().split("*")
+        self.line = line.strip()
+        self.type = parts[1]
+        self.mic = bytes.fromhex(parts[2])
+        self.mac_ap = bytes.fromhex(parts[3])
+        self.mac_sta = bytes.fromhex(parts[4])
+        self.essid = bytes.fromhex(parts[5])
+        self.anonces = ()
+        self.snonce = None
+        self.eapol = None
+        self.key_version = None
+        if self.type == "02":
+            self.eapol = bytes.fromhex(parts[7])
+            self.snonce = self.eapol[17:49]
+            self.key_version = struct.unpack(">H", self.eapol[5:7])[0] & 0x0007
+            message_pair = int(parts[8], 16) if len(parts) > 8 and parts[8] else 0
+            self.anonces = tuple(anonce_variants(bytes.fromhex(parts[6]), message_pair))
+
+    @property
+    def supported(self):
+        return self.type == "01" or self.key_version in (1, 2) or (self.key_version == 3 and cmac is not None)
+
+    def matches(self, pmk):
+        """Check whether a PMK opens this hash"""
+        if self.type == "01":
+            return hmac.new(pmk, b"PMK Name" + self.mac_ap + self.mac_sta, hashlib.sha1).digest()[:16] == self.mic
+        for anonce in self.anonces:
+            if self.key_version == 3:
+                kck = _kdf_kck(pmk, self.mac_ap, self.mac_sta, anonce, self.snonce)
+                mic = _aes_cmac(kck, self.eapol)
+            else:
+                kck = _prf_kck(pmk, self.mac_ap, self.mac_sta, anonce, self.snonce)
+                digest = hashlib.md5 if self.key_version == 1 else hashlib.sha1
+                mic = hmac.new(kck, self.eapol, digest).digest()
+            if mic[:16] == self.mic:
+                return True
+        return False
+
+def anonce_variants(anonce, message_pair):
+    """
+    ANonces to try for an EAPOL hash
+
+    When the replay counter was not checked the AP may have sent several
+    ANonces; like hashcat, the last four bytes are then shifted by up to
+    NONCE_CORRECTIONS in the router's byte order (both when unknown).
+    """
+    yield anonce
+    if not message_pair & PAIR_RC_NOT_CHECKED or message_pair & PAIR_AP_LESS:
+        return
+    orders = []
+    if message_pair & PAIR_LE_ROUTER or not message_pair & PAIR_BE_ROUTER:
+        orders.append("<I")
+    if message_pair & PAIR_BE_ROUTER or not message_pair & PAIR_LE_ROUTER:
+        orders.append(">I")
+    for delta in range(1, NONCE_CORRECTIONS + 1):
+        for sign in (-1, 1):
+            for order in orders:
+                counter = (struct.unpack(order, anonce[28:])[0] + sign * delta) & 0xFFFFFFFF
+                yield anonce[:28] + struct.pack(order, counter)
+
+class PmkEngine:
+    """
+    Derive PMKs on a process pool, in candidate order
+
+    Candidates are sent to the workers in batches of batch_size with a bounded
+    number of batches in flight, so a wordlist of any size is streamed.
+
+    Usage:
+        with PmkEngine() as engine:
+            for candidate, pmk in engine.derive(b"MyNet", wordlist_candidates("rockyou.txt")):
+                ...
+    """
+    def __init__(self, workers=None, batch_size=BATCH_SIZE):
+        self.workers = workers or max(1, os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.pool = None
+
+    def __enter__(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.shutdown(wait=exc_type is None, cancel_futures=True)
+        self.pool = None
+
+    def _batches(self, candidates):
+        batch = []
+        for candidate in candidates:
+            batch.append(candidate)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def derive(self, essid, candidates):
+        """
+        Yields:
+            Tuple of (candidate, PMK) for every candidate, in order
+        """
+        pending = deque()
+        for batch in self._batches(candidates):
+            pending.append((batch, self.pool.submit(_derive_batch, essid, batch)))
+            if len(pending) >= self.workers * 2:
+                done, future = pending.popleft()
+                yield from zip(done, future.result())
+        while pending:
+            done, future = pending.popleft()
+            yield from zip(done, future.result())
+
+def match_pmks(pmks, targets, on_progress=None, progress_every=BATCH_SIZE):
+    """
+    Test PMKs against a set of hashes until every hash is opened
+
+    Args:
+        pmks: Iterable of (key, PMK) tuples; key identifies the passphrase
+        targets: List of HashTarget
+        on_progress: Optional callback receiving the number of PMKs tested
+        progress_every: PMKs between two progress callbacks
+
+    Returns:
+        Dict of hc22000 line -> key of the matching PMK
+    """
+    remaining = list(targets)
+    found = {}
+    tested = 0
+    for key, pmk in pmks:
+        tested += 1
+        for target in [t for t in remaining if t.matches(pmk)]:
+            found[target.line] = key
+            remaining.remove(target)
+        if on_progress and tested % progress_every == 0:
+            on_progress(tested)
+        if not remaining:
+            break
+    if on_progress:
+        on_progress(tested)
+    return found
+
+def crack_targets(engine, essid, targets, candidates, on_progress=None):
+    """
+    Test candidates against every hash of one ESSID in a single pass
+
+    Args:
+        engine: Open PmkEngine
+        essid: ESSID shared by the targets (bytes)
+        targets: List of HashTarget
+        candidates: Iterable of passphrases (bytes)
+        on_progress: Optional callback receiving the number of candidates tested
+
+    Returns:
+        Dict of hc22000 line -> recovered passphrase (bytes)
+    """
+    return match_pmks(engine.derive(essid, candidates), targets, on_progress, engine.batch_size)